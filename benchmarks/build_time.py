@@ -0,0 +1,146 @@
+'''
+Wall time and peak memory of each stage of the reference-data build.
+
+Every stage runs in this process in build order. On Linux the peak RSS (VmHWM) is reset
+before each stage through /proc/self/clear_refs, so each figure is how far the peak rose
+above the RSS the stage started from; elsewhere only wall times are reported. The NAICS
+sheets are also read one `pl.read_excel` call per sheet, the way the build used to, for
+comparison, after one untimed read both ways. Finally a cold build (empty cache) and a
+warm rebuild (nothing changed) are timed against a temporary output directory.
+
+    python benchmarks/build_time.py [--repeat N]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+import polars as pl
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from crosswalks.build import (
+    AREA_YEARS, NAICS_YEARS, REFERENCE_PATH, area_vintages, assemble_industries,
+    build, file_fingerprint, naics_vintages, sheet_fingerprints
+)
+
+WORKBOOK = REFERENCE_PATH / 'industry' / 'naics_codes.xlsx'
+
+
+# -------------------------------------------------------------------------------------------------
+# Peak memory
+# -------------------------------------------------------------------------------------------------
+
+def _status(field: str) -> Optional[int]:
+    try:
+        with open('/proc/self/status') as status:
+            return int(next(line for line in status if line.startswith(field)).split()[1])
+    except (OSError, StopIteration):
+        return None
+
+
+def _reset_peak() -> bool:
+    try:
+        with open('/proc/self/clear_refs', 'w') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Tuple[float, Optional[float], Any]:
+    # Best wall time over `repeat` runs, and how far the first run raised the peak RSS (MB)
+    # above the RSS it started from
+    reset = _reset_peak()
+    rss = _status('VmRSS')
+    start = time.perf_counter()
+    result = func()
+    best = time.perf_counter() - start
+    peak = _status('VmHWM') - rss if reset and rss is not None else None
+
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best, None if peak is None else peak / 1024, result
+
+
+def report(name: str, seconds: float, peak: Optional[float]) -> None:
+    print(f'{name:<42} {seconds:9.4f} {peak if peak is not None else float("nan"):12.1f}')
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    def fingerprints() -> None:
+        sheet_fingerprints(WORKBOOK)
+        for year in AREA_YEARS:
+            file_fingerprint(
+                REFERENCE_PATH / 'area' / 'state_county_fips.csv',
+                REFERENCE_PATH / 'area' / f'{year}.csv'
+            )
+
+    def sheets_one_by_one() -> None:
+        for year in NAICS_YEARS:
+            pl.read_excel(WORKBOOK, sheet_name=f'naics_{year}')
+
+    stages = [
+        ('fingerprint inputs', fingerprints),
+        ('read + join area vintages', lambda: area_vintages(AREA_YEARS)),
+        ('read NAICS sheets (one workbook open)', lambda: naics_vintages(NAICS_YEARS)),
+        ('read NAICS sheets (one read per sheet)', sheets_one_by_one),
+    ]
+
+    # One untimed read of the workbook both ways, so that the first NAICS stage does not
+    # also pay for importing the Excel reader and loading the file from disk
+    naics_vintages(NAICS_YEARS)
+    sheets_one_by_one()
+
+    print(f'{"stage":<42} {"seconds":>9} {"peak +MB":>12}')
+    results = {}
+    for name, func in stages:
+        seconds, peak, results[name] = measure(func, args.repeat)
+        report(name, seconds, peak)
+
+    areas = results['read + join area vintages']
+    naics = pl.concat(results['read NAICS sheets (one workbook open)'].values())
+    for name, func in [
+        ('concat area vintages', lambda: pl.concat(areas.values())),
+        ('assemble industries', lambda: assemble_industries(naics)),
+    ]:
+        seconds, peak, results[name] = measure(func, args.repeat)
+        report(name, seconds, peak)
+
+    def serialize() -> None:
+        results['concat area vintages'].write_csv()
+        results['assemble industries'].write_csv()
+
+    report('serialize outputs', *measure(serialize, args.repeat)[:2])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'data_path': Path(tmp), 'cache_path': Path(tmp) / '.build'}
+        for name, func in [
+            ('full build (cold cache)', lambda: build(force=True, **paths)),
+            ('full build (warm, nothing changed)', lambda: build(**paths)),
+        ]:
+            report(name, *measure(func, args.repeat)[:2])
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
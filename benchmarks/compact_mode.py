@@ -0,0 +1,74 @@
+'''
+Memory footprint and join/compare speed of the standard and compact table representations.
+
+    python benchmarks/compact_mode.py [--rows N] [--repeat N]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import polars as pl
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from crosswalks.compact import compact
+from crosswalks.tables import load_geos, load_industries
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def timed(func, repeat: int) -> float:
+    return min(timeit.repeat(func, number=1, repeat=repeat)) * 1e3
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"table":<20} {"standard MB":>12} {"compact MB":>12} {"ratio":>7}')
+    for name, df in [('geographic_codes', load_geos()), ('industry_codes', load_industries())]:
+        standard, small = df.estimated_size('mb'), compact(df).estimated_size('mb')
+        print(f'{name:<20} {standard:12.2f} {small:12.2f} {standard / small:6.2f}x')
+
+    print()
+    print(f'{"operation":<44} {"standard ms":>12} {"compact ms":>12}')
+
+    cases = [
+        ('county_fips', 'cbsa_code', load_geos().filter(pl.col('year') == 2023)),
+        ('detailed_industry', 'supersector', load_industries().filter(pl.col('year') == 2022)),
+    ]
+    for key, target, part in cases:
+        small = compact(part)
+        facts = part.select(key).sample(args.rows, with_replacement=True, seed=0)
+        facts_small = facts.with_columns(pl.col(key).cast(small.schema[key]))
+        probe = part.get_column(key)[0]
+
+        joins = [
+            (part.select(key, target).unique(key), facts),
+            (small.select(key, target).unique(key), facts_small),
+        ]
+        join_ms = [timed(lambda m=m, f=f: f.join(m, on=key, how='left'), args.repeat) for m, f in joins]
+        print(f'{f"join {args.rows:,} rows on {key}":<44} {join_ms[0]:12.2f} {join_ms[1]:12.2f}')
+
+        compares = [
+            (facts, probe),
+            (facts_small, facts_small.get_column(key)[0]),
+        ]
+        compare_ms = [timed(lambda f=f, v=v: f.filter(pl.col(key) == v), args.repeat) for f, v in compares]
+        print(f'{f"compare {args.rows:,} rows on {key}":<44} {compare_ms[0]:12.2f} {compare_ms[1]:12.2f}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+'''
+Import-time benchmark for the lookup modules.
+
+Each import runs in a fresh interpreter. Polars is imported first so its own import
+cost is reported separately. An audit hook records every file opened from Python under
+`data/`, and the lazy table flags show whether a table was read. The import must not
+read any table; the first lookup must.
+
+    python benchmarks/import_time.py [--runs N]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_PATH = Path(__file__).parent.parent
+
+MODULES = {
+    'crosswalks.geographic_codes': 'area_mapping("state_fips", "region")',
+    'crosswalks.industry_codes': 'industry_mapping("sector", "supersector", year=2022)',
+}
+
+PROBE = '''
+import json, sys, time
+opened = []
+def hook(event, args):
+    if event == 'open' and isinstance(args[0], str) and {data!r} in args[0]:
+        opened.append(args[0])
+sys.addaudithook(hook)
+start = time.perf_counter()
+import polars
+polars_s = time.perf_counter() - start
+start = time.perf_counter()
+import {module} as mod
+import_s = time.perf_counter() - start
+import_opened = list(opened)
+from crosswalks import tables
+import_loaded = [t.loaded for t in (tables.geos_table, tables.industries_table)]
+start = time.perf_counter()
+mod.{lookup}
+lookup_s = time.perf_counter() - start
+print(json.dumps({{
+    'polars_s': polars_s,
+    'import_s': import_s,
+    'import_opened': import_opened,
+    'import_loaded': any(import_loaded),
+    'first_lookup_s': lookup_s,
+    'lookup_loaded': any(t.loaded for t in (tables.geos_table, tables.industries_table)),
+}}))
+'''
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def probe(module: str, lookup: str) -> dict:
+    code = PROBE.format(data=str(BASE_PATH / 'data'), module=module, lookup=lookup)
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True,
+        check=True,
+        env={**os.environ, 'PYTHONPATH': str(BASE_PATH / 'src')},
+        text=True
+    )
+    return json.loads(result.stdout)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for module, lookup in MODULES.items():
+        runs = [probe(module, lookup) for _ in range(args.runs)]
+        polars_ms = min(r['polars_s'] for r in runs) * 1e3
+        import_ms = min(r['import_s'] for r in runs) * 1e3
+        lookup_ms = min(r['first_lookup_s'] for r in runs) * 1e3
+        touched = sorted({p for r in runs for p in r['import_opened']})
+        loaded_at_import = any(r['import_loaded'] for r in runs)
+        loaded_at_lookup = all(r['lookup_loaded'] for r in runs)
+
+        print(
+            f'{module:<30} polars {polars_ms:8.2f} ms   import {import_ms:8.2f} ms   '
+            f'first lookup {lookup_ms:8.2f} ms   table read at import: {loaded_at_import}'
+        )
+        if touched or loaded_at_import or not loaded_at_lookup:
+            failed = True
+            for path in touched:
+                print(f'  opened at import: {path}')
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
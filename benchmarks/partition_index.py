@@ -0,0 +1,109 @@
+'''
+Micro-benchmark of full-table scans against the per-vintage partitioned index.
+
+For every lookup function and every year (and survey), the scan variant filters the
+whole table the way the lookups used to, and the index variant calls the lookup with
+the result cache disabled so only the index is exercised. Results are checked for
+equality before timing.
+
+    python benchmarks/partition_index.py [--repeat N]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+import polars as pl
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import crosswalks
+from crosswalks import geographic_codes as geo
+from crosswalks import industry_codes as ind
+from crosswalks.tables import SURVEYS, load_geos, load_industries
+
+
+# -------------------------------------------------------------------------------------------------
+# Scan implementations (filter the whole table on every call)
+# -------------------------------------------------------------------------------------------------
+
+def scan_geo(df: pl.DataFrame, year: int) -> pl.DataFrame:
+    return df.filter(pl.col('year') == year)
+
+
+def scan_ind(df: pl.DataFrame, year: int, survey: str) -> pl.DataFrame:
+    return df.filter((pl.col('year') == year) & (pl.col(survey) == True))
+
+
+def cases():
+    geos_df, industries_df = load_geos(), load_industries()
+
+    for year in geo.available_years():
+        yield (
+            f'area_mapping county_fips->cbsa_code {year}',
+            lambda year=year: dict(scan_geo(geos_df, year).select('county_fips', 'cbsa_code').sort('county_fips', 'cbsa_code').unique(maintain_order=True).iter_rows()),
+            lambda year=year: geo.area_mapping('county_fips', 'cbsa_code', year)
+        )
+        yield (
+            f'get_area county {year}',
+            lambda year=year: dict(scan_geo(geos_df, year).select('county_fips', 'county_name').sort('county_fips', 'county_name').unique(maintain_order=True).iter_rows()),
+            lambda year=year: geo.get_area('county', year)
+        )
+        yield (
+            f'valid_area county_fips {year}',
+            lambda year=year: scan_geo(geos_df, year).get_column('county_fips').unique().sort().to_list(),
+            lambda year=year: geo.valid_area('county_fips', year)
+        )
+
+    for survey in SURVEYS:
+        for year in ind.available_years(survey):
+            yield (
+                f'industry_mapping detailed->sector {survey} {year}',
+                lambda year=year, survey=survey: dict(scan_ind(industries_df, year, survey).select('detailed_industry', 'sector').sort('detailed_industry', 'sector').unique(maintain_order=True).iter_rows()),
+                lambda year=year, survey=survey: ind.industry_mapping('detailed_industry', 'sector', survey, year)
+            )
+            yield (
+                f'get_industry detailed {survey} {year}',
+                lambda year=year, survey=survey: dict(scan_ind(industries_df, year, survey).select('detailed_industry', 'detailed_industry_name').sort('detailed_industry', 'detailed_industry_name').unique(maintain_order=True).iter_rows()),
+                lambda year=year, survey=survey: ind.get_industry('detailed_industry', survey, year)
+            )
+            yield (
+                f'valid_industry sector {survey} {year}',
+                lambda year=year, survey=survey: scan_ind(industries_df, year, survey).get_column('sector').unique().sort().to_list(),
+                lambda year=year, survey=survey: ind.valid_industry('sector', survey, year)
+            )
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    crosswalks.set_cache_size(0)
+
+    print(f'{"lookup":<48} {"scan us":>10} {"index us":>10} {"speedup":>8}')
+    for name, scan, index in cases():
+        expected, actual = scan(), index()
+        if isinstance(expected, dict):
+            assert expected == dict(actual), name
+        else:
+            assert expected == list(actual), name
+
+        scan_s = min(timeit.repeat(scan, number=1, repeat=args.repeat))
+        index_s = min(timeit.repeat(index, number=1, repeat=args.repeat))
+        print(f'{name:<48} {scan_s * 1e6:10.1f} {index_s * 1e6:10.1f} {scan_s / index_s:7.2f}x')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
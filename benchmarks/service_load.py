@@ -0,0 +1,141 @@
+'''
+Throughput and latency of the ZeroMQ lookup service under concurrent clients.
+
+The server runs in its own process (`python -m crosswalks.service`). For each client
+count, that many client processes send the same mix of requests as fast as they can:
+a batch of county codes to translate, a multi-target area mapping, a batch of NAICS
+codes to validate, and a CBSA to county expansion. Requests per second are counted over
+all clients over the window in which they were all sending (after one warm-up round
+per client); latency percentiles are over every request.
+
+    python benchmarks/service_load.py [--clients 1 4 16] [--requests 500] [--batch 1000] [--workers 4]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import polars as pl
+
+BASE_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_PATH / 'src'))
+
+from crosswalks.service import LookupClient
+from crosswalks.tables import load_geos, load_industries
+
+
+# -------------------------------------------------------------------------------------------------
+# Clients
+# -------------------------------------------------------------------------------------------------
+
+def client(
+    address: str,
+    requests: int,
+    counties: List[str],
+    naics: List[str],
+    cbsas: List[str]
+) -> Tuple[float, float, List[float]]:
+
+    # Wall-clock window of the timed requests, so process start-up is not counted
+    latencies = []
+    with LookupClient(address) as lookups:
+        calls = [
+            lambda: lookups.translate_area(counties, 'county_fips', 'cbsa_code'),
+            lambda: lookups.area_mapping('county_fips', ['state_abbr', 'cbsa_code', 'cbsa_title']),
+            lambda: lookups.validate_industry(naics, 'detailed_industry', 'qcew', 2022),
+            lambda: lookups.expand_area(cbsas, 'cbsa_code', 'county_fips'),
+        ]
+        for call in calls:
+            call()
+
+        began = time.time()
+        for i in range(requests):
+            start = time.perf_counter()
+            calls[i % len(calls)]()
+            latencies.append(time.perf_counter() - start)
+        ended = time.time()
+    return began, ended, latencies
+
+
+def _client(args: Tuple) -> Tuple[float, float, List[float]]:
+    return client(*args)
+
+
+def wait_ready(address: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with LookupClient(address, timeout=1.0) as lookups:
+                lookups.area_years()
+            return
+        except TimeoutError:
+            if time.monotonic() > deadline:
+                raise
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--requests', type=int, default=500, help='requests per client')
+    parser.add_argument('--batch', type=int, default=1000, help='codes per batched request')
+    parser.add_argument('--workers', type=int, default=4, help='server worker threads')
+    parser.add_argument('--address', default='tcp://127.0.0.1:5599')
+    args = parser.parse_args()
+
+    geos = load_geos().filter(pl.col('year') == 2023)
+    counties = geos.get_column('county_fips').sample(args.batch, with_replacement=True, seed=0).to_list()
+    cbsas = geos.get_column('cbsa_code').drop_nulls().unique().sort().head(400).to_list()
+    naics = (
+        load_industries()
+        .filter(pl.col('year') == 2017)
+        .get_column('detailed_industry')
+        .sample(args.batch, with_replacement=True, seed=0)
+        .to_list()
+    )
+
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'crosswalks.service', '--address', args.address, '--workers', str(args.workers)],
+        env={**os.environ, 'PYTHONPATH': str(BASE_PATH / 'src')},
+        stdout=subprocess.DEVNULL
+    )
+    try:
+        wait_ready(args.address)
+
+        print(f'{"clients":>8} {"requests":>9} {"req/s":>10} {"p50 ms":>9} {"p99 ms":>9}')
+        with multiprocessing.get_context('spawn').Pool(max(args.clients)) as pool:
+            for clients in args.clients:
+                work = [(args.address, args.requests, counties, naics, cbsas)] * clients
+                results = pool.map(_client, work)
+                elapsed = max(ended for _, ended, _ in results) - min(began for began, _, _ in results)
+                latencies = [s for _, _, result in results for s in result]
+                print(
+                    f'{clients:>8} {len(latencies):>9} {len(latencies) / elapsed:>10.0f} '
+                    f'{_percentile(latencies, 0.50) * 1e3:>9.2f} {_percentile(latencies, 0.99) * 1e3:>9.2f}'
+                )
+    finally:
+        server.terminate()
+        server.wait()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+'''
+Per-worker start-up time and memory with and without shared-memory tables.
+
+A pool of spawned worker processes each runs the same first lookups, once loading the
+tables privately and once attached to tables published by the parent with
+`crosswalks.shared`. For each worker, the time to attach or load the tables and get its
+first results, and its proportional set size (PSS, which splits shared pages between the
+processes mapping them), are read after the lookups. Linux only, since memory is read
+from /proc/self/smaps_rollup.
+
+    python benchmarks/shared_tables.py [--workers 4] [--compact]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+BASE_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_PATH / 'src'))
+
+from crosswalks.shared import attach, publish
+from crosswalks.tables import set_compact
+
+
+# -------------------------------------------------------------------------------------------------
+# Workers
+# -------------------------------------------------------------------------------------------------
+
+def _memory() -> Dict[str, int]:
+    memory = {}
+    with open('/proc/self/smaps_rollup') as smaps:
+        for line in smaps:
+            field, *value = line.split()
+            if field in ('Rss:', 'Pss:'):
+                memory[field[:-1]] = int(value[0])
+    return memory
+
+
+def first_lookups(path: Optional[Path]) -> Tuple[float, Dict[str, int]]:
+    from crosswalks.geographic_codes import area_mapping
+    from crosswalks.industry_codes import industry_mapping
+
+    # Attaching counts towards the time, as loading does for the private tables
+    start = time.perf_counter()
+    if path is not None:
+        attach(path)
+    area_mapping('county_fips', ['state_abbr', 'cbsa_code'])
+    area_mapping('county_fips', 'state_abbr', year=2013)
+    industry_mapping('detailed_industry', ['sector', 'sector_name'], survey='qcew', year=2022)
+    return time.perf_counter() - start, _memory()
+
+
+def run(workers: int, path: Optional[Path]) -> None:
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+        results = list(pool.map(first_lookups, [path] * workers))
+
+    seconds = statistics.median(s for s, _ in results)
+    rss = statistics.median(m['Rss'] for _, m in results) / 1024
+    pss = statistics.median(m['Pss'] for _, m in results) / 1024
+    name = 'attached to shared tables' if path is not None else 'private tables'
+    print(f'{name:<28} {seconds * 1e3:12.1f} {rss:10.1f} {pss:10.1f}')
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--compact', action='store_true', help='use the compact representation')
+    args = parser.parse_args()
+
+    # Inherited by the spawned workers and read by this process when publishing
+    os.environ['CROSSWALKS_COMPACT'] = '1' if args.compact else '0'
+    set_compact(args.compact)
+
+    print(f'{"workers (median)":<28} {"lookups ms":>12} {"RSS MB":>10} {"PSS MB":>10}')
+    run(args.workers, None)
+    with publish() as shared:
+        run(args.workers, shared.path)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
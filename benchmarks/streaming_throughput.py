@@ -0,0 +1,103 @@
+'''
+Throughput and peak memory of streaming enrichment at several input sizes.
+
+For each size a synthetic county x 6-digit NAICS fact table is written to Parquet, then
+enriched in a fresh interpreter. Peak RSS is read from VmHWM on Linux, which is reset by
+exec; elsewhere ru_maxrss is used, which may include the parent's peak.
+
+    python benchmarks/streaming_throughput.py [--sizes 1000000 5000000 20000000]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+import polars as pl
+
+BASE_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_PATH / 'src'))
+
+from crosswalks.tables import load_geos, load_industries
+
+RUN = '''
+import json, resource, sys, time
+from crosswalks.streaming import enrich
+start = time.perf_counter()
+enrich(
+    {source!r}, {output!r},
+    area_on='county_fips', area_fields=['state_abbr', 'cbsa_code', 'cbsa_title', 'csa_code'],
+    industry_on='naics', industry_fields=['sector', 'supersector', 'supersector_name'],
+    industry_year=2022, survey='qcew', chunk_size={chunk_size}
+)
+elapsed = time.perf_counter() - start
+try:
+    with open('/proc/self/status') as status:
+        rss = int(next(line for line in status if line.startswith('VmHWM')).split()[1])
+except OSError:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss = rss // 1024 if sys.platform == 'darwin' else rss
+print(json.dumps({{'seconds': elapsed, 'peak_rss_kb': rss}}))
+'''
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def synthetic(path: Path, rows: int) -> None:
+    counties = load_geos().filter(pl.col('year') == 2023).get_column('county_fips').unique()
+    naics = load_industries().filter(pl.col('year') == 2022).get_column('detailed_industry').unique()
+    batch = 1_000_000
+    frames = []
+    for offset in range(0, rows, batch):
+        n = min(batch, rows - offset)
+        frames.append(
+            pl.DataFrame({
+                'county_fips': counties.sample(n, with_replacement=True, seed=offset),
+                'naics': naics.sample(n, with_replacement=True, seed=offset + 1),
+                'employment': pl.int_range(n, eager=True) % 500,
+            })
+        )
+    pl.concat(frames).write_parquet(path, row_group_size=250_000)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1_000_000, 5_000_000, 20_000_000])
+    parser.add_argument('--chunk-size', type=int, default=250_000)
+    args = parser.parse_args()
+
+    print(f'{"rows":>12} {"seconds":>9} {"rows/s":>14} {"peak RSS MB":>12}')
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            source, output = Path(tmp) / f'facts_{rows}.parquet', Path(tmp) / f'out_{rows}.parquet'
+            synthetic(source, rows)
+
+            code = RUN.format(source=str(source), output=str(output), chunk_size=args.chunk_size)
+            result = json.loads(
+                subprocess.run(
+                    [sys.executable, '-c', code],
+                    capture_output=True,
+                    check=True,
+                    env={**os.environ, 'PYTHONPATH': str(BASE_PATH / 'src')},
+                    text=True
+                ).stdout
+            )
+            print(
+                f'{rows:12,} {result["seconds"]:9.2f} {rows / result["seconds"]:14,.0f} '
+                f'{result["peak_rss_kb"] / 1024:12.1f}'
+            )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
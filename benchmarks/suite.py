@@ -0,0 +1,272 @@
+'''
+Benchmark suite for the public lookups, the loaded tables and the build.
+
+Measures, and saves as JSON:
+
+- import time of both lookup modules and their first lookup, in fresh interpreters;
+- cold (result cache cleared) and warm (cached) latency of every public lookup across all
+  field pairs, years and surveys, summarized per function (median, p95 and total);
+- memory of the loaded tables, in the standard and the compact representation;
+- end-to-end time of the build behind `create_area_files` and `create_industry_files`,
+  from an empty cache and with nothing to rebuild.
+
+With `--compare` the run is checked against a saved baseline and the script exits with
+status 1 if any metric got worse by more than `--threshold` (relative). Timings must also
+be worse by more than `--min-delta` seconds, so microsecond jitter is not a regression.
+
+    python benchmarks/suite.py [--output results.json] [--compare baseline.json] [--threshold 0.25]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple, get_args
+
+import polars as pl
+
+BASE_PATH = Path(__file__).parent.parent
+sys.path.insert(0, str(BASE_PATH / 'src'))
+
+import crosswalks
+from crosswalks import geographic_codes as geo
+from crosswalks import industry_codes as ind
+from crosswalks.build import build
+from crosswalks.compact import compact
+from crosswalks.naics import LEVELS
+from crosswalks.tables import SURVEYS, load_geos, load_industries
+
+AREAS = ['region', 'division', 'state', 'county', 'cbsa', 'msa', 'csa']
+
+IMPORTS = {
+    'geographic_codes': 'area_mapping("state_fips", "region")',
+    'industry_codes': 'industry_mapping("sector", "supersector", year=2022)',
+}
+
+PROBE = '''
+import json, time
+import polars
+start = time.perf_counter()
+import crosswalks.{module} as mod
+import_s = time.perf_counter() - start
+start = time.perf_counter()
+mod.{lookup}
+print(json.dumps({{'import_s': import_s, 'first_lookup_s': time.perf_counter() - start}}))
+'''
+
+Metrics = Dict[str, Dict[str, Any]]
+
+
+def metric(value: float, unit: str) -> Dict[str, Any]:
+    return {'value': value, 'unit': unit}
+
+
+# -------------------------------------------------------------------------------------------------
+# Import time
+# -------------------------------------------------------------------------------------------------
+
+def import_metrics(runs: int) -> Metrics:
+    results = {}
+    for module, lookup in IMPORTS.items():
+        probes = [
+            json.loads(
+                subprocess.run(
+                    [sys.executable, '-c', PROBE.format(module=module, lookup=lookup)],
+                    capture_output=True,
+                    check=True,
+                    env={**os.environ, 'PYTHONPATH': str(BASE_PATH / 'src')},
+                    text=True
+                ).stdout
+            )
+            for _ in range(runs)
+        ]
+        results[f'import.{module}'] = metric(min(p['import_s'] for p in probes), 's')
+        results[f'first_lookup.{module}'] = metric(min(p['first_lookup_s'] for p in probes), 's')
+    return results
+
+
+# -------------------------------------------------------------------------------------------------
+# Lookup latency
+# -------------------------------------------------------------------------------------------------
+
+def lookup_cases() -> Iterator[Tuple[str, Callable[[], Any]]]:
+    area_fields = list(get_args(geo.AreaField))
+    industry_fields = list(get_args(ind.IndustryField))
+    area_years = geo.available_years()
+
+    yield 'geographic_codes.available_years', geo.available_years
+    for year in area_years:
+        for from_area, to_area in itertools.permutations(area_fields, 2):
+            yield 'geographic_codes.area_mapping', lambda f=from_area, t=to_area, y=year: geo.area_mapping(f, t, y)
+        for area in AREAS:
+            yield 'geographic_codes.get_area', lambda a=area, y=year: geo.get_area(a, y)
+        for field in area_fields:
+            yield 'geographic_codes.valid_area', lambda f=field, y=year: geo.valid_area(f, y)
+
+    for survey in SURVEYS:
+        yield 'industry_codes.available_years', lambda s=survey: ind.available_years(s)
+        for year in ind.available_years(survey):
+            for from_ind, to_ind in itertools.permutations(industry_fields, 2):
+                yield (
+                    'industry_codes.industry_mapping',
+                    lambda f=from_ind, t=to_ind, s=survey, y=year: ind.industry_mapping(f, t, s, y)
+                )
+            for level in LEVELS:
+                yield 'industry_codes.get_industry', lambda lv=level, s=survey, y=year: ind.get_industry(lv, s, y)
+            for field in industry_fields:
+                yield 'industry_codes.valid_industry', lambda f=field, s=survey, y=year: ind.valid_industry(f, s, y)
+
+
+def _timed(func: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def lookup_metrics(repeat: int) -> Metrics:
+    # Tables are loaded once up front, so cold means "result cache empty", not "table unread"
+    load_geos(), load_industries()
+
+    cold: Dict[str, List[float]] = {}
+    warm: Dict[str, List[float]] = {}
+    for name, func in lookup_cases():
+        crosswalks.clear_cache()
+        cold.setdefault(name, []).append(_timed(func))
+        warm.setdefault(name, []).append(min(_timed(func) for _ in range(repeat)))
+
+    results = {}
+    for name in cold:
+        results[f'lookup.{name}.calls'] = metric(len(cold[name]), 'count')
+        results[f'lookup.{name}.cold_median'] = metric(statistics.median(cold[name]), 's')
+        results[f'lookup.{name}.cold_p95'] = metric(_percentile(cold[name], 0.95), 's')
+        results[f'lookup.{name}.cold_total'] = metric(sum(cold[name]), 's')
+        results[f'lookup.{name}.warm_median'] = metric(statistics.median(warm[name]), 's')
+    return results
+
+
+# -------------------------------------------------------------------------------------------------
+# Table memory and build time
+# -------------------------------------------------------------------------------------------------
+
+def memory_metrics() -> Metrics:
+    results = {}
+    for name, df in [('geographic_codes', load_geos()), ('industry_codes', load_industries())]:
+        results[f'memory.{name}.standard'] = metric(df.estimated_size(), 'bytes')
+        results[f'memory.{name}.compact'] = metric(compact(df).estimated_size(), 'bytes')
+    return results
+
+
+def build_metrics(repeat: int) -> Metrics:
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'data_path': Path(tmp), 'cache_path': Path(tmp) / '.build'}
+        cold = min(_timed(lambda: build(force=True, **paths)) for _ in range(repeat))
+        warm = min(_timed(lambda: build(**paths)) for _ in range(repeat))
+    return {
+        'build.cold': metric(cold, 's'),
+        'build.warm': metric(warm, 's'),
+    }
+
+
+# -------------------------------------------------------------------------------------------------
+# Baseline comparison
+# -------------------------------------------------------------------------------------------------
+
+def regressions(
+    current: Metrics,
+    baseline: Metrics,
+    threshold: float,
+    min_delta: float
+) -> List[Tuple[str, float, float]]:
+
+    worse = []
+    for name, entry in current.items():
+        if name not in baseline or entry['unit'] == 'count':
+            continue
+        old, new = baseline[name]['value'], entry['value']
+        if new > old * (1 + threshold) and (entry['unit'] != 's' or new - old > min_delta):
+            worse.append((name, old, new))
+    return worse
+
+
+def _format(entry: Dict[str, Any]) -> str:
+    value, unit = entry['value'], entry['unit']
+    if unit == 's':
+        return f'{value * 1e3:12.3f} ms'
+    if unit == 'bytes':
+        return f'{value / 2**20:12.3f} MB'
+    return f'{value:12,.0f}   '
+
+
+# -------------------------------------------------------------------------------------------------
+# Benchmark
+# -------------------------------------------------------------------------------------------------
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--output', type=Path, help='write the results to this JSON file')
+    parser.add_argument('--compare', type=Path, help='baseline JSON file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative slowdown')
+    parser.add_argument('--min-delta', type=float, default=1e-4, help='ignore slowdowns below this (s)')
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per import probe')
+    parser.add_argument('--repeat', type=int, default=5, help='repeats per warm timing and build')
+    args = parser.parse_args()
+
+    metrics: Metrics = {}
+    metrics.update(import_metrics(args.runs))
+    metrics.update(lookup_metrics(args.repeat))
+    metrics.update(memory_metrics())
+    metrics.update(build_metrics(args.repeat))
+
+    baseline = json.loads(args.compare.read_text())['metrics'] if args.compare else {}
+
+    print(f'{"metric":<56} {"value":>15} {"baseline":>15}')
+    for name, entry in metrics.items():
+        old = _format(baseline[name]) if name in baseline else ''
+        print(f'{name:<56} {_format(entry)} {old:>15}')
+
+    if args.output:
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', 'HEAD'], capture_output=True, check=True, cwd=BASE_PATH, text=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        report = {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'commit': commit,
+            'python': platform.python_version(),
+            'polars': pl.__version__,
+            'platform': platform.platform(),
+            'metrics': metrics,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+
+    worse = regressions(metrics, baseline, args.threshold, args.min_delta)
+    if worse:
+        print(f'\n{len(worse)} regression(s) over {args.threshold:.0%}:')
+        for name, old, new in worse:
+            print(f'  {name}: {old:.6g} -> {new:.6g} ({new / old - 1:+.0%})')
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
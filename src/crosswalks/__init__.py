@@ -0,0 +1,4 @@
+from crosswalks import namespace  # noqa: F401  (registers the `crosswalk` Polars namespaces)
+from crosswalks.cache import cache_info, clear_cache, set_cache_size
+
+__all__ = ['cache_info', 'clear_cache', 'set_cache_size']
@@ -0,0 +1,228 @@
+'''
+One-to-many (parent to children) lookups stored as CSR adjacency arrays.
+
+`area_mapping('cbsa_code', 'county_fips')` keeps one county per CBSA because its result
+is a dict. An adjacency keeps all of them: the distinct parents are sorted into `keys`,
+the children of `keys[i]` are `values[offsets[i]:offsets[i + 1]]`, and all three are
+Polars Series built once per vintage. Expanding a batch of parents is a join against
+`keys` followed by a gather of `values`, with no Python list per key.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Any, Dict, Optional, Sequence
+
+import polars as pl
+
+from crosswalks.cache import cached
+from crosswalks.compact import decode
+from crosswalks.geographic_codes import DEFAULT_YEAR as DEFAULT_AREA_YEAR
+from crosswalks.geographic_codes import AreaField
+from crosswalks.index import survey_slice, year_slice
+from crosswalks.industry_codes import DEFAULT_SURVEY, IndustryField, Survey
+from crosswalks.industry_codes import DEFAULT_YEAR as DEFAULT_INDUSTRY_YEAR
+from crosswalks.instrument import instrumented
+from crosswalks.tables import load_geos, load_industries
+from crosswalks.utils import to_series
+
+
+# -------------------------------------------------------------------------------------------------
+# CSR adjacency
+# -------------------------------------------------------------------------------------------------
+
+class Adjacency:
+    '''
+    Parent-to-children lookup in compressed sparse row form.
+
+    Attributes:
+        parent: Name of the parent field
+        child: Name of the child field
+    '''
+
+    def __init__(self, pairs: pl.DataFrame):
+        # `pairs` has the parent column first and the child column second
+        self.parent, self.child = pairs.columns
+        pairs = pairs.drop_nulls().unique().sort(self.parent, self.child)
+
+        counts = pairs.group_by(self.parent, maintain_order=True).len()
+        self._keys = counts.get_column(self.parent)
+        self._offsets = pl.concat([
+            pl.Series('offset', [0], pl.Int64),
+            counts.get_column('len').cast(pl.Int64).cum_sum().rename('offset'),
+        ])
+        self._values = pairs.get_column(self.child)
+
+        self._positions = self._keys.to_frame().with_row_index('position')
+        self._index: Optional[Dict[Any, int]] = None
+
+    # Adjacencies are cached and shared, so the arrays are handed out as copies
+
+    @property
+    def keys(self) -> pl.Series:
+        '''
+        Sorted distinct parent codes.
+        '''
+        return self._keys.clone()
+
+    @property
+    def offsets(self) -> pl.Series:
+        '''
+        Start of the children of each key in `values`, followed by len(values).
+        '''
+        return self._offsets.clone()
+
+    @property
+    def values(self) -> pl.Series:
+        '''
+        Children of every key, grouped by key and sorted within each group.
+        '''
+        return self._values.clone()
+
+    def __len__(self) -> int:
+        return self._keys.len()
+
+    def __contains__(self, key: Any) -> bool:
+        return self._position(key) is not None
+
+    def __repr__(self) -> str:
+        return f'Adjacency({self.parent!r} -> {self.child!r}, {len(self)} keys, {self._values.len()} values)'
+
+    def _position(self, key: Any) -> Optional[int]:
+        # Position of a key in `keys`, through a dict built on the first scalar lookup
+        if self._index is None:
+            self._index = {key: i for i, key in enumerate(self._keys)}
+        return self._index.get(key)
+
+    def children(self, key: Any) -> Sequence[Any]:
+        '''
+        Get the children of one parent.
+
+        Args:
+            key: Parent code
+
+        Returns:
+            Tuple of child codes (empty if `key` is not a parent)
+        '''
+        i = self._position(key)
+        if i is None:
+            return ()
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return tuple(self._values.slice(start, end - start))
+
+    def degree(self, values: Any) -> pl.Series:
+        '''
+        Count the children of a column of parents.
+
+        Args:
+            values: Polars Series, NumPy array or list of parent codes
+
+        Returns:
+            UInt32 Series aligned with `values`, 0 for unknown parents
+        '''
+        spans = self._spans(values)
+        return (spans.get_column('end') - spans.get_column('start')).cast(pl.UInt32).rename('degree')
+
+    def expand(self, values: Any) -> pl.DataFrame:
+        '''
+        Expand a column of parents into one row per (parent, child) pair.
+
+        Args:
+            values: Polars Series, NumPy array or list of parent codes
+
+        Returns:
+            DataFrame with the parent and child columns, in the order of `values` and
+            then of the children; unknown and null parents produce no rows
+        '''
+        return (
+            self._spans(values)
+            .select(
+                self.parent,
+                position=pl.int_ranges('start', 'end', dtype=pl.Int64)
+            )
+            .explode('position')
+            .drop_nulls('position')
+            .select(
+                self.parent,
+                pl.lit(self._values).gather(pl.col('position')).alias(self.child)
+            )
+        )
+
+    def _spans(self, values: Any) -> pl.DataFrame:
+        # Start and end offsets in `values` of the children of each input parent
+        starts = self._offsets.slice(0, len(self))
+        ends = self._offsets.slice(1, len(self))
+        return (
+            to_series(values, self.parent, self._keys.dtype)
+            .to_frame()
+            .join(self._positions, how='left', on=self.parent, maintain_order='left')
+            .with_columns(
+                start=pl.lit(starts).gather(pl.col('position')).fill_null(0),
+                end=pl.lit(ends).gather(pl.col('position')).fill_null(0),
+            )
+        )
+
+
+# -------------------------------------------------------------------------------------------------
+# Area and industry adjacencies
+# -------------------------------------------------------------------------------------------------
+
+@instrumented
+@cached(geo_df=load_geos)
+def area_children(
+    parent: AreaField,
+    child: AreaField,
+    year: int = DEFAULT_AREA_YEAR,
+    geo_df: Optional[pl.DataFrame] = None
+) -> Adjacency:
+
+    '''
+    Get the one-to-many mapping from one geographic field to another.
+
+    Args:
+        parent: Parent area (e.g., 'cbsa_code', 'state_fips')
+        child: Child area (e.g., 'county_fips')
+        year: Year for geographic definitions (default: 2023)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        Adjacency from each parent code to all of its child codes
+    '''
+
+    return Adjacency(
+        year_slice(geo_df, year)
+        .select(parent, child)
+        .pipe(decode)
+    )
+
+
+@instrumented
+@cached(industry_df=load_industries)
+def industry_children(
+    parent: IndustryField,
+    child: IndustryField,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_INDUSTRY_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> Adjacency:
+
+    '''
+    Get the one-to-many mapping from one industry field to another.
+
+    Args:
+        parent: Parent industry field (e.g., 'sector')
+        child: Child industry field (e.g., 'detailed_industry')
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        Adjacency from each parent code to all of its child codes
+    '''
+
+    return Adjacency(
+        survey_slice(industry_df, year, survey)
+        .select(parent, child)
+        .pipe(decode)
+    )
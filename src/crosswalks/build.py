@@ -0,0 +1,543 @@
+'''
+Headless, incremental build of the generated tables.
+
+Every reference input is fingerprinted: each area CSV by its content, each sheet of
+`naics_codes.xlsx` by its worksheet XML plus the shared strings it references, so that
+editing or adding one sheet leaves the fingerprints of the others unchanged. The parsed
+result of each vintage is cached under `data/.build` and only rebuilt when its
+fingerprint changes. The outputs are written only when their bytes would change.
+
+    python -m crosswalks.build [--force]
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import hashlib
+import json
+import re
+import zipfile
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import polars as pl
+
+from crosswalks.normalize import SECTOR_RANGES, county_fips
+from crosswalks.tables import DATA_PATH, _valid_manifest, write_artifacts
+
+REFERENCE_PATH = DATA_PATH / 'reference'
+CACHE_PATH = DATA_PATH / '.build'
+
+# Bump when the build logic changes, so every cached intermediate is rebuilt
+BUILD_VERSION = 1
+
+AREA_YEARS = [2003, 2013, 2023]
+NAICS_YEARS = [2007, 2012, 2017, 2022]
+
+FIPS_SCHEMA = {
+    'region': pl.Utf8,
+    'division': pl.Utf8,
+    'state_fips': pl.Utf8,
+    'county_fips': pl.Utf8,
+    'region_name': pl.Utf8,
+    'division_name': pl.Utf8,
+    'state_abbr': pl.Utf8,
+    'state_name': pl.Utf8,
+    'county_name': pl.Utf8,
+}
+
+MSA_SCHEMA = {
+    'state_fips': pl.Utf8,
+    'county_fips': pl.Utf8,
+    'cbsa_code': pl.Utf8,
+    'msa_code': pl.Utf8,
+    'csa_code': pl.Utf8,
+    'cbsa_title': pl.Utf8,
+    'msa_title': pl.Utf8,
+    'csa_title': pl.Utf8,
+    'metro': pl.UInt8,
+    'central': pl.UInt8,
+}
+
+LEVELS = [
+    'domain', 'supersector', 'sector', 'subsector',
+    'industry_group', 'naics_industry', 'detailed_industry'
+]
+
+
+# -------------------------------------------------------------------------------------------------
+# Fingerprints
+# -------------------------------------------------------------------------------------------------
+
+def _hash(*parts: bytes) -> str:
+    digest = hashlib.sha256(str(BUILD_VERSION).encode())
+    for part in parts:
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+def file_fingerprint(*paths: Path) -> str:
+    '''
+    Fingerprint the content of one or more files.
+
+    Args:
+        paths: Files to fingerprint, in order
+
+    Returns:
+        Hex digest of the files and the build version
+    '''
+    return _hash(*(path.read_bytes() for path in paths))
+
+
+_SHEET = re.compile(rb'<sheet [^>]*name="([^"]+)"[^>]*r:id="([^"]+)"')
+_TARGET = re.compile(rb'<Relationship [^>]*Id="([^"]+)"[^>]*Target="([^"]+)"')
+_SHARED = re.compile(rb'<si>.*?</si>', re.S)
+_SHARED_REF = re.compile(rb'<c [^>]*t="s"[^>]*>\s*<v>(\d+)</v>')
+
+
+def sheet_fingerprints(path: Path) -> Dict[str, str]:
+    '''
+    Fingerprint each sheet of an Excel workbook without parsing its cells.
+
+    Worksheets store text as indexes into the workbook-wide shared strings, so a sheet is
+    fingerprinted by its XML together with the shared strings it references, in order.
+
+    Args:
+        path: Path to an .xlsx workbook
+
+    Returns:
+        Dict mapping each sheet name to its fingerprint
+    '''
+    with zipfile.ZipFile(path) as book:
+        targets = {
+            rel_id: target.lstrip(b'/').removeprefix(b'xl/')
+            for rel_id, target in _TARGET.findall(book.read('xl/_rels/workbook.xml.rels'))
+        }
+        try:
+            shared = _SHARED.findall(book.read('xl/sharedStrings.xml'))
+        except KeyError:
+            shared = []
+
+        fingerprints = {}
+        for name, rel_id in _SHEET.findall(book.read('xl/workbook.xml')):
+            xml = book.read('xl/' + targets[rel_id].decode())
+            strings = b''.join(shared[int(i)] for i in _SHARED_REF.findall(xml))
+            fingerprints[name.decode()] = _hash(xml, strings)
+
+    return fingerprints
+
+
+# -------------------------------------------------------------------------------------------------
+# Cache of per-vintage intermediates
+# -------------------------------------------------------------------------------------------------
+
+class BuildCache:
+    '''
+    Parquet files of per-vintage intermediates, keyed by the fingerprint of their inputs.
+    '''
+
+    def __init__(self, path: Path = CACHE_PATH, force: bool = False):
+        self.path = path
+        self.force = force
+        self.rebuilt: List[str] = []
+        try:
+            self._state: Dict[str, str] = json.loads((path / 'state.json').read_text())
+        except (OSError, ValueError):
+            self._state = {}
+
+    def _read(self, key: str, fingerprint: str) -> Optional[pl.DataFrame]:
+        if self.force or self._state.get(key) != fingerprint:
+            return None
+        try:
+            return pl.read_parquet(self.path / f'{key}.parquet')
+        except (OSError, pl.exceptions.PolarsError):
+            return None
+
+    def get(
+        self,
+        fingerprints: Dict[str, str],
+        build: Callable[[List[str]], Dict[str, pl.DataFrame]]
+    ) -> Dict[str, pl.DataFrame]:
+
+        '''
+        Get intermediates, rebuilding those whose inputs changed in one call.
+
+        Args:
+            fingerprints: Dict mapping each intermediate (e.g., 'naics_2022') to the
+                fingerprint of its inputs
+            build: Function that builds the given intermediates from their inputs
+
+        Returns:
+            Dict mapping each intermediate to its DataFrame, in the order of `fingerprints`
+        '''
+
+        found = {key: self._read(key, fingerprint) for key, fingerprint in fingerprints.items()}
+        missing = [key for key, df in found.items() if df is None]
+
+        if missing:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for key, df in build(missing).items():
+                df.write_parquet(self.path / f'{key}.parquet')
+                self._state[key] = fingerprints[key]
+                found[key] = df
+            self.rebuilt.extend(missing)
+
+        return found
+
+    def save(self) -> None:
+        '''
+        Record the fingerprints of the cached intermediates.
+        '''
+        self.path.mkdir(parents=True, exist_ok=True)
+        (self.path / 'state.json').write_text(json.dumps(self._state, indent=2, sort_keys=True) + '\n')
+
+
+# -------------------------------------------------------------------------------------------------
+# Geographic areas
+# -------------------------------------------------------------------------------------------------
+
+def _area_plan(year: int, fips: pl.LazyFrame, reference_path: Path) -> pl.LazyFrame:
+    msa_csa = (
+        pl
+        .scan_csv(
+            reference_path / 'area' / f'{year}.csv',
+            schema_overrides=MSA_SCHEMA
+        )
+        .select(
+            year=pl.lit(year, pl.UInt16),
+            state_fips=pl.col('state_fips')
+                         .str.zfill(2),
+            county_fips=county_fips('state_fips', 'county_fips'),
+            cbsa_code=pl.col('cbsa_code'),
+            msa_code=pl.col('msa_code'),
+            csa_code=pl.col('csa_code'),
+            cbsa_title=pl.col('cbsa_title'),
+            msa_title=pl.col('msa_title'),
+            csa_title=pl.col('csa_title'),
+            metro=pl.col('metro')
+        )
+    )
+
+    # The 2003 file flags metropolitan areas and suffixes titles with the area type
+    if year == 2003:
+        msa_csa = msa_csa.with_columns(
+            metro=pl.when(pl.col('msa_title').str.contains('MSA', literal=True))
+                    .then(pl.lit(1, pl.UInt8))
+                    .otherwise(pl.lit(0, pl.UInt8)),
+            msa_title=pl.col('msa_title')
+                        .str.replace(' MSA', '', literal=True)
+                        .str.replace(' MicroSA', '', literal=True),
+            csa_title=pl.col('msa_title')
+                        .str.replace(' CSA', '', literal=True)
+        )
+
+    return (
+        fips
+        .select(
+            pl.lit(year, pl.UInt16).alias('year'),
+            pl.all()
+        )
+        .join(
+            msa_csa,
+            how='left',
+            on=['year', 'state_fips', 'county_fips'],
+            maintain_order='left'
+        )
+        .with_columns(
+            metro=pl.col('metro')
+                    .fill_null(0)
+        )
+    )
+
+
+def area_vintages(years: Sequence[int], reference_path: Path = REFERENCE_PATH) -> Dict[int, pl.DataFrame]:
+    '''
+    Build the geographic codes of several vintages.
+
+    The vintages are one set of lazy plans over the reference CSVs, collected together
+    so the files are read and joined concurrently.
+
+    Args:
+        years: Area vintages (e.g., [2013, 2023])
+        reference_path: Directory holding the reference files
+
+    Returns:
+        Dict mapping each vintage to the DataFrame of its counties and their areas
+    '''
+    fips = (
+        pl
+        .scan_csv(
+            reference_path / 'area' / 'state_county_fips.csv',
+            schema_overrides=FIPS_SCHEMA
+        )
+        .sort('state_fips', 'county_fips')
+    )
+    plans = [_area_plan(year, fips, reference_path) for year in years]
+    return dict(zip(years, pl.collect_all(plans)))
+
+
+def build_areas(cache: BuildCache, reference_path: Path = REFERENCE_PATH) -> pl.DataFrame:
+    '''
+    Build the geographic codes table from the cached vintages.
+
+    Args:
+        cache: Cache of per-vintage intermediates
+        reference_path: Directory holding the reference files
+
+    Returns:
+        DataFrame with the geographic codes of every vintage
+    '''
+    fips_path = reference_path / 'area' / 'state_county_fips.csv'
+    fingerprints = {
+        f'area_{year}': file_fingerprint(fips_path, reference_path / 'area' / f'{year}.csv')
+        for year in AREA_YEARS
+    }
+
+    def build(keys: List[str]) -> Dict[str, pl.DataFrame]:
+        years = [int(key.removeprefix('area_')) for key in keys]
+        return {f'area_{year}': df for year, df in area_vintages(years, reference_path).items()}
+
+    return pl.concat(cache.get(fingerprints, build).values())
+
+
+# -------------------------------------------------------------------------------------------------
+# Industry codes
+# -------------------------------------------------------------------------------------------------
+
+SUPERSECTOR_BY_SECTOR = {
+    '11': '10', '21': '10',
+    '23': '20',
+    '31': '30',
+    '22': '40', '42': '40', '44': '40', '48': '40',
+    '51': '50',
+    '52': '55', '53': '55',
+    '54': '60', '55': '60', '56': '60',
+    '61': '65', '62': '65',
+    '71': '70', '72': '70',
+    '81': '80',
+    '92': '92',
+}
+
+DOMAIN_BY_SUPERSECTOR = {
+    '10': '06', '20': '06', '30': '06',
+    '40': '07', '50': '07', '55': '07', '60': '07', '65': '07', '70': '07', '80': '07', '92': '07',
+}
+
+
+def naics_vintages(years: Sequence[int], reference_path: Path = REFERENCE_PATH) -> Dict[int, pl.DataFrame]:
+    '''
+    Read the NAICS codes of several vintages from their sheets of `naics_codes.xlsx`.
+
+    The workbook is opened once for all the sheets, so the archive and its shared strings
+    are parsed once rather than once per sheet.
+
+    Args:
+        years: NAICS vintages (e.g., [2017, 2022])
+        reference_path: Directory holding the reference files
+
+    Returns:
+        Dict mapping each vintage to the DataFrame of its codes, lengths and titles
+    '''
+    sheets = pl.read_excel(
+        reference_path / 'industry' / 'naics_codes.xlsx',
+        sheet_name=[f'naics_{year}' for year in years]
+    )
+
+    return {
+        year: (
+            sheets[f'naics_{year}']
+            .select(
+                year=pl.lit(year, pl.UInt16),
+                ces=pl.col('ces')
+                      .cast(pl.UInt8),
+                bed=pl.lit(1, pl.UInt8),
+                qcew=pl.lit(1, pl.UInt8),
+                naics_len=pl.col('naics_len')
+                            .cast(pl.UInt8),
+                naics_code=pl.when(pl.col('naics_len').eq(0))
+                             .then(pl.col('naics_code').cast(pl.Utf8).str.zfill(2))
+                             .otherwise(pl.col('naics_code').cast(pl.Utf8)),
+                naics_title=pl.col('naics_title')
+            )
+            .unique(maintain_order=True)
+        )
+        for year in years
+    }
+
+
+def assemble_industries(naics: pl.DataFrame) -> pl.DataFrame:
+    '''
+    Derive the hierarchy and titles of every 6-digit industry.
+
+    The codes of every level come from one projection of the 6-digit code. Each level
+    takes its title from the sheet of the same vintage, joined on (year, code); codes a
+    sheet does not list (e.g., sector '31' in 2022, which lists '31-33' only under its
+    subsectors) fall back to the title of the latest vintage that has the code.
+
+    Args:
+        naics: Codes, lengths and titles of every vintage, in vintage order
+
+    Returns:
+        DataFrame with the industry codes of every vintage
+    '''
+
+    # Sheets pad some titles with trailing blanks
+    naics = naics.with_columns(pl.col('naics_title').str.strip_chars())
+
+    code = pl.col('naics_code')
+    sector = code.str.slice(0, 2).replace(SECTOR_RANGES)
+    supersector = sector.replace_strict(SUPERSECTOR_BY_SECTOR, default='99', return_dtype=pl.Utf8)
+    domain = supersector.replace_strict(DOMAIN_BY_SUPERSECTOR, default='99', return_dtype=pl.Utf8)
+
+    industries = (
+        naics
+        .lazy()
+        .filter(
+            pl.col('naics_len').eq(6)
+        )
+        .select(
+            'year', 'ces', 'bed', 'qcew',
+            domain=domain,
+            supersector=supersector,
+            sector=sector,
+            subsector=code.str.slice(0, 3),
+            industry_group=code.str.slice(0, 4),
+            naics_industry=code.str.slice(0, 5),
+            detailed_industry=code
+        )
+    )
+
+    for depth, level in enumerate(LEVELS):
+        titles = naics.filter(pl.col('naics_len').eq(depth))
+        latest = titles.unique(subset='naics_code', keep='last', maintain_order=True)
+        industries = (
+            industries
+            .join(
+                titles
+                .lazy()
+                .select('year', 'naics_title', pl.col('naics_code').alias(level)),
+                how='left',
+                on=['year', level],
+                maintain_order='left'
+            )
+            .with_columns(
+                pl.coalesce(
+                    'naics_title',
+                    pl.col(level).replace_strict(
+                        latest.get_column('naics_code'),
+                        latest.get_column('naics_title'),
+                        default=None,
+                        return_dtype=pl.Utf8
+                    )
+                )
+                .alias(f'{level}_name')
+            )
+            .drop('naics_title')
+        )
+
+    return (
+        industries
+        .unique(subset=['year', *LEVELS], keep='first', maintain_order=True)
+        .sort('year', *LEVELS, maintain_order=True)
+        .collect()
+    )
+
+
+def build_industries(cache: BuildCache, reference_path: Path = REFERENCE_PATH) -> pl.DataFrame:
+    '''
+    Build the industry codes table from the cached vintages.
+
+    Only the sheets are cached; attaching the titles of each vintage is cheap and runs
+    on every build.
+
+    Args:
+        cache: Cache of per-vintage intermediates
+        reference_path: Directory holding the reference files
+
+    Returns:
+        DataFrame with the industry codes of every vintage
+    '''
+    sheets = sheet_fingerprints(reference_path / 'industry' / 'naics_codes.xlsx')
+    fingerprints = {f'naics_{year}': sheets[f'naics_{year}'] for year in NAICS_YEARS}
+
+    def build(keys: List[str]) -> Dict[str, pl.DataFrame]:
+        years = [int(key.removeprefix('naics_')) for key in keys]
+        return {f'naics_{year}': df for year, df in naics_vintages(years, reference_path).items()}
+
+    return assemble_industries(pl.concat(cache.get(fingerprints, build).values()))
+
+
+# -------------------------------------------------------------------------------------------------
+# Outputs
+# -------------------------------------------------------------------------------------------------
+
+def write_table(name: str, df: pl.DataFrame, data_path: Path = DATA_PATH) -> bool:
+    '''
+    Write a generated table and its binary artifacts, unless nothing would change.
+
+    Args:
+        name: Table name ('geographic_codes' or 'industry_codes')
+        df: The generated table
+        data_path: Directory holding the CSV and the artifacts
+
+    Returns:
+        Whether the table was written
+    '''
+    path = data_path / f'{name}.csv'
+    content = df.write_csv().encode()
+
+    if path.exists() and path.read_bytes() == content and _valid_manifest(name, data_path):
+        return False
+
+    path.write_bytes(content)
+    write_artifacts(name, data_path)
+    return True
+
+
+def build(
+    force: bool = False,
+    data_path: Path = DATA_PATH,
+    reference_path: Path = REFERENCE_PATH,
+    cache_path: Path = CACHE_PATH
+) -> Dict[str, Tuple[bool, List[str]]]:
+
+    '''
+    Build the geographic and industry codes tables, rebuilding only what changed.
+
+    Args:
+        force: Rebuild every vintage and rewrite every output
+        data_path: Directory for the generated tables
+        reference_path: Directory holding the reference files
+        cache_path: Directory for the cached intermediates
+
+    Returns:
+        Dict mapping each table name to whether it was written and the vintages rebuilt
+    '''
+
+    cache = BuildCache(cache_path, force)
+    results = {}
+
+    for name, builder in [
+        ('geographic_codes', build_areas),
+        ('industry_codes', build_industries)
+    ]:
+        start = len(cache.rebuilt)
+        df = builder(cache, reference_path)
+        if force:
+            (data_path / f'{name}.csv').unlink(missing_ok=True)
+        results[name] = (write_table(name, df, data_path), cache.rebuilt[start:])
+
+    cache.save()
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build the generated crosswalk tables.')
+    parser.add_argument('--force', action='store_true', help='rebuild and rewrite everything')
+    args = parser.parse_args()
+
+    for name, (written, rebuilt) in build(force=args.force).items():
+        status = 'written' if written else 'unchanged'
+        print(f'{name}: {status}; rebuilt vintages: {", ".join(rebuilt) or "none"}')
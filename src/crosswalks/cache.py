@@ -0,0 +1,242 @@
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import inspect
+import threading
+import weakref
+from collections import OrderedDict
+from functools import wraps
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, NamedTuple, Tuple
+
+import polars as pl
+
+from crosswalks.instrument import add_cache
+
+DEFAULT_MAXSIZE = 512
+
+
+# -------------------------------------------------------------------------------------------------
+# Cache statistics
+# -------------------------------------------------------------------------------------------------
+
+class CacheInfo(NamedTuple):
+    '''
+    Snapshot of the mapping cache statistics.
+    '''
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+# -------------------------------------------------------------------------------------------------
+# Bounded LRU cache for lookup results
+# -------------------------------------------------------------------------------------------------
+
+class MappingCache:
+    '''
+    Thread-safe LRU cache for the results of the lookup functions.
+
+    Entries are keyed on the function and its arguments. DataFrame arguments are keyed
+    on their identity and held through weak references, so a cached result is never
+    returned for a different DataFrame that happens to reuse the same id.
+    '''
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE):
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: Hashable, frames: Tuple[pl.DataFrame, ...]) -> Tuple[bool, Any]:
+        '''
+        Look up a cached value.
+
+        Args:
+            key: Cache key
+            frames: DataFrames the cached value was built from
+
+        Returns:
+            Tuple of (found, value)
+        '''
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                refs, value = entry
+                if all(ref() is frame for ref, frame in zip(refs, frames)):
+                    self._data.move_to_end(key)
+                    self._hits += 1
+                    return True, value
+                del self._data[key]
+            self._misses += 1
+            return False, None
+
+    def put(self, key: Hashable, frames: Tuple[pl.DataFrame, ...], value: Any) -> None:
+        '''
+        Store a value, evicting the least recently used entries beyond maxsize.
+
+        Args:
+            key: Cache key
+            frames: DataFrames the value was built from
+            value: Value to cache
+        '''
+        refs = tuple(weakref.ref(frame) for frame in frames)
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+            self._data[key] = (refs, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def clear(self) -> None:
+        '''
+        Remove all entries and reset the statistics.
+        '''
+        with self._lock:
+            self._data.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def resize(self, maxsize: int) -> None:
+        '''
+        Change the maximum number of entries, evicting as needed.
+
+        Args:
+            maxsize: New maximum number of entries (0 disables caching)
+        '''
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._data) > max(maxsize, 0):
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def info(self) -> CacheInfo:
+        '''
+        Get the current cache statistics.
+
+        Returns:
+            CacheInfo with hits, misses, evictions, maxsize and currsize
+        '''
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._evictions, self._maxsize, len(self._data)
+            )
+
+
+mapping_cache = MappingCache()
+
+
+# -------------------------------------------------------------------------------------------------
+# Decorator for cached lookup functions
+# -------------------------------------------------------------------------------------------------
+
+def _freeze_key(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_key(v) for v in value)
+    return value
+
+
+def _freeze_result(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType(value)
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def _copy_result(value: Any) -> Any:
+    # Polars clones share their buffers, so this is cheap; in-place changes to the copy
+    # (e.g., drop_in_place) leave the cached frame alone
+    if isinstance(value, (pl.DataFrame, pl.Series)):
+        return value.clone()
+    return value
+
+
+def cached(**tables: Callable[[], pl.DataFrame]) -> Callable[[Callable], Callable]:
+    '''
+    Cache the results of a lookup function in the shared mapping cache.
+
+    DataFrame arguments named in `tables` that are left as None are resolved through
+    the given loader before the cache key is built, so the default tables are keyed on
+    their identity like any other DataFrame. Dict results are returned as read-only
+    mappings, list results as tuples and DataFrame and Series results as copies, so
+    callers cannot corrupt the shared copy.
+
+    Args:
+        tables: Loaders for the default DataFrame of each DataFrame argument
+
+    Returns:
+        Decorator for the lookup function
+    '''
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        name = f'{func.__module__}.{func.__qualname__}'
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            for arg, loader in tables.items():
+                if bound.arguments.get(arg) is None:
+                    bound.arguments[arg] = loader()
+
+            parts, frames = [], []
+            for arg, value in bound.arguments.items():
+                if isinstance(value, pl.DataFrame):
+                    parts.append((arg, id(value)))
+                    frames.append(value)
+                else:
+                    parts.append((arg, _freeze_key(value)))
+
+            key = (name, tuple(parts))
+            frames = tuple(frames)
+
+            found, value = mapping_cache.get(key, frames)
+            add_cache(found)
+            if found:
+                return _copy_result(value)
+
+            value = _freeze_result(func(*bound.args, **bound.kwargs))
+            mapping_cache.put(key, frames, value)
+            return _copy_result(value)
+
+        return wrapper
+
+    return decorator
+
+
+# -------------------------------------------------------------------------------------------------
+# Public cache controls
+# -------------------------------------------------------------------------------------------------
+
+def clear_cache() -> None:
+    '''
+    Clear all cached lookup results and reset the statistics.
+    '''
+    mapping_cache.clear()
+
+
+def cache_info() -> CacheInfo:
+    '''
+    Get hit/miss statistics for the lookup cache.
+
+    Returns:
+        CacheInfo with hits, misses, evictions, maxsize and currsize
+    '''
+    return mapping_cache.info()
+
+
+def set_cache_size(maxsize: int) -> None:
+    '''
+    Set the maximum number of cached lookup results.
+
+    Args:
+        maxsize: Maximum number of entries (0 disables caching)
+    '''
+    mapping_cache.resize(maxsize)
@@ -0,0 +1,103 @@
+'''
+Compact representation of the crosswalk tables.
+
+Code columns whose values are all fixed-width digit strings are stored as UInt32 (the
+width of each column is fixed, so leading zeros are restored from `CODE_WIDTHS`), the
+remaining string columns as Enums, `year` as UInt16 and `metro` as UInt8. Lookups
+decode back to strings at the API boundary, so results are identical in either mode.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import polars as pl
+
+CODE_WIDTHS = {
+    'region': 1,
+    'division': 2,
+    'state_fips': 2,
+    'county_fips': 5,
+    'cbsa_code': 5,
+    'msa_code': 5,
+    'csa_code': 3,
+    'domain': 2,
+    'supersector': 2,
+    'sector': 2,
+    'subsector': 3,
+    'industry_group': 4,
+    'naics_industry': 5,
+    'detailed_industry': 6,
+}
+
+COMPACT_INTEGERS = {
+    'year': pl.UInt16,
+    'metro': pl.UInt8,
+}
+
+
+# -------------------------------------------------------------------------------------------------
+# Encode
+# -------------------------------------------------------------------------------------------------
+
+def _integer_code(series: pl.Series) -> bool:
+    # Only columns of digit strings that all have the column's width round-trip exactly
+    width = CODE_WIDTHS.get(series.name)
+    values = series.drop_nulls()
+    return (
+        width is not None and
+        values.str.contains(r'^[0-9]+$').all() and
+        (values.str.len_chars() == width).all()
+    )
+
+
+def compact(df: pl.DataFrame) -> pl.DataFrame:
+    '''
+    Convert a crosswalk table to the compact representation.
+
+    Args:
+        df: DataFrame with geographic or industry data
+
+    Returns:
+        DataFrame with integer-encoded codes and Enum-encoded titles
+    '''
+    columns = []
+    for series in df.get_columns():
+        if series.name in COMPACT_INTEGERS:
+            columns.append(series.cast(COMPACT_INTEGERS[series.name]))
+        elif series.dtype != pl.Utf8:
+            columns.append(series)
+        elif _integer_code(series):
+            columns.append(series.cast(pl.UInt32))
+        else:
+            columns.append(series.cast(pl.Enum(series.drop_nulls().unique().sort())))
+    return pl.DataFrame(columns)
+
+
+# -------------------------------------------------------------------------------------------------
+# Decode at the API boundary
+# -------------------------------------------------------------------------------------------------
+
+def decode(df: pl.DataFrame) -> pl.DataFrame:
+    '''
+    Convert compact code and title columns back to strings.
+
+    Columns that are already strings are returned unchanged, so this is a no-op for
+    tables in the standard representation.
+
+    Args:
+        df: DataFrame selected from a crosswalk table
+
+    Returns:
+        DataFrame with code and title columns as strings
+    '''
+    exprs = []
+    for name, dtype in df.schema.items():
+        if isinstance(dtype, (pl.Enum, pl.Categorical)):
+            exprs.append(pl.col(name).cast(pl.Utf8))
+        elif dtype.is_integer() and name in CODE_WIDTHS:
+            exprs.append(pl.col(name).cast(pl.Utf8).str.zfill(CODE_WIDTHS[name]))
+        elif name in COMPACT_INTEGERS and dtype != pl.Int64:
+            exprs.append(pl.col(name).cast(pl.Int64))
+
+    return df.with_columns(exprs) if exprs else df
@@ -0,0 +1,233 @@
+'''
+Differences between two vintages of the area or industry definitions.
+
+For one key field (e.g., CBSAs, counties or detailed NAICS industries) the diff lists
+every key that was added or removed, re-parented (a parent field such as its CSA or
+sector changed) or retitled. It is a typed change table with one row per key and
+changed field; added and removed keys have a row for each of their parents and title:
+
+    area_diff('cbsa_code', 2013, 2023)
+
+    key     change      field       before                  after
+    10380   retitled    cbsa_title  Aguadilla-Isabela, PR   Aguadilla, PR
+    10760   added       csa_code    null                    194
+    10760   added       cbsa_title  null                    Alexander City, AL
+
+Downstream jobs recompute only the aggregates that `affected` returns for a field,
+instead of the whole cube.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import List, Optional, Sequence
+
+import polars as pl
+
+from crosswalks.cache import cached
+from crosswalks.index import survey_slice, year_slice
+from crosswalks.industry_codes import DEFAULT_SURVEY, Survey
+from crosswalks.instrument import instrumented
+from crosswalks.naics import LEVELS
+from crosswalks.tables import load_geos, load_industries
+from crosswalks.utils import mapping_frame
+
+CHANGES = ('added', 'removed', 'reparented', 'retitled')
+
+CHANGE_SCHEMA = {
+    'key': pl.Utf8,
+    'change': pl.Enum(CHANGES),
+    'field': pl.Utf8,
+    'before': pl.Utf8,
+    'after': pl.Utf8,
+}
+
+# Parent fields compared for each area key
+AREA_PARENTS = {
+    'region': [],
+    'division': ['region'],
+    'state_fips': ['region', 'division'],
+    'county_fips': ['state_fips', 'cbsa_code', 'msa_code', 'csa_code', 'metro'],
+    'cbsa_code': ['csa_code', 'metro'],
+    'msa_code': ['csa_code'],
+    'csa_code': [],
+}
+
+AREA_TITLES = {
+    'region': 'region_name',
+    'division': 'division_name',
+    'state_fips': 'state_name',
+    'county_fips': 'county_name',
+    'cbsa_code': 'cbsa_title',
+    'msa_code': 'msa_title',
+    'csa_code': 'csa_title',
+}
+
+
+# -------------------------------------------------------------------------------------------------
+# Diff of two mapping frames
+# -------------------------------------------------------------------------------------------------
+
+def _diff(
+    before: pl.DataFrame,
+    after: pl.DataFrame,
+    parents: List[str],
+    title: str
+) -> pl.DataFrame:
+
+    # `before` and `after` have the key first and one row per key; a null key is not an
+    # area or industry of its own
+    key = before.columns[0]
+    before, after = before.drop_nulls(key), after.drop_nulls(key)
+    fields = [*parents, title]
+    joined = (
+        before
+        .with_columns(pl.lit(True).alias('_before'))
+        .join(
+            after.with_columns(pl.lit(True).alias('_after')),
+            how='full',
+            on=key,
+            coalesce=True,
+            suffix='_new'
+        )
+    )
+
+    changes = [
+        joined
+        .select(
+            key=pl.col(key),
+            change=(
+                pl.when(pl.col('_after').is_null()).then(pl.lit('removed'))
+                  .when(pl.col('_before').is_null()).then(pl.lit('added'))
+                  .when(pl.lit(field == title)).then(pl.lit('retitled'))
+                  .otherwise(pl.lit('reparented'))
+            ),
+            field=pl.lit(field),
+            before=pl.col(field).cast(pl.Utf8),
+            after=pl.col(f'{field}_new').cast(pl.Utf8)
+        )
+        .filter(pl.col('before').ne_missing(pl.col('after')))
+        for field in fields
+    ]
+
+    # Sorted by key, then in the order of the fields
+    order = {field: i for i, field in enumerate(fields)}
+    return (
+        pl
+        .concat(changes)
+        .cast(CHANGE_SCHEMA)
+        .sort(pl.col('key'), pl.col('field').replace_strict(order, return_dtype=pl.UInt8))
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Area and industry diffs
+# -------------------------------------------------------------------------------------------------
+
+@instrumented
+@cached(geo_df=load_geos)
+def area_diff(
+    key: str,
+    from_year: int,
+    to_year: int,
+    parents: Optional[Sequence[str]] = None,
+    geo_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Compare the areas of one key field between two vintages.
+
+    Args:
+        key: Area code field to compare ('region', 'division', 'state_fips',
+            'county_fips', 'cbsa_code', 'msa_code', 'csa_code')
+        from_year: Year of the earlier definitions (e.g., 2013)
+        to_year: Year of the later definitions (e.g., 2023)
+        parents: Parent fields to compare (default: the areas containing `key`, e.g.
+            state, CBSA, MSA, CSA and metro status for counties)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        DataFrame with 'key', 'change' ('added', 'removed', 'reparented', 'retitled'),
+        'field', 'before' and 'after'; added and removed keys list their parents and
+        title, null values left out
+    '''
+
+    if key not in AREA_PARENTS:
+        raise ValueError(f'key must be one of {tuple(AREA_PARENTS)}, got {key!r}')
+
+    parents = AREA_PARENTS[key] if parents is None else list(parents)
+    fields = [*parents, AREA_TITLES[key]]
+    return _diff(
+        mapping_frame(year_slice(geo_df, from_year), key, fields),
+        mapping_frame(year_slice(geo_df, to_year), key, fields),
+        parents,
+        AREA_TITLES[key]
+    )
+
+
+@instrumented
+@cached(industry_df=load_industries)
+def industry_diff(
+    level: str,
+    from_year: int,
+    to_year: int,
+    survey: Survey = DEFAULT_SURVEY,
+    parents: Optional[Sequence[str]] = None,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Compare the industries of one NAICS level between two vintages.
+
+    Args:
+        level: Industry level to compare (e.g., 'detailed_industry')
+        from_year: NAICS vintage of the earlier definitions (e.g., 2017)
+        to_year: NAICS vintage of the later definitions (e.g., 2022)
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        parents: Parent levels to compare (default: every level above `level`)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        DataFrame with 'key', 'change' ('added', 'removed', 'reparented', 'retitled'),
+        'field', 'before' and 'after'; added and removed keys list their parents and
+        title, null values left out
+    '''
+
+    if level not in LEVELS:
+        raise ValueError(f'level must be one of {LEVELS}, got {level!r}')
+
+    parents = LEVELS[:LEVELS.index(level)] if parents is None else list(parents)
+    fields = [*parents, f'{level}_name']
+    return _diff(
+        mapping_frame(survey_slice(industry_df, from_year, survey), level, fields),
+        mapping_frame(survey_slice(industry_df, to_year, survey), level, fields),
+        parents,
+        f'{level}_name'
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Affected aggregates
+# -------------------------------------------------------------------------------------------------
+
+def affected(changes: pl.DataFrame, field: Optional[str] = None) -> Sequence[str]:
+    '''
+    Get the codes whose aggregates a change table invalidates.
+
+    Args:
+        changes: Change table from `area_diff` or `industry_diff`
+        field: Parent field aggregated on (e.g., 'cbsa_code'), or None for the changed
+            keys themselves
+
+    Returns:
+        Sorted list of codes: the keys with any change, or every value of `field` a
+        key moved out of or into
+    '''
+    if field is None:
+        codes = changes.get_column('key')
+    else:
+        moves = changes.filter(pl.col('field') == field)
+        codes = pl.concat([moves.get_column('before'), moves.get_column('after')])
+
+    return codes.drop_nulls().unique().sort().to_list()
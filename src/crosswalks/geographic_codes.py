@@ -2,66 +2,73 @@
 # Imports and parameters
 # -------------------------------------------------------------------------------------------------
 
-from pathlib import Path
-from typing import Dict, List, Literal
+from typing import TYPE_CHECKING, Any, FrozenSet, Literal, Mapping, Optional, Sequence, Union
 
 import polars as pl
 
-BASE_PATH = Path(__file__).parent.parent.parent
+from crosswalks.cache import cached
+from crosswalks.compact import decode
+from crosswalks.index import table_index, year_slice
+from crosswalks.instrument import instrumented
+from crosswalks.tables import BASE_PATH, load_geos
+from crosswalks.utils import COLUMNAR_OUTPUTS, frame_output, mapping_frame, series_output, translate
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
 DEFAULT_YEAR = 2023
+OUTPUTS = ('dict', *COLUMNAR_OUTPUTS)
+LIST_OUTPUTS = ('list', *COLUMNAR_OUTPUTS)
+
+AreaField = Literal[
+    'region', 'region_name',
+    'division', 'division_name',
+    'state_fips', 'state_abbr', 'state_name',
+    'county_fips', 'county_name',
+    'cbsa_code', 'cbsa_title',
+    'msa_code', 'msa_title',
+    'csa_code', 'csa_title',
+    'metro'
+]
 
 
 # -------------------------------------------------------------------------------------------------
-# Load geographic areas data
+# Lazily loaded geographic areas data
 # -------------------------------------------------------------------------------------------------
 
-geos_df = (
-    pl
-    .read_csv(
-        f'{BASE_PATH}/data/geographic_codes.csv', 
-        schema_overrides={
-            'year': pl.Int64,
-            'region': pl.Utf8,
-            'division': pl.Utf8,
-            'state_fips': pl.Utf8,
-            'county_fips': pl.Utf8,
-            'region_name': pl.Utf8,
-            'division_name': pl.Utf8,
-            'state_abbr': pl.Utf8,
-            'state_name': pl.Utf8,
-            'county_name': pl.Utf8,
-            'cbsa_code': pl.Utf8,
-            'msa_code': pl.Utf8,
-            'csa_code': pl.Utf8,
-            'cbsa_title': pl.Utf8,
-            'msa_title': pl.Utf8,
-            'csa_title': pl.Utf8,
-            'metro': pl.Int64,
-        }
-    )
-)
+def __getattr__(name: str) -> pl.DataFrame:
+    # `geos_df` is loaded on first access rather than at import time
+    if name == 'geos_df':
+        return load_geos()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
 
 # -------------------------------------------------------------------------------------------------
 # List available years
 # -------------------------------------------------------------------------------------------------
 
-def available_years(geo_df: pl.DataFrame = geos_df) -> List[int]:
+@instrumented
+@cached(geo_df=load_geos)
+def available_years(geo_df: Optional[pl.DataFrame] = None) -> Sequence[int]:
     '''
     Get a list of available years in the geographic data.
     
     Args:
-        geo_df: DataFrame with geographic data
+        geo_df: DataFrame with geographic data (default: the bundled table)
         
     Returns:
-        List of available years
+        Tuple of available years
     '''
-    return geo_df.get_column('year').unique().sort().to_list()
+    return table_index(geo_df).years
 
 
 # -------------------------------------------------------------------------------------------------
 # Mapping geographic area from one key to another
 # -------------------------------------------------------------------------------------------------
 
+@instrumented
+@cached(geo_df=load_geos)
 def area_mapping(
     from_area: Literal[
         'region', 'region_name',
@@ -73,52 +80,61 @@ def area_mapping(
         'csa_code', 'csa_title',
         'metro'
     ], 
-    to_area: Literal[
-        'region', 'region_name',
-        'division', 'division_name',
-        'state_fips', 'state_abbr', 'state_name',
-        'county_fips', 'county_name',
-        'cbsa_code', 'cbsa_title',
-        'msa_code', 'msa_title',
-        'csa_code', 'csa_title',
-        'metro'
-    ], 
+    to_area: Union[AreaField, Sequence[AreaField]],
     year: int = DEFAULT_YEAR,
-    geo_df: pl.DataFrame = geos_df
-) -> Dict[str, str]:
+    geo_df: Optional[pl.DataFrame] = None,
+    output: Literal['dict', 'polars', 'arrow', 'numpy'] = 'dict'
+) -> Union[Mapping[str, Any], pl.DataFrame, 'pa.Table', Mapping[str, 'np.ndarray']]:
 
     '''
     Create a mapping dictionary from one geographic field to another.
     
     Args:
         from_area: Source area (e.g., 'state_fips')
-        to_area: Target area (e.g., 'region', 'division')
+        to_area: Target area (e.g., 'region'), or a list of target areas read in one pass
         year: Year for geographic definitions (default: 2023)
-        geo_df: DataFrame with geographic data
+        geo_df: DataFrame with geographic data (default: the bundled table)
+        output: 'dict' for a read-only dict, or 'polars', 'arrow' or 'numpy' for the
+            mapping as a DataFrame, a pyarrow Table or a dict of NumPy arrays
         
     Returns:
-        Dict mapping from_area values to to_area values
+        Read-only dict mapping from_area values to to_area values (to a tuple of values
+        when to_area is a list), or the columns from_area followed by the targets, one
+        row per from_area value
     '''
 
-    return dict(
-        geo_df
-        .filter(pl.col('year') == year)
-        .select(from_area, to_area)
-        .sort(from_area, to_area)
-        .unique(maintain_order=True)
-        .iter_rows()
-    )
+    if output not in OUTPUTS:
+        raise ValueError(f'output must be one of {OUTPUTS}, got {output!r}')
+
+    if isinstance(to_area, str) and output == 'dict':
+        return dict(
+            year_slice(geo_df, year)
+            .select(from_area, to_area)
+            .pipe(decode)
+            .sort(from_area, to_area)
+            .unique(maintain_order=True)
+            .iter_rows()
+        )
+
+    # Several targets are read in one pass over the same slice, one row per source value
+    frame = _area_frame(from_area, to_area, year, geo_df)
+    if output == 'dict':
+        return {row[0]: row[1:] for row in frame.iter_rows()}
+    return frame_output(frame, output)
 
 
 # -------------------------------------------------------------------------------------------------
 # Mapping geographic area id to name mapping
 # -------------------------------------------------------------------------------------------------
 
+@instrumented
+@cached(geo_df=load_geos)
 def get_area(
     area: Literal['region', 'division', 'state', 'county', 'cbsa', 'msa', 'csa'],
     year: int = DEFAULT_YEAR,
-    geo_df: pl.DataFrame = geos_df
-) -> Dict[str, str]:
+    geo_df: Optional[pl.DataFrame] = None,
+    output: Literal['dict', 'polars', 'arrow', 'numpy'] = 'dict'
+) -> Union[Mapping[str, str], pl.DataFrame, 'pa.Table', Mapping[str, 'np.ndarray']]:
 
     '''
     Get a mapping of area codes to area names.
@@ -126,12 +142,18 @@ def get_area(
     Args:
         area: Type of area ('region', 'division', 'state', 'county', 'cbsa', 'msa', 'csa')
         year: Year for geographic definitions (default: 2023)
-        geo_df: DataFrame with geographic data
+        geo_df: DataFrame with geographic data (default: the bundled table)
+        output: 'dict' for a read-only dict, or 'polars', 'arrow' or 'numpy' for the
+            codes and names as a DataFrame, a pyarrow Table or a dict of NumPy arrays
         
     Returns:
-        Dict mapping area codes to area names
+        Read-only dict mapping area codes to area names, or the code and name columns
+        with one row per code
     '''
 
+    if output not in OUTPUTS:
+        raise ValueError(f'output must be one of {OUTPUTS}, got {output!r}')
+
     if area in ['region', 'division']:
         _id = area
         _title = area + '_name'
@@ -143,10 +165,13 @@ def get_area(
         _id = area + '_code'
         _title = area + '_title'
 
+    if output != 'dict':
+        return frame_output(_area_frame(_id, _title, year, geo_df), output)
+
     return dict(
-        geo_df
-        .filter(pl.col('year') == year)
+        year_slice(geo_df, year)
         .select(_id, _title)
+        .pipe(decode)
         .sort(_id, _title)
         .unique(maintain_order=True)
         .iter_rows()
@@ -157,6 +182,8 @@ def get_area(
 # List valid area codes and titles
 # -------------------------------------------------------------------------------------------------
 
+@instrumented
+@cached(geo_df=load_geos)
 def valid_area(area: Literal[
         'region', 'region_name',
         'division', 'division_name',
@@ -168,8 +195,9 @@ def valid_area(area: Literal[
         'metro'
     ], 
     year: int = DEFAULT_YEAR,
-    geo_df: pl.DataFrame = geos_df
-) -> List[str]:
+    geo_df: Optional[pl.DataFrame] = None,
+    output: Literal['list', 'polars', 'arrow', 'numpy'] = 'list'
+) -> Union[Sequence[str], pl.Series, 'pa.Array', 'np.ndarray']:
 
     '''
     Get a list of valid codes for a given area type.
@@ -177,17 +205,96 @@ def valid_area(area: Literal[
     Args:
         area: Column name for area type (e.g., 'region', 'state_fips', 'cbsa_code')
         year: Year for geographic definitions (default: 2023)
-        geo_df: DataFrame with geographic data
+        geo_df: DataFrame with geographic data (default: the bundled table)
+        output: 'list' for a tuple, or 'polars', 'arrow' or 'numpy' for the codes as a
+            Series, a pyarrow Array or a NumPy array
         
     Returns:
-        List of valid area codes
+        Tuple of valid area codes, sorted
     '''
 
-    return list(
-        geo_df
-        .filter(pl.col('year') == year)
+    if output not in LIST_OUTPUTS:
+        raise ValueError(f'output must be one of {LIST_OUTPUTS}, got {output!r}')
+
+    codes = (
+        year_slice(geo_df, year)
+        .select(area)
+        .pipe(decode)
         .get_column(area)
         .unique()
         .sort()
-        .to_list()
     )
+    if output != 'list':
+        return series_output(codes, output)
+    return codes.to_list()
+
+
+@instrumented
+@cached(geo_df=load_geos)
+def valid_area_set(
+    area: AreaField,
+    year: int = DEFAULT_YEAR,
+    geo_df: Optional[pl.DataFrame] = None
+) -> FrozenSet[str]:
+
+    '''
+    Get the valid codes for a given area type as a set, for O(1) membership tests.
+
+    Args:
+        area: Column name for area type (e.g., 'region', 'state_fips', 'cbsa_code')
+        year: Year for geographic definitions (default: 2023)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        Frozenset of valid area codes
+    '''
+
+    return frozenset(valid_area(area, year, geo_df))
+
+
+# -------------------------------------------------------------------------------------------------
+# Vectorized translation of area codes
+# -------------------------------------------------------------------------------------------------
+
+@cached(geo_df=load_geos)
+def _area_frame(
+    from_area: AreaField,
+    to_area: Union[AreaField, Sequence[AreaField]],
+    year: int = DEFAULT_YEAR,
+    geo_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    return mapping_frame(
+        year_slice(geo_df, year),
+        from_area,
+        to_area
+    )
+
+
+@instrumented
+def translate_area(
+    values: Any,
+    from_area: AreaField,
+    to_area: AreaField,
+    year: int = DEFAULT_YEAR,
+    geo_df: Optional[pl.DataFrame] = None
+) -> pl.Series:
+
+    '''
+    Translate a column of area values from one geographic field to another.
+
+    The translation is a single vectorized join against the mapping table, so it scales
+    to millions of rows without building a Python dict.
+
+    Args:
+        values: Polars Series, NumPy array or list of from_area values
+        from_area: Source area (e.g., 'county_fips')
+        to_area: Target area (e.g., 'cbsa_code')
+        year: Year for geographic definitions (default: 2023)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        Series of to_area values aligned with `values`, null for unknown codes
+    '''
+
+    return translate(values, _area_frame(from_area, to_area, year, geo_df))
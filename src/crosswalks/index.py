@@ -0,0 +1,193 @@
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import threading
+import weakref
+from typing import Dict, Sequence, Tuple
+
+import polars as pl
+
+from crosswalks.instrument import add_rows
+from crosswalks.tables import SURVEY_BITS, survey_mask
+
+
+# -------------------------------------------------------------------------------------------------
+# Per-vintage partitioned index
+# -------------------------------------------------------------------------------------------------
+
+class TableIndex:
+    '''
+    Partition of a crosswalk table into per-year and per-(year, survey) slices.
+
+    The table is sorted by year once and each year is exposed as a zero-copy slice of
+    the sorted table, so a lookup reads one contiguous block instead of scanning every
+    vintage. The survey columns of a year are folded into one bitmask on first use,
+    and the slices of all three surveys are taken from it at once and kept.
+    '''
+
+    def __init__(self, df: pl.DataFrame):
+        # Tables published sorted by year (see crosswalks.shared) are sliced in place
+        if df.get_column('year').is_sorted():
+            sorted_df = df
+        else:
+            sorted_df = df.sort('year', maintain_order=True)
+        bounds = (
+            sorted_df
+            .group_by('year', maintain_order=True)
+            .len()
+            .with_columns(
+                offset=pl.col('len').cum_sum() - pl.col('len')
+            )
+        )
+
+        self._empty = df.clear()
+        self._years: Dict[int, pl.DataFrame] = {
+            year: sorted_df.slice(offset, length)
+            for year, length, offset in bounds.iter_rows()
+        }
+        self._masks: Dict[int, pl.Series] = {}
+        self._surveys: Dict[Tuple[int, str], pl.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def years(self) -> Sequence[int]:
+        '''
+        Sorted list of years in the table.
+        '''
+        return sorted(self._years)
+
+    def year(self, year: int) -> pl.DataFrame:
+        '''
+        Get the rows for one year.
+
+        Args:
+            year: Year of the definitions
+
+        Returns:
+            DataFrame slice with the rows for `year` (empty if the year is not present)
+        '''
+        return self._years.get(year, self._empty)
+
+    def surveys(self, year: int) -> pl.Series:
+        '''
+        Get the survey bitmask of every row for one year.
+
+        Args:
+            year: Year of the definitions
+
+        Returns:
+            UInt8 Series aligned with the year slice (ces = 1, bed = 2, qcew = 4)
+        '''
+        mask = self._masks.get(year)
+        if mask is None:
+            part = self.year(year)
+            mask = part.select(survey_mask()).get_column('surveys')
+            views = {
+                (year, survey): part.filter((mask & bit) != 0)
+                for survey, bit in SURVEY_BITS.items()
+            }
+            with self._lock:
+                mask = self._masks.setdefault(year, mask)
+                for key, view in views.items():
+                    self._surveys.setdefault(key, view)
+        return mask
+
+    def survey(self, year: int, survey: str) -> pl.DataFrame:
+        '''
+        Get the rows for one year that are valid for a survey.
+
+        Args:
+            year: Year of the definitions
+            survey: Survey type ('ces', 'bed', 'qcew')
+
+        Returns:
+            DataFrame with the rows for `year` where `survey` is True
+        '''
+        part = self._surveys.get((year, survey))
+        if part is None:
+            if survey not in SURVEY_BITS:
+                raise ValueError(f'survey must be one of {tuple(SURVEY_BITS)}, got {survey!r}')
+            self.surveys(year)
+            part = self._surveys[(year, survey)]
+        return part
+
+    def survey_years(self, survey: str) -> Sequence[int]:
+        '''
+        Sorted list of years with at least one row valid for a survey.
+
+        Args:
+            survey: Survey type ('ces', 'bed', 'qcew')
+
+        Returns:
+            List of years
+        '''
+        return [year for year in self.years if self.survey(year, survey).height > 0]
+
+
+# -------------------------------------------------------------------------------------------------
+# Index registry keyed on DataFrame identity
+# -------------------------------------------------------------------------------------------------
+
+_indexes: Dict[int, Tuple[weakref.ref, TableIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def table_index(df: pl.DataFrame) -> TableIndex:
+    '''
+    Get the partitioned index of a table, building it on first use.
+
+    Indexes are kept for as long as the DataFrame is alive.
+
+    Args:
+        df: Crosswalk table with a 'year' column
+
+    Returns:
+        TableIndex for `df`
+    '''
+    key = id(df)
+    entry = _indexes.get(key)
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+
+    index = TableIndex(df)
+    with _indexes_lock:
+        entry = _indexes.get(key)
+        if entry is not None and entry[0]() is df:
+            return entry[1]
+        ref = weakref.ref(df, lambda _, key=key: _indexes.pop(key, None))
+        _indexes[key] = (ref, index)
+    return index
+
+
+def year_slice(df: pl.DataFrame, year: int) -> pl.DataFrame:
+    '''
+    Get the rows of a table for one year through its partitioned index.
+
+    Args:
+        df: Crosswalk table with a 'year' column
+        year: Year of the definitions
+
+    Returns:
+        DataFrame with the rows for `year`
+    '''
+    part = table_index(df).year(year)
+    add_rows(part.height)
+    return part
+
+
+def survey_slice(df: pl.DataFrame, year: int, survey: str) -> pl.DataFrame:
+    '''
+    Get the rows of an industry table for one year and survey through its index.
+
+    Args:
+        df: Industry table with 'year' and survey columns
+        year: Year of the definitions
+        survey: Survey type ('ces', 'bed', 'qcew')
+
+    Returns:
+        DataFrame with the rows for `year` where `survey` is True
+    '''
+    part = table_index(df).survey(year, survey)
+    add_rows(part.height)
+    return part
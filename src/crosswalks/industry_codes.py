@@ -2,80 +2,79 @@
 # Imports and parameters
 # -------------------------------------------------------------------------------------------------
 
-from pathlib import Path
-from typing import Dict, List, Literal
+from typing import TYPE_CHECKING, Any, FrozenSet, Literal, Mapping, Optional, Sequence, Union
 
 import polars as pl
 
-BASE_PATH = Path(__file__).parent.parent.parent
+from crosswalks.cache import cached
+from crosswalks.compact import decode
+from crosswalks.index import survey_slice, table_index
+from crosswalks.instrument import instrumented
+from crosswalks.tables import BASE_PATH, load_industries
+from crosswalks.utils import COLUMNAR_OUTPUTS, frame_output, mapping_frame, series_output, translate
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pyarrow as pa
+
 DEFAULT_YEAR = 2023
+OUTPUTS = ('dict', *COLUMNAR_OUTPUTS)
+LIST_OUTPUTS = ('list', *COLUMNAR_OUTPUTS)
 DEFAULT_SURVEY = 'ces'
 
+IndustryField = Literal[
+    'domain', 'domain_name',
+    'supersector', 'supersector_name',
+    'sector', 'sector_name',
+    'subsector', 'subsector_name',
+    'industry_group', 'industry_group_name',
+    'naics_industry', 'naics_industry_name',
+    'detailed_industry', 'detailed_industry_name'
+]
+
+Survey = Literal['ces', 'bed', 'qcew']
+
 
 # -------------------------------------------------------------------------------------------------
-# Load industry codes data
+# Lazily loaded industry codes data
 # -------------------------------------------------------------------------------------------------
 
-industries_df = (
-    pl
-    .read_csv(
-        f'{BASE_PATH}/data/industry_codes.csv', 
-        schema_overrides={
-            'year': pl.Int64,
-            'ces': pl.Boolean,
-            'bed': pl.Boolean,
-            'qcew': pl.Boolean,
-            'domain': pl.Utf8,
-            'supersector': pl.Utf8,
-            'sector': pl.Utf8,
-            'subsector': pl.Utf8,
-            'industry_group': pl.Utf8,
-            'naics_industry': pl.Utf8,
-            'detailed_industry': pl.Utf8,
-            'domain_name': pl.Utf8,
-            'supersector_name': pl.Utf8,
-            'sector_name': pl.Utf8,
-            'subsector_name': pl.Utf8,
-            'industry_group_name': pl.Utf8,
-            'naics_industry_name': pl.Utf8,
-            'detailed_industry_name': pl.Utf8,
-        }
-    )
-)
+def __getattr__(name: str) -> pl.DataFrame:
+    # `industries_df` is loaded on first access rather than at import time
+    if name == 'industries_df':
+        return load_industries()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 
 # -------------------------------------------------------------------------------------------------
 # List available years
 # -------------------------------------------------------------------------------------------------
 
+@instrumented
+@cached(industry_df=load_industries)
 def available_years(
     survey: Literal['ces', 'bed', 'qcew'] = DEFAULT_SURVEY,
-    industry_df: pl.DataFrame = industries_df
-) -> List[int]:
+    industry_df: Optional[pl.DataFrame] = None
+) -> Sequence[int]:
     '''
     Get a list of available years in the industry data for a given survey.
     
     Args:
         survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
-        industry_df: DataFrame with industry data
+        industry_df: DataFrame with industry data (default: the bundled table)
         
     Returns:
-        List of available years
+        Tuple of available years
     '''
-    return (
-        industry_df
-        .filter(pl.col(survey) == True)
-        .get_column('year')
-        .unique()
-        .sort()
-        .to_list()
-    )
+    return table_index(industry_df).survey_years(survey)
 
 
 # -------------------------------------------------------------------------------------------------
 # Mapping industry code from one key to another
 # -------------------------------------------------------------------------------------------------
 
+@instrumented
+@cached(industry_df=load_industries)
 def industry_mapping(
     from_industry: Literal[
         'domain', 'domain_name',
@@ -86,51 +85,58 @@ def industry_mapping(
         'naics_industry', 'naics_industry_name',
         'detailed_industry', 'detailed_industry_name'
     ], 
-    to_industry: Literal[
-        'domain', 'domain_name',
-        'supersector', 'supersector_name',
-        'sector', 'sector_name',
-        'subsector', 'subsector_name',
-        'industry_group', 'industry_group_name',
-        'naics_industry', 'naics_industry_name',
-        'detailed_industry', 'detailed_industry_name'
-    ], 
+    to_industry: Union[IndustryField, Sequence[IndustryField]],
     survey: Literal['ces', 'bed', 'qcew'] = DEFAULT_SURVEY,
     year: int = DEFAULT_YEAR,
-    industry_df: pl.DataFrame = industries_df
-) -> Dict[str, str]:
+    industry_df: Optional[pl.DataFrame] = None,
+    output: Literal['dict', 'polars', 'arrow', 'numpy'] = 'dict'
+) -> Union[Mapping[str, Any], pl.DataFrame, 'pa.Table', Mapping[str, 'np.ndarray']]:
 
     '''
     Create a mapping dictionary from one industry field to another.
     
     Args:
         from_industry: Source industry field (e.g., 'sector')
-        to_industry: Target industry field (e.g., 'supersector', 'sector_name')
+        to_industry: Target industry field (e.g., 'supersector'), or a list of target
+            fields read in one pass
         survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
         year: Year for industry definitions (default: 2023)
-        industry_df: DataFrame with industry data
+        industry_df: DataFrame with industry data (default: the bundled table)
+        output: 'dict' for a read-only dict, or 'polars', 'arrow' or 'numpy' for the
+            mapping as a DataFrame, a pyarrow Table or a dict of NumPy arrays
         
     Returns:
-        Dict mapping from_industry values to to_industry values
+        Read-only dict mapping from_industry values to to_industry values (to a tuple of
+        values when to_industry is a list), or the columns from_industry followed by the
+        targets, one row per from_industry value
     '''
 
-    return dict(
-        industry_df
-        .filter(
-            (pl.col('year') == year) &
-            (pl.col(survey) == True)
+    if output not in OUTPUTS:
+        raise ValueError(f'output must be one of {OUTPUTS}, got {output!r}')
+
+    if isinstance(to_industry, str) and output == 'dict':
+        return dict(
+            survey_slice(industry_df, year, survey)
+            .select(from_industry, to_industry)
+            .pipe(decode)
+            .sort(from_industry, to_industry)
+            .unique(maintain_order=True)
+            .iter_rows()
         )
-        .select(from_industry, to_industry)
-        .sort(from_industry, to_industry)
-        .unique(maintain_order=True)
-        .iter_rows()
-    )
+
+    # Several targets are read in one pass over the same slice, one row per source value
+    frame = _industry_frame(from_industry, to_industry, survey, year, industry_df)
+    if output == 'dict':
+        return {row[0]: row[1:] for row in frame.iter_rows()}
+    return frame_output(frame, output)
 
 
 # -------------------------------------------------------------------------------------------------
 # Mapping industry code to name
 # -------------------------------------------------------------------------------------------------
 
+@instrumented
+@cached(industry_df=load_industries)
 def get_industry(
     industry: Literal[
         'domain', 'supersector', 'sector', 'subsector', 
@@ -138,8 +144,9 @@ def get_industry(
     ],
     survey: Literal['ces', 'bed', 'qcew'] = DEFAULT_SURVEY,
     year: int = DEFAULT_YEAR,
-    industry_df: pl.DataFrame = industries_df
-) -> Dict[str, str]:
+    industry_df: Optional[pl.DataFrame] = None,
+    output: Literal['dict', 'polars', 'arrow', 'numpy'] = 'dict'
+) -> Union[Mapping[str, str], pl.DataFrame, 'pa.Table', Mapping[str, 'np.ndarray']]:
 
     '''
     Get a mapping of industry codes to industry names.
@@ -149,22 +156,28 @@ def get_industry(
                   'subsector', 'industry_group', 'naics_industry', 'detailed_industry')
         survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
         year: Year for industry definitions (default: 2023)
-        industry_df: DataFrame with industry data
+        industry_df: DataFrame with industry data (default: the bundled table)
+        output: 'dict' for a read-only dict, or 'polars', 'arrow' or 'numpy' for the
+            codes and names as a DataFrame, a pyarrow Table or a dict of NumPy arrays
         
     Returns:
-        Dict mapping industry codes to industry names
+        Read-only dict mapping industry codes to industry names, or the code and name
+        columns with one row per code
     '''
 
+    if output not in OUTPUTS:
+        raise ValueError(f'output must be one of {OUTPUTS}, got {output!r}')
+
     _code = industry
     _name = industry + '_name'
 
+    if output != 'dict':
+        return frame_output(_industry_frame(_code, _name, survey, year, industry_df), output)
+
     return dict(
-        industry_df
-        .filter(
-            (pl.col('year') == year) &
-            (pl.col(survey) == True)
-        )
+        survey_slice(industry_df, year, survey)
         .select(_code, _name)
+        .pipe(decode)
         .sort(_code, _name)
         .unique(maintain_order=True)
         .iter_rows()
@@ -175,6 +188,8 @@ def get_industry(
 # List valid industry codes and names
 # -------------------------------------------------------------------------------------------------
 
+@instrumented
+@cached(industry_df=load_industries)
 def valid_industry(
     industry: Literal[
         'domain', 'domain_name',
@@ -187,8 +202,9 @@ def valid_industry(
     ], 
     survey: Literal['ces', 'bed', 'qcew'] = DEFAULT_SURVEY,
     year: int = DEFAULT_YEAR,
-    industry_df: pl.DataFrame = industries_df
-) -> List[str]:
+    industry_df: Optional[pl.DataFrame] = None,
+    output: Literal['list', 'polars', 'arrow', 'numpy'] = 'list'
+) -> Union[Sequence[str], pl.Series, 'pa.Array', 'np.ndarray']:
 
     '''
     Get a list of valid codes for a given industry type.
@@ -197,20 +213,101 @@ def valid_industry(
         industry: Column name for industry type (e.g., 'sector', 'subsector_name')
         survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
         year: Year for industry definitions (default: 2023)
-        industry_df: DataFrame with industry data
+        industry_df: DataFrame with industry data (default: the bundled table)
+        output: 'list' for a tuple, or 'polars', 'arrow' or 'numpy' for the codes as a
+            Series, a pyarrow Array or a NumPy array
         
     Returns:
-        List of valid industry codes
+        Tuple of valid industry codes, sorted
     '''
 
-    return list(
-        industry_df
-        .filter(
-            (pl.col('year') == year) &
-            (pl.col(survey) == True)
-        )
+    if output not in LIST_OUTPUTS:
+        raise ValueError(f'output must be one of {LIST_OUTPUTS}, got {output!r}')
+
+    codes = (
+        survey_slice(industry_df, year, survey)
+        .select(industry)
+        .pipe(decode)
         .get_column(industry)
         .unique()
         .sort()
-        .to_list()
     )
+    if output != 'list':
+        return series_output(codes, output)
+    return codes.to_list()
+
+
+@instrumented
+@cached(industry_df=load_industries)
+def valid_industry_set(
+    industry: IndustryField,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> FrozenSet[str]:
+
+    '''
+    Get the valid codes for a given industry type as a set, for O(1) membership tests.
+
+    Args:
+        industry: Column name for industry type (e.g., 'sector', 'subsector_name')
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        Frozenset of valid industry codes
+    '''
+
+    return frozenset(valid_industry(industry, survey, year, industry_df))
+
+
+# -------------------------------------------------------------------------------------------------
+# Vectorized translation of industry codes
+# -------------------------------------------------------------------------------------------------
+
+@cached(industry_df=load_industries)
+def _industry_frame(
+    from_industry: IndustryField,
+    to_industry: Union[IndustryField, Sequence[IndustryField]],
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    return mapping_frame(
+        survey_slice(industry_df, year, survey),
+        from_industry,
+        to_industry
+    )
+
+
+@instrumented
+def translate_industry(
+    values: Any,
+    from_industry: IndustryField,
+    to_industry: IndustryField,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.Series:
+
+    '''
+    Translate a column of industry values from one industry field to another.
+
+    The translation is a single vectorized join against the mapping table, so it scales
+    to millions of rows without building a Python dict.
+
+    Args:
+        values: Polars Series, NumPy array or list of from_industry values
+        from_industry: Source industry field (e.g., 'detailed_industry')
+        to_industry: Target industry field (e.g., 'supersector', 'sector_name')
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        Series of to_industry values aligned with `values`, null for unknown codes
+    '''
+
+    return translate(values, _industry_frame(from_industry, to_industry, survey, year, industry_df))
@@ -0,0 +1,268 @@
+'''
+Opt-in instrumentation of the lookup functions.
+
+Records per-function call counts, cumulative and percentile latency, rows read from the
+crosswalk tables, result sizes and result-cache hits. Enable with `enable()` or by
+setting `CROSSWALKS_INSTRUMENT=1`; when disabled each instrumented call costs one flag
+check.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional
+
+import polars as pl
+
+# Latencies kept per function for the percentiles (the most recent ones)
+DEFAULT_WINDOW = 10_000
+
+_enabled = os.environ.get('CROSSWALKS_INSTRUMENT', '0') not in ('', '0')
+_callback: Optional[Callable[['CallRecord'], None]] = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+# -------------------------------------------------------------------------------------------------
+# Records and statistics
+# -------------------------------------------------------------------------------------------------
+
+class CallRecord(NamedTuple):
+    '''
+    One instrumented call, as passed to the callback.
+    '''
+    function: str
+    seconds: float
+    rows_scanned: int
+    result_size: int
+    cache_hits: int
+    cache_misses: int
+
+
+class FunctionStats(NamedTuple):
+    '''
+    Snapshot of the statistics of one instrumented function.
+    '''
+    calls: int
+    total_seconds: float
+    mean_seconds: float
+    p50_seconds: float
+    p95_seconds: float
+    p99_seconds: float
+    max_seconds: float
+    rows_scanned: int
+    result_size: int
+    cache_hits: int
+    cache_misses: int
+    hit_rate: Optional[float]
+
+
+class _Stats:
+    __slots__ = ('calls', 'total', 'max', 'latencies', 'rows', 'size', 'hits', 'misses')
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.latencies: Deque[float] = deque(maxlen=DEFAULT_WINDOW)
+        self.rows = self.size = self.hits = self.misses = 0
+
+    def add(self, record: CallRecord) -> None:
+        self.calls += 1
+        self.total += record.seconds
+        self.max = max(self.max, record.seconds)
+        self.latencies.append(record.seconds)
+        self.rows += record.rows_scanned
+        self.size += record.result_size
+        self.hits += record.cache_hits
+        self.misses += record.cache_misses
+
+    def freeze(self) -> FunctionStats:
+        latencies = sorted(self.latencies)
+
+        def percentile(q: float) -> float:
+            return latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+
+        lookups = self.hits + self.misses
+        return FunctionStats(
+            calls=self.calls,
+            total_seconds=self.total,
+            mean_seconds=self.total / self.calls if self.calls else 0.0,
+            p50_seconds=percentile(0.50),
+            p95_seconds=percentile(0.95),
+            p99_seconds=percentile(0.99),
+            max_seconds=self.max,
+            rows_scanned=self.rows,
+            result_size=self.size,
+            cache_hits=self.hits,
+            cache_misses=self.misses,
+            hit_rate=self.hits / lookups if lookups else None
+        )
+
+
+_stats: Dict[str, _Stats] = {}
+
+
+def _result_size(value: Any) -> int:
+    if isinstance(value, pl.DataFrame):
+        return value.height
+    try:
+        return len(value)
+    except TypeError:
+        return 1
+
+
+# -------------------------------------------------------------------------------------------------
+# Counters reported from inside a call
+# -------------------------------------------------------------------------------------------------
+
+def _current() -> Optional[List[int]]:
+    stack = getattr(_local, 'stack', None)
+    return stack[-1] if stack else None
+
+
+def add_rows(rows: int) -> None:
+    '''
+    Count rows read from a crosswalk table towards the current instrumented call.
+
+    Args:
+        rows: Number of rows read
+    '''
+    if _enabled:
+        counters = _current()
+        if counters is not None:
+            counters[0] += rows
+
+
+def add_cache(hit: bool) -> None:
+    '''
+    Count a result-cache lookup towards the current instrumented call.
+
+    Args:
+        hit: Whether the lookup was a hit
+    '''
+    if _enabled:
+        counters = _current()
+        if counters is not None:
+            counters[1 if hit else 2] += 1
+
+
+# -------------------------------------------------------------------------------------------------
+# Decorator
+# -------------------------------------------------------------------------------------------------
+
+def instrumented(func: Callable) -> Callable:
+    '''
+    Record the latency, rows scanned, result size and cache use of a public function.
+
+    When instrumentation is disabled the wrapper only checks a flag and calls through.
+
+    Args:
+        func: Function to instrument
+
+    Returns:
+        The wrapped function
+    '''
+    name = f'{func.__module__.rsplit(".", 1)[-1]}.{func.__qualname__}'
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        counters = [0, 0, 0]
+        stack.append(counters)
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+
+        # Nested instrumented calls also count towards their caller
+        if stack:
+            for i, count in enumerate(counters):
+                stack[-1][i] += count
+
+        record = CallRecord(name, seconds, counters[0], _result_size(result), counters[1], counters[2])
+        with _lock:
+            stats = _stats.get(name)
+            if stats is None:
+                stats = _stats[name] = _Stats()
+            stats.add(record)
+
+        callback = _callback
+        if callback is not None:
+            callback(record)
+        return result
+
+    return wrapper
+
+
+# -------------------------------------------------------------------------------------------------
+# Public controls
+# -------------------------------------------------------------------------------------------------
+
+def enable() -> None:
+    '''
+    Start recording instrumented calls.
+    '''
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    '''
+    Stop recording instrumented calls. Recorded statistics are kept.
+    '''
+    global _enabled
+    _enabled = False
+
+
+def is_enabled() -> bool:
+    '''
+    Whether instrumented calls are being recorded.
+    '''
+    return _enabled
+
+
+def snapshot() -> Dict[str, FunctionStats]:
+    '''
+    Get the statistics recorded so far.
+
+    Returns:
+        Dict mapping each instrumented function (e.g., 'geographic_codes.area_mapping')
+        to its FunctionStats
+    '''
+    with _lock:
+        return {name: stats.freeze() for name, stats in sorted(_stats.items())}
+
+
+def reset() -> None:
+    '''
+    Discard the statistics recorded so far.
+    '''
+    with _lock:
+        _stats.clear()
+
+
+def set_callback(callback: Optional[Callable[[CallRecord], None]]) -> None:
+    '''
+    Call a function with the CallRecord of every instrumented call, e.g. to export metrics.
+
+    The callback runs in the calling thread after each call; pass None to remove it.
+
+    Args:
+        callback: Function taking a CallRecord, or None
+    '''
+    global _callback
+    _callback = callback
@@ -0,0 +1,237 @@
+'''
+Hierarchical lookup of NAICS codes of any length.
+
+A NAICS code prefix ('54', '5415', '541511', or a sector range such as '31-33')
+resolves to its full ancestor chain, domain -> supersector -> sector -> ... -> the level
+of the code. Single codes walk a prefix trie in O(code length); arrays of codes are
+resolved with one join against the equivalent prefix table.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import re
+from types import MappingProxyType
+from typing import Any, List, Mapping, Optional
+
+import polars as pl
+
+from crosswalks.cache import cached
+from crosswalks.compact import decode
+from crosswalks.index import survey_slice
+from crosswalks.industry_codes import DEFAULT_SURVEY, DEFAULT_YEAR, Survey
+from crosswalks.tables import load_industries
+from crosswalks.utils import to_series
+
+LEVELS = [
+    'domain', 'supersector', 'sector', 'subsector',
+    'industry_group', 'naics_industry', 'detailed_industry'
+]
+
+# NAICS level reached by a code of each length
+LEVEL_BY_LENGTH = {
+    2: 'sector',
+    3: 'subsector',
+    4: 'industry_group',
+    5: 'naics_industry',
+    6: 'detailed_industry',
+}
+
+LINEAGE_FIELDS = [field for level in LEVELS for field in (level, f'{level}_name')]
+
+_RANGE = re.compile(r'^(\d+)-\d+$')
+
+
+# -------------------------------------------------------------------------------------------------
+# Prefix table
+# -------------------------------------------------------------------------------------------------
+
+@cached(industry_df=load_industries)
+def naics_prefixes(
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Build the table of every NAICS code prefix with its ancestor chain.
+
+    Args:
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        DataFrame with columns 'prefix', 'level' and the code and name of every level,
+        null below the level of the prefix
+    '''
+
+    detailed = (
+        survey_slice(industry_df, year, survey)
+        .select(LINEAGE_FIELDS)
+        .pipe(decode)
+    )
+
+    parts = []
+    for length, level in LEVEL_BY_LENGTH.items():
+        depth = LEVELS.index(level)
+        parts.append(
+            detailed
+            .select(
+                prefix=pl.col('detailed_industry').str.slice(0, length),
+                level=pl.lit(level),
+                *[
+                    pl.col(field) if LEVELS.index(field.removesuffix('_name')) <= depth
+                    else pl.lit(None, pl.Utf8).alias(field)
+                    for field in LINEAGE_FIELDS
+                ]
+            )
+            .unique(subset='prefix', keep='first', maintain_order=True)
+        )
+
+    return (
+        pl
+        .concat(parts)
+        .select('prefix', 'level', *LINEAGE_FIELDS)
+        .sort('prefix')
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Prefix trie
+# -------------------------------------------------------------------------------------------------
+
+class NaicsTrie:
+    '''
+    Character trie over NAICS code prefixes.
+
+    Each node holds the ancestor chain of the prefix that leads to it, so a lookup is
+    one dict access per character of the code.
+    '''
+
+    __slots__ = ('_root',)
+
+    def __init__(self, prefixes: pl.DataFrame):
+        self._root: List[Any] = [{}, None]
+        fields = ['level', *LINEAGE_FIELDS]
+        for prefix, *values in prefixes.select('prefix', *fields).iter_rows():
+            node = self._root
+            for char in prefix:
+                node = node[0].setdefault(char, [{}, None])
+            node[1] = MappingProxyType({
+                field: value for field, value in zip(fields, values)
+                if value is not None or field == 'level'
+            })
+
+    def lookup(self, code: str) -> Optional[Mapping[str, str]]:
+        '''
+        Resolve a code prefix to its ancestor chain.
+
+        Args:
+            code: NAICS code of 2 to 6 digits, or a sector range such as '31-33'
+
+        Returns:
+            Read-only dict with the level of the code and the code and name of every level
+            down to it, or None if the code is unknown
+        '''
+        match = _RANGE.match(code)
+        if match:
+            code = match.group(1)
+
+        node = self._root
+        for char in code:
+            node = node[0].get(char)
+            if node is None:
+                return None
+        return node[1]
+
+
+@cached(industry_df=load_industries)
+def naics_trie(
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> NaicsTrie:
+
+    '''
+    Get the NAICS prefix trie for a survey and year.
+
+    Args:
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        NaicsTrie for the survey and year
+    '''
+
+    return NaicsTrie(naics_prefixes(survey, year, industry_df))
+
+
+# -------------------------------------------------------------------------------------------------
+# Lineage lookups
+# -------------------------------------------------------------------------------------------------
+
+def naics_lineage(
+    code: str,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> Optional[Mapping[str, str]]:
+
+    '''
+    Resolve a NAICS code of any length to its ancestor chain.
+
+    Args:
+        code: NAICS code of 2 to 6 digits, or a sector range such as '31-33'
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        Read-only dict with the level of the code and the code and name of every level
+        down to it (e.g., {'level': 'sector', 'domain': '07', ..., 'sector_name': ...}),
+        or None if the code is unknown
+    '''
+
+    return naics_trie(survey, year, industry_df).lookup(code)
+
+
+def naics_lineage_batch(
+    values: Any,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Resolve an array of NAICS codes of mixed lengths to their ancestor chains.
+
+    Args:
+        values: Polars Series, NumPy array or list of NAICS codes
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        DataFrame aligned with `values` with columns 'code', 'level' and the code and name
+        of every level, null where the code is unknown or below its level
+    '''
+
+    codes = to_series(values, 'code', pl.Utf8)
+
+    return (
+        codes
+        .to_frame()
+        .with_columns(
+            prefix=pl.col('code').str.replace(r'^(\d+)-\d+$', '$1')
+        )
+        .join(
+            naics_prefixes(survey, year, industry_df),
+            how='left',
+            on='prefix',
+            maintain_order='left'
+        )
+        .drop('prefix')
+    )
@@ -0,0 +1,212 @@
+'''
+Polars namespaces for using crosswalks inside lazy queries.
+
+Importing `crosswalks` registers a `crosswalk` namespace on expressions, LazyFrames and
+DataFrames:
+
+    pl.col('county_fips').crosswalk.area('cbsa_code', year=2023)
+    lf.crosswalk.join_area('county_fips', ['cbsa_code', 'cbsa_title'])
+    lf.crosswalk.join_industry('naics_code', levels=['sector', 'supersector'], survey='qcew')
+
+Expressions compile to a native `replace_strict` lookup and frame methods to a left
+join against a small mapping table, so predicate/projection pushdown and the streaming
+engine keep working on the rest of the plan.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Optional, Sequence, Union
+
+import polars as pl
+
+from crosswalks.geographic_codes import DEFAULT_YEAR as DEFAULT_AREA_YEAR
+from crosswalks.geographic_codes import AreaField, _area_frame
+from crosswalks.industry_codes import DEFAULT_SURVEY, IndustryField, Survey, _industry_frame
+from crosswalks.industry_codes import DEFAULT_YEAR as DEFAULT_INDUSTRY_YEAR
+
+
+# -------------------------------------------------------------------------------------------------
+# Expression namespace
+# -------------------------------------------------------------------------------------------------
+
+def _replace(expr: pl.Expr, mapping: pl.DataFrame) -> pl.Expr:
+    # Null values stay null, as in the joins, rather than taking the null key's value
+    key, value = mapping.columns
+    mapping = mapping.drop_nulls(key)
+    return (
+        expr
+        .cast(mapping.schema[key], strict=False)
+        .replace_strict(
+            mapping.get_column(key),
+            mapping.get_column(value),
+            default=None,
+            return_dtype=mapping.schema[value]
+        )
+    )
+
+
+def _source(expr: pl.Expr, field: Optional[str]) -> str:
+    # Default the source field to the name of the column being translated
+    return field if field is not None else expr.meta.output_name()
+
+
+@pl.api.register_expr_namespace('crosswalk')
+class CrosswalkExpr:
+    '''
+    Translate an expression of area or industry codes.
+    '''
+
+    def __init__(self, expr: pl.Expr):
+        self._expr = expr
+
+    def area(
+        self,
+        to_area: AreaField,
+        from_area: Optional[AreaField] = None,
+        year: int = DEFAULT_AREA_YEAR,
+        geo_df: Optional[pl.DataFrame] = None
+    ) -> pl.Expr:
+        '''
+        Translate area values to another geographic field.
+
+        Args:
+            to_area: Target area (e.g., 'cbsa_code')
+            from_area: Source area (default: the name of the expression's column)
+            year: Year for geographic definitions (default: 2023)
+            geo_df: DataFrame with geographic data (default: the bundled table)
+
+        Returns:
+            Expression of to_area values, null for unknown codes
+        '''
+        mapping = _area_frame(_source(self._expr, from_area), to_area, year, geo_df)
+        return _replace(self._expr, mapping).alias(to_area)
+
+    def industry(
+        self,
+        to_industry: IndustryField,
+        from_industry: Optional[IndustryField] = None,
+        survey: Survey = DEFAULT_SURVEY,
+        year: int = DEFAULT_INDUSTRY_YEAR,
+        industry_df: Optional[pl.DataFrame] = None
+    ) -> pl.Expr:
+        '''
+        Translate industry values to another industry field.
+
+        Args:
+            to_industry: Target industry field (e.g., 'supersector', 'sector_name')
+            from_industry: Source industry field (default: the name of the expression's column)
+            survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+            year: Year for industry definitions (default: 2023)
+            industry_df: DataFrame with industry data (default: the bundled table)
+
+        Returns:
+            Expression of to_industry values, null for unknown codes
+        '''
+        mapping = _industry_frame(
+            _source(self._expr, from_industry), to_industry, survey, year, industry_df
+        )
+        return _replace(self._expr, mapping).alias(to_industry)
+
+
+# -------------------------------------------------------------------------------------------------
+# LazyFrame and DataFrame namespaces
+# -------------------------------------------------------------------------------------------------
+
+def _join(lf: pl.LazyFrame, on: str, mapping: pl.DataFrame) -> pl.LazyFrame:
+    # The codes are cast to the type of the mapping keys first, as in `_replace`
+    key = mapping.columns[0]
+    return (
+        lf
+        .with_columns(pl.col(on).cast(mapping.schema[key], strict=False))
+        .join(
+            mapping.lazy(),
+            how='left',
+            left_on=on,
+            right_on=key,
+            maintain_order='left'
+        )
+    )
+
+
+@pl.api.register_lazyframe_namespace('crosswalk')
+class CrosswalkLazyFrame:
+    '''
+    Attach area or industry attributes to a LazyFrame with a single join.
+    '''
+
+    def __init__(self, lf: pl.LazyFrame):
+        self._lf = lf
+
+    def join_area(
+        self,
+        on: str,
+        fields: Union[AreaField, Sequence[AreaField]],
+        from_area: Optional[AreaField] = None,
+        year: int = DEFAULT_AREA_YEAR,
+        geo_df: Optional[pl.DataFrame] = None
+    ) -> pl.LazyFrame:
+        '''
+        Join geographic fields onto the frame.
+
+        Args:
+            on: Column holding the area codes (cast to the type of the codes, e.g., strings)
+            fields: Area field or list of area fields to attach (e.g., ['cbsa_code', 'cbsa_title'])
+            from_area: Area type of the `on` column (default: `on`)
+            year: Year for geographic definitions (default: 2023)
+            geo_df: DataFrame with geographic data (default: the bundled table)
+
+        Returns:
+            LazyFrame with the requested fields appended, null for unknown codes
+        '''
+        mapping = _area_frame(from_area or on, fields, year, geo_df)
+        return _join(self._lf, on, mapping)
+
+    def join_industry(
+        self,
+        on: str,
+        levels: Union[IndustryField, Sequence[IndustryField]],
+        from_industry: IndustryField = 'detailed_industry',
+        survey: Survey = DEFAULT_SURVEY,
+        year: int = DEFAULT_INDUSTRY_YEAR,
+        industry_df: Optional[pl.DataFrame] = None
+    ) -> pl.LazyFrame:
+        '''
+        Join industry fields onto the frame.
+
+        Args:
+            on: Column holding the industry codes (cast to the type of the codes, e.g., strings)
+            levels: Industry field or list of industry fields to attach (e.g., ['sector', 'sector_name'])
+            from_industry: Industry level of the `on` column (default: 'detailed_industry')
+            survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+            year: Year for industry definitions (default: 2023)
+            industry_df: DataFrame with industry data (default: the bundled table)
+
+        Returns:
+            LazyFrame with the requested fields appended, null for unknown codes
+        '''
+        mapping = _industry_frame(from_industry, levels, survey, year, industry_df)
+        return _join(self._lf, on, mapping)
+
+
+@pl.api.register_dataframe_namespace('crosswalk')
+class CrosswalkDataFrame:
+    '''
+    Eager counterpart of the LazyFrame `crosswalk` namespace.
+    '''
+
+    def __init__(self, df: pl.DataFrame):
+        self._df = df
+
+    def join_area(self, on: str, fields, **kwargs) -> pl.DataFrame:
+        '''
+        Join geographic fields onto the frame; see `CrosswalkLazyFrame.join_area`.
+        '''
+        return self._df.lazy().crosswalk.join_area(on, fields, **kwargs).collect()
+
+    def join_industry(self, on: str, levels, **kwargs) -> pl.DataFrame:
+        '''
+        Join industry fields onto the frame; see `CrosswalkLazyFrame.join_industry`.
+        '''
+        return self._df.lazy().crosswalk.join_industry(on, levels, **kwargs).collect()
@@ -0,0 +1,236 @@
+'''
+Vectorized normalization of messy area and industry codes.
+
+Inbound feeds carry codes in many forms: FIPS as integers without their leading zeros,
+county codes split from the state code, NAICS codes read as floats ('541511.0'),
+hyphenated sector ranges ('31-33') and 2003-style prefixed MSA and CSA codes ('C3386',
+'CS388'). The expressions here rewrite whole columns to the forms stored in the
+crosswalk tables, so they can run inside lazy queries; `normalize_area` and
+`normalize_industry` also report which values they changed.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Any, NamedTuple, Union
+
+import polars as pl
+
+from crosswalks.compact import CODE_WIDTHS
+from crosswalks.geographic_codes import DEFAULT_YEAR, AreaField, valid_area
+from crosswalks.industry_codes import IndustryField
+from crosswalks.instrument import instrumented
+
+# Sectors that NAICS splits across several two-digit codes
+SECTOR_RANGES = {'32': '31', '33': '31', '45': '44', '49': '48'}
+
+# 2003 MSA and CSA codes: letter prefix and number of digits after it ('C3386', 'CS388')
+LEGACY_PREFIXES = {'msa_code': ('C', 4), 'csa_code': ('CS', 3)}
+
+# Industry codes that are zero-padded to their width
+ZERO_PADDED = {'domain', 'supersector'}
+
+IntoExpr = Union[str, pl.Expr]
+
+
+class Normalized(NamedTuple):
+    '''
+    Result of normalizing a column of codes.
+    '''
+    values: pl.Series
+    changes: pl.DataFrame
+
+
+def _expr(column: IntoExpr) -> pl.Expr:
+    return pl.col(column) if isinstance(column, str) else column
+
+
+def _clean(expr: pl.Expr) -> pl.Expr:
+    # Text without surrounding blanks or a float's trailing '.0'; blank values become null
+    text = (
+        expr
+        .cast(pl.Utf8)
+        .str.strip_chars()
+        .str.strip_suffix('.0')
+    )
+    return pl.when(text != '').then(text)
+
+
+# -------------------------------------------------------------------------------------------------
+# Area codes
+# -------------------------------------------------------------------------------------------------
+
+def county_fips(state: IntoExpr, county: IntoExpr) -> pl.Expr:
+    '''
+    Build five-digit county FIPS codes from separate state and county codes.
+
+    Args:
+        state: State FIPS column or expression (e.g., 1 or '01')
+        county: County FIPS column or expression within the state (e.g., 1 or '001')
+
+    Returns:
+        Expression of county FIPS codes (e.g., '01001'), aliased to 'county_fips'
+    '''
+    return pl.concat_str(
+        _clean(_expr(state)).str.zfill(2),
+        _clean(_expr(county)).str.zfill(3),
+        separator=''
+    ).alias('county_fips')
+
+
+def _prefixed(area: str, year: int) -> bool:
+    # Whether the vintage stores this area with the 2003 letter prefix ('C3386', 'CS388')
+    return any(code is not None and code.startswith('C') for code in valid_area(area, year))
+
+
+def area_code(column: IntoExpr, area: AreaField, year: int = DEFAULT_YEAR) -> pl.Expr:
+    '''
+    Normalize an expression of area codes to the form stored for a vintage.
+
+    Numeric codes are zero-padded to the width of the field. MSA and CSA codes are
+    converted between the prefixed 2003 form ('C3386', 'CS388') and the numeric form
+    ('33860', '388') of later vintages, whichever the target year uses. Names and titles
+    are only stripped of surrounding blanks.
+
+    Args:
+        column: Column name or expression of area codes
+        area: Area field of the codes (e.g., 'state_fips', 'msa_code')
+        year: Year of the definitions to normalize to (default: 2023)
+
+    Returns:
+        Expression of normalized codes, aliased to `area`
+    '''
+    code = _clean(_expr(column))
+    width = CODE_WIDTHS.get(area)
+    if width is None:
+        return code.alias(area)
+
+    if area in LEGACY_PREFIXES:
+        prefix, length = LEGACY_PREFIXES[area]
+        # The prefix is optional on input: a 4-digit MSA code is a 2003 code without it
+        numeric = (
+            pl.when(code.str.contains(rf'^(?:{prefix})?\d{{{length}}}$'))
+              .then(code.str.strip_prefix(prefix).str.pad_end(width, '0'))
+              .when(code.str.contains(r'^\d+$'))
+              .then(code.str.zfill(width))
+        )
+        if _prefixed(area, year):
+            numeric = prefix + numeric.str.slice(0, length)
+        return pl.coalesce(numeric, code).alias(area)
+
+    return (
+        pl.when(code.str.contains(r'^\d+$'))
+          .then(code.str.zfill(width))
+          .otherwise(code)
+          .alias(area)
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Industry codes
+# -------------------------------------------------------------------------------------------------
+
+def industry_code(column: IntoExpr, industry: IndustryField) -> pl.Expr:
+    '''
+    Normalize an expression of industry codes to the form stored in the industry table.
+
+    Float codes lose their trailing '.0', domain and supersector codes are zero-padded,
+    and sector ranges ('31-33') and the sectors folded into them ('32', '33') become the
+    sector stored for the range ('31'). Names are only stripped of surrounding blanks.
+
+    Args:
+        column: Column name or expression of industry codes
+        industry: Industry field of the codes (e.g., 'sector', 'detailed_industry')
+
+    Returns:
+        Expression of normalized codes, aliased to `industry`
+    '''
+    code = _clean(_expr(column))
+    width = CODE_WIDTHS.get(industry)
+    if width is None:
+        return code.alias(industry)
+
+    if industry == 'sector':
+        code = (
+            pl.when(code.str.contains(r'^\d{2}-\d{2}$'))
+              .then(code.str.slice(0, 2))
+              .otherwise(code)
+              .replace(SECTOR_RANGES)
+        )
+
+    # NAICS codes never start with a zero, only the BLS domain and supersector codes do
+    if industry not in ZERO_PADDED:
+        return code.alias(industry)
+
+    return (
+        pl.when(code.str.contains(r'^\d+$'))
+          .then(code.str.zfill(width))
+          .otherwise(code)
+          .alias(industry)
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Normalize a column with a report
+# -------------------------------------------------------------------------------------------------
+
+def _normalize(values: Any, name: str, expr: pl.Expr) -> Normalized:
+    # Feeds often mix numbers and strings, so lists are read without a strict type
+    series = values if isinstance(values, pl.Series) else pl.Series(name, values, strict=False)
+    series = series.rename('input')
+
+    # The expression runs once per distinct value and the result is mapped back through
+    # the input's own type, which is much cheaper than casting every row to a string
+    distinct = (
+        series
+        .value_counts(name='count')
+        .with_columns(original=pl.col('input').cast(pl.Utf8))
+        .with_columns(normalized=expr)
+    )
+    normalized = series.replace_strict(
+        distinct.get_column('input'),
+        distinct.get_column('normalized'),
+        default=None,
+        return_dtype=pl.Utf8
+    )
+    changes = (
+        distinct
+        .filter(pl.col('original').ne_missing(pl.col('normalized')))
+        .select('original', 'normalized', 'count')
+        .sort('count', 'original', descending=[True, False], nulls_last=True)
+    )
+    return Normalized(normalized.rename(name), changes)
+
+
+@instrumented
+def normalize_area(values: Any, area: AreaField, year: int = DEFAULT_YEAR) -> Normalized:
+    '''
+    Normalize a column of area codes and report what changed.
+
+    Args:
+        values: Polars Series, NumPy array or list of area codes (strings or numbers)
+        area: Area field of the codes (e.g., 'county_fips', 'msa_code')
+        year: Year of the definitions to normalize to (default: 2023)
+
+    Returns:
+        Normalized with the `values` as strings aligned with the input, and the
+        `changes` as distinct 'original' -> 'normalized' pairs with their 'count'
+    '''
+    return _normalize(values, area, area_code('original', area, year))
+
+
+@instrumented
+def normalize_industry(values: Any, industry: IndustryField) -> Normalized:
+    '''
+    Normalize a column of industry codes and report what changed.
+
+    Args:
+        values: Polars Series, NumPy array or list of industry codes (strings or numbers)
+        industry: Industry field of the codes (e.g., 'sector', 'detailed_industry')
+
+    Returns:
+        Normalized with the `values` as strings aligned with the input, and the
+        `changes` as distinct 'original' -> 'normalized' pairs with their 'count'
+    '''
+    return _normalize(values, industry, industry_code('original', industry))
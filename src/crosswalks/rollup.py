@@ -0,0 +1,179 @@
+'''
+One-pass hierarchical roll-up over the area and industry hierarchies.
+
+The fact table is scanned once and aggregated to its finest (area, industry) grain.
+Every coarser level is then derived from the partial aggregate of the level just below
+it, e.g. sector from subsector, state from county, region from division, so the fact
+table is never re-read. All requested (area level, industry level) combinations come
+back as one tidy long table.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Dict, List, Sequence, Union
+
+import polars as pl
+
+from crosswalks import namespace  # noqa: F401  (registers the `crosswalk` namespace)
+from crosswalks.geographic_codes import DEFAULT_YEAR as DEFAULT_AREA_YEAR
+from crosswalks.industry_codes import DEFAULT_SURVEY, Survey
+from crosswalks.industry_codes import DEFAULT_YEAR as DEFAULT_INDUSTRY_YEAR
+
+# Each level is aggregated from the partial aggregate of its parent (the next finer level)
+AREA_PARENT = {
+    'state_fips': 'county_fips',
+    'division': 'state_fips',
+    'region': 'division',
+    'cbsa_code': 'county_fips',
+    'msa_code': 'county_fips',
+    'csa_code': 'county_fips',
+}
+
+INDUSTRY_PARENT = {
+    'naics_industry': 'detailed_industry',
+    'industry_group': 'naics_industry',
+    'subsector': 'industry_group',
+    'sector': 'subsector',
+    'supersector': 'sector',
+    'domain': 'supersector',
+}
+
+AREA_LEVELS = ['county_fips', 'state_fips', 'division', 'region', 'cbsa_code', 'csa_code']
+INDUSTRY_LEVELS = [
+    'detailed_industry', 'naics_industry', 'industry_group',
+    'subsector', 'sector', 'supersector', 'domain'
+]
+
+
+def _chain(level: str, source: str, parents: Dict[str, str]) -> List[str]:
+    # Levels from `source` down to `level`, finest first
+    chain = [level]
+    while chain[-1] != source:
+        if chain[-1] not in parents:
+            raise ValueError(f'{level!r} cannot be derived from {source!r}')
+        chain.append(parents[chain[-1]])
+    return chain[::-1]
+
+
+def _coarser(levels: Sequence[str], level: str, parents: Dict[str, str]) -> List[str]:
+    # Attribute columns that are still needed once the data is aggregated to `level`
+    return [other for other in levels if level in _ancestors(other, parents)]
+
+
+def _ancestors(level: str, parents: Dict[str, str]) -> List[str]:
+    chain = []
+    while level in parents:
+        level = parents[level]
+        chain.append(level)
+    return chain
+
+
+# -------------------------------------------------------------------------------------------------
+# Roll-up
+# -------------------------------------------------------------------------------------------------
+
+def rollup(
+    data: Union[pl.DataFrame, pl.LazyFrame],
+    values: Union[str, Sequence[str]],
+    area_on: str = 'county_fips',
+    industry_on: str = 'detailed_industry',
+    area_levels: Sequence[str] = AREA_LEVELS,
+    industry_levels: Sequence[str] = INDUSTRY_LEVELS,
+    by: Sequence[str] = (),
+    area_year: int = DEFAULT_AREA_YEAR,
+    industry_year: int = DEFAULT_INDUSTRY_YEAR,
+    survey: Survey = DEFAULT_SURVEY
+) -> pl.DataFrame:
+
+    '''
+    Aggregate a fact table to every combination of area and industry levels in one pass.
+
+    Args:
+        data: DataFrame or LazyFrame with the facts
+        values: Additive value column or columns (e.g., ['employment', 'wages'])
+        area_on: Area level of the facts' area column (default: 'county_fips')
+        industry_on: Industry level of the facts' industry column (default: 'detailed_industry')
+        area_levels: Area levels to output (default: county, state, division, region, CBSA, CSA)
+        industry_levels: Industry levels to output (default: every level)
+        by: Other columns to keep in the grouping (e.g., ['year', 'quarter'])
+        area_year: Year for geographic definitions (default: 2023)
+        industry_year: Year for industry definitions (default: 2023)
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+
+    Returns:
+        DataFrame with columns `by`, 'area_level', 'area_code', 'industry_level',
+        'industry_code' and `values`; codes that do not belong to a unit at a level (e.g.,
+        counties outside any CBSA) are left out of that level. Combinations come in the
+        order of `industry_levels` and `area_levels`; rows within them are not sorted
+    '''
+
+    values = [values] if isinstance(values, str) else list(values)
+    by = list(by)
+
+    area_chains = {level: _chain(level, area_on, AREA_PARENT) for level in area_levels}
+    industry_chains = {level: _chain(level, industry_on, INDUSTRY_PARENT) for level in industry_levels}
+    area_cols = sorted({lvl for chain in area_chains.values() for lvl in chain} - {area_on})
+    industry_cols = sorted({lvl for chain in industry_chains.values() for lvl in chain} - {industry_on})
+
+    # The only pass over the facts: aggregate to the finest grain and attach attributes
+    lf = (
+        data
+        .lazy()
+        .group_by(*by, area_on, industry_on)
+        .agg(pl.col(values).sum())
+    )
+    if area_cols:
+        lf = lf.crosswalk.join_area(area_on, area_cols, year=area_year)
+    if industry_cols:
+        lf = lf.crosswalk.join_industry(
+            industry_on, industry_cols, from_industry=industry_on,
+            survey=survey, year=industry_year
+        )
+    base = lf.collect()
+
+    all_area = [area_on, *area_cols]
+    all_industry = [industry_on, *industry_cols]
+
+    def aggregate(df: pl.DataFrame, keys: List[str]) -> pl.DataFrame:
+        return df.group_by(keys).agg(pl.col(values).sum())
+
+    # Industry partials: area_on x each industry level, each from the level below it
+    industry_partials = {industry_on: base}
+    for level in INDUSTRY_PARENT:
+        parent = INDUSTRY_PARENT[level]
+        if level in all_industry and parent in industry_partials:
+            industry_partials[level] = aggregate(
+                industry_partials[parent],
+                [*by, level, area_on, *area_cols, *_coarser(all_industry, level, INDUSTRY_PARENT)]
+            )
+
+    parts = []
+    for industry_level in industry_levels:
+
+        # Area partials for this industry level, each from the level below it
+        area_partials = {area_on: industry_partials[industry_level]}
+        for level in AREA_PARENT:
+            parent = AREA_PARENT[level]
+            if level in all_area and parent in area_partials:
+                area_partials[level] = aggregate(
+                    area_partials[parent],
+                    [*by, level, industry_level, *_coarser(all_area, level, AREA_PARENT)]
+                )
+
+        for area_level in area_levels:
+            parts.append(
+                area_partials[area_level]
+                .drop_nulls([area_level, industry_level])
+                .select(
+                    *by,
+                    pl.lit(area_level).alias('area_level'),
+                    pl.col(area_level).cast(pl.Utf8).alias('area_code'),
+                    pl.lit(industry_level).alias('industry_level'),
+                    pl.col(industry_level).cast(pl.Utf8).alias('industry_code'),
+                    *values
+                )
+            )
+
+    return pl.concat(parts)
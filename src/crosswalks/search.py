@@ -0,0 +1,394 @@
+'''
+Fuzzy search of area and industry names.
+
+Resolves free-text names ("Fairfield Cnty CT", "Daphne-Fairhope", "software
+publishers") to codes through an inverted index of character trigrams, built once per
+vintage. Names and queries are lower-cased, stripped of punctuation, common
+abbreviations are expanded and generic words ('county', 'and', ...) dropped; candidates
+are ranked by the Dice coefficient of their trigram sets. Batches score each distinct
+name once and return a DataFrame.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import heapq
+import re
+from collections import Counter, defaultdict
+from itertools import chain
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import polars as pl
+
+from crosswalks.cache import cached
+from crosswalks.compact import decode
+from crosswalks.geographic_codes import DEFAULT_YEAR as DEFAULT_AREA_YEAR
+from crosswalks.index import survey_slice, year_slice
+from crosswalks.industry_codes import DEFAULT_SURVEY, Survey
+from crosswalks.industry_codes import DEFAULT_YEAR as DEFAULT_INDUSTRY_YEAR
+from crosswalks.instrument import instrumented
+from crosswalks.naics import LEVELS
+from crosswalks.tables import load_geos, load_industries
+
+DEFAULT_K = 5
+
+# Searchable name field -> code field
+AREA_NAMES = {
+    'state_name': 'state_fips',
+    'county_name': 'county_fips',
+    'cbsa_title': 'cbsa_code',
+    'msa_title': 'msa_code',
+    'csa_title': 'csa_code',
+}
+
+INDUSTRY_NAMES = {f'{level}_name': level for level in LEVELS}
+
+ABBREVIATIONS = {
+    'cnty': 'county',
+    'cty': 'county',
+    'twp': 'township',
+    'mfg': 'manufacturing',
+    'svc': 'services',
+    'svcs': 'services',
+    'mgmt': 'management',
+    'ind': 'industries',
+}
+
+# Words in so many names that they only add noise to the ranking
+STOPWORDS = {'county', 'parish', 'borough', 'and', 'of', 'the', 'except', 'msa', 'csa'}
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+class Match(NamedTuple):
+    '''
+    One search result.
+    '''
+    field: str
+    code: str
+    name: str
+    score: float
+
+
+def normalize_text(text: str) -> str:
+    '''
+    Normalize a name or query for matching.
+
+    Args:
+        text: Free text
+
+    Returns:
+        Lower-case words separated by single spaces, abbreviations expanded and
+        stopwords removed
+    '''
+    words = _NON_ALNUM.sub(' ', text.lower()).split()
+    return ' '.join(
+        word for word in (ABBREVIATIONS.get(word, word) for word in words)
+        if word not in STOPWORDS
+    )
+
+
+def trigrams(text: str) -> List[str]:
+    '''
+    Get the distinct character trigrams of normalized text, padded at both ends.
+
+    Args:
+        text: Normalized text
+
+    Returns:
+        Sorted list of trigrams
+    '''
+    padded = f'  {text} '
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+# -------------------------------------------------------------------------------------------------
+# Trigram index
+# -------------------------------------------------------------------------------------------------
+
+class SearchIndex:
+    '''
+    Inverted index from character trigrams to names, partitioned by name field.
+
+    Attributes:
+        names: DataFrame with one row per indexed name: 'doc' (its id), 'field', 'code',
+            'name' and 'size' (its number of trigrams)
+    '''
+
+    def __init__(self, entries: pl.DataFrame):
+        # `entries` has the columns 'field', 'code' and 'name'
+        entries = (
+            entries
+            .drop_nulls()
+            .unique()
+            .sort('field', 'code', 'name')
+            .with_row_index('doc')
+        )
+        grams = [trigrams(normalize_text(name)) for name in entries.get_column('name')]
+
+        self.names = entries.with_columns(size=pl.Series([len(g) for g in grams], dtype=pl.UInt32))
+        self._fields = entries.get_column('field').to_list()
+        self._codes = entries.get_column('code').to_list()
+        self._titles = entries.get_column('name').to_list()
+        self._sizes = [len(g) for g in grams]
+
+        postings: Dict[str, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        for doc, (field, doc_grams) in enumerate(zip(self._fields, grams)):
+            for gram in doc_grams:
+                postings[field][gram].append(doc)
+        self._postings = {
+            field: {gram: tuple(docs) for gram, docs in by_gram.items()}
+            for field, by_gram in postings.items()
+        }
+
+    @property
+    def fields(self) -> Sequence[str]:
+        '''
+        Sorted list of the indexed name fields.
+        '''
+        return sorted(self._postings)
+
+    def _select(self, fields: Optional[Iterable[str]]) -> List[str]:
+        if fields is None:
+            return self.fields
+        if isinstance(fields, str):
+            fields = [fields]
+        unknown = set(fields) - set(self._postings)
+        if unknown:
+            raise ValueError(f'fields must be among {self.fields}, got {sorted(unknown)}')
+        return list(fields)
+
+    def _best(self, query: str, k: int, fields: List[str]) -> List[Tuple[float, int]]:
+        # Counting the shared trigrams of every candidate in one pass over the posting
+        # lists keeps the loop in C; the scores are then computed once per candidate
+        grams = trigrams(normalize_text(query))
+        postings = [self._postings[field] for field in fields]
+        counts = Counter(chain.from_iterable(p.get(gram, ()) for p in postings for gram in grams))
+
+        size = len(grams)
+        sizes = self._sizes
+        # Negated ids so that equal scores rank the lower id (field, then code) first
+        best = heapq.nlargest(
+            k,
+            ((2 * common / (size + sizes[doc]), -doc) for doc, common in counts.items())
+        )
+        return [(score, -negated) for score, negated in best]
+
+    def search(
+        self,
+        query: str,
+        k: int = DEFAULT_K,
+        fields: Optional[Iterable[str]] = None
+    ) -> List[Match]:
+
+        '''
+        Find the names that best match a query.
+
+        Args:
+            query: Free-text name
+            k: Number of matches to return
+            fields: Name fields to search (default: every indexed field)
+
+        Returns:
+            Up to k Matches, best first; ties are broken by field, then code
+        '''
+        return [
+            Match(self._fields[doc], self._codes[doc], self._titles[doc], score)
+            for score, doc in self._best(query, k, self._select(fields))
+        ]
+
+    def search_batch(
+        self,
+        queries: Iterable[str],
+        k: int = 1,
+        fields: Optional[Iterable[str]] = None
+    ) -> pl.DataFrame:
+
+        '''
+        Find the best matches of many queries at once.
+
+        Args:
+            queries: Free-text names
+            k: Number of matches per query
+            fields: Name fields to search (default: every indexed field)
+
+        Returns:
+            DataFrame with 'query', 'rank' (1 = best), 'field', 'code', 'name' and
+            'score', in the order of the queries then by rank; queries without any match
+            are left out
+        '''
+        queries = list(queries)
+        fields = self._select(fields)
+        best = {query: self._best(query, k, fields) for query in dict.fromkeys(queries)}
+        rows = [
+            (query, rank, self._fields[doc], self._codes[doc], self._titles[doc], score)
+            for query in queries
+            for rank, (score, doc) in enumerate(best[query], start=1)
+        ]
+        return pl.DataFrame(
+            rows,
+            schema={
+                'query': pl.Utf8,
+                'rank': pl.UInt32,
+                'field': pl.Utf8,
+                'code': pl.Utf8,
+                'name': pl.Utf8,
+                'score': pl.Float64,
+            },
+            orient='row'
+        )
+
+
+def _entries(df: pl.DataFrame, names: Dict[str, str]) -> pl.DataFrame:
+    return pl.concat([
+        df
+        .select(field=pl.lit(name), code=pl.col(code), name=pl.col(name))
+        .pipe(decode)
+        for name, code in names.items()
+    ])
+
+
+# -------------------------------------------------------------------------------------------------
+# Area and industry indexes
+# -------------------------------------------------------------------------------------------------
+
+@cached(geo_df=load_geos)
+def area_index(year: int = DEFAULT_AREA_YEAR, geo_df: Optional[pl.DataFrame] = None) -> SearchIndex:
+    '''
+    Get the search index of the area names of a vintage.
+
+    Args:
+        year: Year for geographic definitions (default: 2023)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        SearchIndex over state and county names and CBSA, MSA and CSA titles
+    '''
+    return SearchIndex(_entries(year_slice(geo_df, year), AREA_NAMES))
+
+
+@cached(industry_df=load_industries)
+def industry_index(
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_INDUSTRY_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> SearchIndex:
+
+    '''
+    Get the search index of the industry names of a vintage.
+
+    Args:
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        SearchIndex over the names of every industry level
+    '''
+    return SearchIndex(_entries(survey_slice(industry_df, year, survey), INDUSTRY_NAMES))
+
+
+@instrumented
+def search_area(
+    query: str,
+    k: int = DEFAULT_K,
+    fields: Optional[Iterable[str]] = None,
+    year: int = DEFAULT_AREA_YEAR,
+    geo_df: Optional[pl.DataFrame] = None
+) -> List[Match]:
+
+    '''
+    Find the areas whose names best match a query.
+
+    Args:
+        query: Free-text area name (e.g., 'Fairfield Cnty CT')
+        k: Number of matches to return (default: 5)
+        fields: Name fields to search, among 'state_name', 'county_name', 'cbsa_title',
+            'msa_title' and 'csa_title' (default: all)
+        year: Year for geographic definitions (default: 2023)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        Up to k Matches (field, code, name, score), best first
+    '''
+    return area_index(year, geo_df).search(query, k, fields)
+
+
+@instrumented
+def search_industry(
+    query: str,
+    k: int = DEFAULT_K,
+    fields: Optional[Iterable[str]] = None,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_INDUSTRY_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> List[Match]:
+
+    '''
+    Find the industries whose names best match a query.
+
+    Args:
+        query: Free-text industry name (e.g., 'software publishers')
+        k: Number of matches to return (default: 5)
+        fields: Name fields to search (e.g., 'detailed_industry_name') (default: all)
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        Up to k Matches (field, code, name, score), best first
+    '''
+    return industry_index(survey, year, industry_df).search(query, k, fields)
+
+
+@instrumented
+def search_area_batch(
+    queries: Iterable[str],
+    k: int = 1,
+    fields: Optional[Iterable[str]] = None,
+    year: int = DEFAULT_AREA_YEAR,
+    geo_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Resolve many area names at once.
+
+    Args:
+        queries: Free-text area names
+        k: Number of matches per name (default: 1)
+        fields: Name fields to search (default: all)
+        year: Year for geographic definitions (default: 2023)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        DataFrame with 'query', 'rank', 'field', 'code', 'name' and 'score'
+    '''
+    return area_index(year, geo_df).search_batch(queries, k, fields)
+
+
+@instrumented
+def search_industry_batch(
+    queries: Iterable[str],
+    k: int = 1,
+    fields: Optional[Iterable[str]] = None,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_INDUSTRY_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Resolve many industry names at once.
+
+    Args:
+        queries: Free-text industry names
+        k: Number of matches per name (default: 1)
+        fields: Name fields to search (default: all)
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        DataFrame with 'query', 'rank', 'field', 'code', 'name' and 'score'
+    '''
+    return industry_index(survey, year, industry_df).search_batch(queries, k, fields)
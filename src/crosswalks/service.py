@@ -0,0 +1,530 @@
+'''
+Local ZeroMQ lookup service.
+
+One server process loads the crosswalk tables once and answers lookups for any number of
+worker processes, so they do not each hold their own copy of the tables and derived
+mappings. Clients send a multipart message: a JSON header naming the operation and its
+arguments, optionally followed by a column of codes as an Arrow IPC stream frame. Replies are a
+JSON header followed by zero or more Arrow IPC frames.
+
+The server is a ROUTER socket in front of a pool of worker threads (DEALER to REP), so
+requests from many clients are served concurrently:
+
+    python -m crosswalks.service --address tcp://127.0.0.1:5557 --workers 4
+
+    with LookupClient('tcp://127.0.0.1:5557') as client:
+        client.area_mapping('county_fips', ['state_abbr', 'cbsa_code'])
+        client.translate_area(df['county_fips'], 'county_fips', 'cbsa_code')
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import argparse
+import io
+import json
+import threading
+from typing import Any, Callable, Dict, List, Literal, Mapping, Optional, Sequence, Union
+
+import polars as pl
+import zmq
+
+from crosswalks import geographic_codes as geo
+from crosswalks import industry_codes as ind
+from crosswalks.adjacency import area_children, industry_children
+from crosswalks.geographic_codes import AreaField
+from crosswalks.industry_codes import IndustryField, Survey
+from crosswalks.tables import load_geos, load_industries
+from crosswalks.validation import ValidationReport, validate_area, validate_industry
+
+DEFAULT_ADDRESS = 'tcp://127.0.0.1:5557'
+DEFAULT_WORKERS = 4
+DEFAULT_TIMEOUT = 30.0
+
+# Lookup `output` formats the wire format can carry; 'arrow' and 'numpy' are refused
+OUTPUTS = ('dict', 'list', 'polars')
+
+# How often idle worker threads check for shutdown (ms)
+POLL_INTERVAL = 100
+
+
+class ServiceError(Exception):
+    '''
+    A lookup failed on the server.
+    '''
+
+
+# -------------------------------------------------------------------------------------------------
+# Wire format
+# -------------------------------------------------------------------------------------------------
+
+# Frames use the Arrow IPC stream format, which is much cheaper than the file format
+# for the small payloads of most replies
+
+def _dump_frame(df: pl.DataFrame) -> bytes:
+    buffer = io.BytesIO()
+    df.write_ipc_stream(buffer, compression='uncompressed')
+    return buffer.getvalue()
+
+
+def _load_frame(data: bytes) -> pl.DataFrame:
+    return pl.read_ipc_stream(io.BytesIO(data))
+
+
+def _header(**fields: Any) -> bytes:
+    return json.dumps(fields).encode()
+
+
+def encode_result(result: Any) -> List[bytes]:
+    '''
+    Encode the result of a lookup as reply frames.
+
+    Args:
+        result: DataFrame, Series, mapping, ValidationReport or sequence of values
+
+    Returns:
+        JSON header frame followed by the Arrow IPC frames of the result
+    '''
+    if isinstance(result, ValidationReport):
+        return [
+            _header(ok=True, kind='validation', suggested_year=result.suggested_year),
+            _dump_frame(result.mask.to_frame()),
+            _dump_frame(result.invalid),
+        ]
+    if isinstance(result, pl.DataFrame):
+        return [_header(ok=True, kind='frame'), _dump_frame(result)]
+    if isinstance(result, pl.Series):
+        return [_header(ok=True, kind='series'), _dump_frame(result.to_frame())]
+    if isinstance(result, Mapping):
+        # A None key travels as a null in the key column; tuple values (several targets)
+        # as one column per target, their number in the header
+        keys, values = list(result.keys()), list(result.values())
+        width = len(values[0]) if values and isinstance(values[0], tuple) else None
+        columns = {'key': keys}
+        if width is None:
+            columns['value'] = values
+        else:
+            columns.update({f'value_{i}': [value[i] for value in values] for i in range(width)})
+        return [_header(ok=True, kind='mapping', width=width), _dump_frame(pl.DataFrame(columns))]
+    return [_header(ok=True, kind='sequence'), _dump_frame(pl.DataFrame({'value': list(result)}))]
+
+
+def decode_result(frames: List[bytes]) -> Any:
+    '''
+    Decode reply frames into the result of a lookup.
+
+    Args:
+        frames: JSON header frame followed by Arrow IPC frames
+
+    Returns:
+        DataFrame, Series, dict, ValidationReport or tuple, as encoded by the server
+
+    Raises:
+        ServiceError: If the lookup failed on the server
+    '''
+    header = json.loads(frames[0])
+    if not header['ok']:
+        raise ServiceError(f'{header["error"]}: {header["message"]}')
+
+    kind = header['kind']
+    if kind == 'validation':
+        mask = _load_frame(frames[1]).to_series()
+        return ValidationReport(mask, _load_frame(frames[2]), header['suggested_year'])
+
+    frame = _load_frame(frames[1])
+    if kind == 'frame':
+        return frame
+    if kind == 'series':
+        return frame.to_series()
+    if kind == 'mapping':
+        if header['width'] is None:
+            return dict(frame.iter_rows())
+        return {row[0]: row[1:] for row in frame.iter_rows()}
+    return tuple(frame.to_series())
+
+
+# -------------------------------------------------------------------------------------------------
+# Operations
+# -------------------------------------------------------------------------------------------------
+
+def _expand_area(values: Any, parent: AreaField, child: AreaField, **kwargs: Any) -> pl.DataFrame:
+    return area_children(parent, child, **kwargs).expand(values)
+
+
+def _expand_industry(
+    values: Any,
+    parent: IndustryField,
+    child: IndustryField,
+    **kwargs: Any
+) -> pl.DataFrame:
+
+    return industry_children(parent, child, **kwargs).expand(values)
+
+
+OPERATIONS: Dict[str, Callable[..., Any]] = {
+    'area_years': geo.available_years,
+    'area_mapping': geo.area_mapping,
+    'get_area': geo.get_area,
+    'valid_area': geo.valid_area,
+    'translate_area': geo.translate_area,
+    'validate_area': validate_area,
+    'expand_area': _expand_area,
+    'industry_years': ind.available_years,
+    'industry_mapping': ind.industry_mapping,
+    'get_industry': ind.get_industry,
+    'valid_industry': ind.valid_industry,
+    'translate_industry': ind.translate_industry,
+    'validate_industry': validate_industry,
+    'expand_industry': _expand_industry,
+}
+
+
+def handle(frames: List[bytes]) -> List[bytes]:
+    '''
+    Answer one request.
+
+    Args:
+        frames: JSON header frame ({'op': ..., 'kwargs': {...}}), optionally followed by
+            an Arrow IPC frame with a single column passed as `values`
+
+    Returns:
+        Reply frames; failures are reported in the header rather than raised
+    '''
+    try:
+        header = json.loads(frames[0])
+        op = header['op']
+        if op not in OPERATIONS:
+            raise ValueError(f'unknown operation: {op!r}')
+
+        kwargs = header.get('kwargs', {})
+        if kwargs.get('output', 'dict') not in OUTPUTS:
+            raise ValueError(f'output must be one of {OUTPUTS}, got {kwargs["output"]!r}')
+        if len(frames) > 1:
+            kwargs['values'] = _load_frame(frames[1]).to_series()
+
+        return encode_result(OPERATIONS[op](**kwargs))
+
+    except Exception as error:
+        return [_header(ok=False, error=type(error).__name__, message=str(error))]
+
+
+# -------------------------------------------------------------------------------------------------
+# Server
+# -------------------------------------------------------------------------------------------------
+
+class LookupServer:
+    '''
+    ROUTER front end with a pool of worker threads answering lookups.
+
+    The tables are loaded once when the server starts and shared by every worker. Polars
+    releases the GIL inside joins and filters, so batched lookups run in parallel.
+    '''
+
+    def __init__(self, address: str = DEFAULT_ADDRESS, workers: int = DEFAULT_WORKERS):
+        self.address = address
+        self.workers = workers
+        self._context: Optional[zmq.Context] = None
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+        self._backend = f'inproc://crosswalks-workers-{id(self)}'
+
+    def start(self) -> str:
+        '''
+        Load the tables, bind the front end and start the workers.
+
+        Returns:
+            The bound address (with the port filled in if `address` ended in ':*')
+
+        Raises:
+            zmq.ZMQError: If the front end cannot be bound (e.g., the address is in use)
+        '''
+        load_geos(), load_industries()
+
+        self._context = zmq.Context()
+        self._stop.clear()
+
+        # Bound on the calling thread, so that a failure is raised here rather than lost
+        # in the proxy thread
+        frontend = self._context.socket(zmq.ROUTER)
+        backend = self._context.socket(zmq.DEALER)
+        try:
+            frontend.bind(self.address)
+            backend.bind(self._backend)
+        except zmq.ZMQError:
+            frontend.close(linger=0)
+            backend.close(linger=0)
+            self._context.term()
+            self._context = None
+            raise
+        self.address = frontend.getsockopt_string(zmq.LAST_ENDPOINT)
+
+        def proxy() -> None:
+            try:
+                # Runs in libzmq until the context is terminated
+                zmq.proxy(frontend, backend)
+            except zmq.ContextTerminated:
+                pass
+            finally:
+                frontend.close(linger=0)
+                backend.close(linger=0)
+
+        def worker() -> None:
+            socket = self._context.socket(zmq.REP)
+            socket.connect(self._backend)
+            try:
+                while not self._stop.is_set():
+                    if socket.poll(POLL_INTERVAL):
+                        socket.send_multipart(handle(socket.recv_multipart()))
+            finally:
+                socket.close(linger=0)
+
+        self._threads = [threading.Thread(target=proxy, name='crosswalks-proxy', daemon=True)]
+        self._threads[0].start()
+
+        for i in range(self.workers):
+            thread = threading.Thread(target=worker, name=f'crosswalks-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        return self.address
+
+    def stop(self) -> None:
+        '''
+        Stop the workers and the front end.
+        '''
+        if self._context is None:
+            return
+
+        self._stop.set()
+        proxy, *workers = self._threads
+        for thread in workers:
+            thread.join()
+        self._context.term()
+        proxy.join()
+        self._threads = []
+        self._context = None
+
+    def __enter__(self) -> 'LookupServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+# -------------------------------------------------------------------------------------------------
+# Client
+# -------------------------------------------------------------------------------------------------
+
+class LookupClient:
+    '''
+    Client for a LookupServer, with the signatures of the local lookup functions.
+
+    Each client owns one REQ socket and is not thread-safe; use one client per thread.
+    '''
+
+    def __init__(
+        self,
+        address: str = DEFAULT_ADDRESS,
+        timeout: float = DEFAULT_TIMEOUT,
+        context: Optional[zmq.Context] = None
+    ):
+        self.address = address
+        self.timeout = timeout
+        self._context = context or zmq.Context.instance()
+        self._socket = self._connect()
+
+    def _connect(self) -> zmq.Socket:
+        socket = self._context.socket(zmq.REQ)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.connect(self.address)
+        return socket
+
+    def call(self, op: str, values: Any = None, **kwargs: Any) -> Any:
+        '''
+        Send one request and wait for its reply.
+
+        Args:
+            op: Operation name (a key of OPERATIONS)
+            values: Optional column of codes, sent as an Arrow IPC frame
+            **kwargs: Arguments of the operation (JSON-serializable)
+
+        Returns:
+            The decoded result
+
+        Raises:
+            ServiceError: If the lookup failed on the server
+            TimeoutError: If no reply arrived within `timeout` seconds
+        '''
+        frames = [_header(op=op, kwargs=kwargs)]
+        if values is not None:
+            frames.append(_dump_frame(pl.Series('values', values).to_frame()))
+
+        self._socket.send_multipart(frames, copy=False)
+        if not self._socket.poll(int(self.timeout * 1000)):
+            # A REQ socket cannot send again before it receives, so start over
+            self._socket.close(linger=0)
+            self._socket = self._connect()
+            raise TimeoutError(f'no reply from {self.address} within {self.timeout}s')
+        return decode_result(self._socket.recv_multipart())
+
+    def close(self) -> None:
+        '''
+        Close the socket.
+        '''
+        self._socket.close(linger=0)
+
+    def __enter__(self) -> 'LookupClient':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # Areas
+
+    def area_years(self) -> Sequence[int]:
+        return self.call('area_years')
+
+    def area_mapping(
+        self,
+        from_area: AreaField,
+        to_area: Union[AreaField, Sequence[AreaField]],
+        year: int = geo.DEFAULT_YEAR,
+        output: Literal['dict', 'polars'] = 'dict'
+    ) -> Union[Mapping[str, Any], pl.DataFrame]:
+
+        return self.call(
+            'area_mapping', from_area=from_area, to_area=to_area, year=year, output=output
+        )
+
+    def get_area(self, area: str, year: int = geo.DEFAULT_YEAR) -> Mapping[str, str]:
+        return self.call('get_area', area=area, year=year)
+
+    def valid_area(self, area: AreaField, year: int = geo.DEFAULT_YEAR) -> Sequence[str]:
+        return self.call('valid_area', area=area, year=year)
+
+    def translate_area(
+        self,
+        values: Any,
+        from_area: AreaField,
+        to_area: AreaField,
+        year: int = geo.DEFAULT_YEAR
+    ) -> pl.Series:
+
+        return self.call('translate_area', values, from_area=from_area, to_area=to_area, year=year)
+
+    def validate_area(
+        self,
+        values: Any,
+        area: AreaField,
+        year: int = geo.DEFAULT_YEAR
+    ) -> ValidationReport:
+
+        return self.call('validate_area', values, area=area, year=year)
+
+    def expand_area(
+        self,
+        values: Any,
+        parent: AreaField,
+        child: AreaField,
+        year: int = geo.DEFAULT_YEAR
+    ) -> pl.DataFrame:
+
+        return self.call('expand_area', values, parent=parent, child=child, year=year)
+
+    # Industries
+
+    def industry_years(self, survey: Survey = ind.DEFAULT_SURVEY) -> Sequence[int]:
+        return self.call('industry_years', survey=survey)
+
+    def industry_mapping(
+        self,
+        from_industry: IndustryField,
+        to_industry: Union[IndustryField, Sequence[IndustryField]],
+        survey: Survey = ind.DEFAULT_SURVEY,
+        year: int = ind.DEFAULT_YEAR,
+        output: Literal['dict', 'polars'] = 'dict'
+    ) -> Union[Mapping[str, Any], pl.DataFrame]:
+
+        return self.call(
+            'industry_mapping',
+            from_industry=from_industry, to_industry=to_industry, survey=survey, year=year,
+            output=output
+        )
+
+    def get_industry(
+        self,
+        industry: str,
+        survey: Survey = ind.DEFAULT_SURVEY,
+        year: int = ind.DEFAULT_YEAR
+    ) -> Mapping[str, str]:
+
+        return self.call('get_industry', industry=industry, survey=survey, year=year)
+
+    def valid_industry(
+        self,
+        industry: IndustryField,
+        survey: Survey = ind.DEFAULT_SURVEY,
+        year: int = ind.DEFAULT_YEAR
+    ) -> Sequence[str]:
+
+        return self.call('valid_industry', industry=industry, survey=survey, year=year)
+
+    def translate_industry(
+        self,
+        values: Any,
+        from_industry: IndustryField,
+        to_industry: IndustryField,
+        survey: Survey = ind.DEFAULT_SURVEY,
+        year: int = ind.DEFAULT_YEAR
+    ) -> pl.Series:
+
+        return self.call(
+            'translate_industry', values,
+            from_industry=from_industry, to_industry=to_industry, survey=survey, year=year
+        )
+
+    def validate_industry(
+        self,
+        values: Any,
+        industry: IndustryField,
+        survey: Survey = ind.DEFAULT_SURVEY,
+        year: int = ind.DEFAULT_YEAR
+    ) -> ValidationReport:
+
+        return self.call('validate_industry', values, industry=industry, survey=survey, year=year)
+
+    def expand_industry(
+        self,
+        values: Any,
+        parent: IndustryField,
+        child: IndustryField,
+        survey: Survey = ind.DEFAULT_SURVEY,
+        year: int = ind.DEFAULT_YEAR
+    ) -> pl.DataFrame:
+
+        return self.call(
+            'expand_industry', values, parent=parent, child=child, survey=survey, year=year
+        )
+
+
+# -------------------------------------------------------------------------------------------------
+# Command line
+# -------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Serve crosswalk lookups over ZeroMQ.')
+    parser.add_argument('--address', default=DEFAULT_ADDRESS, help='ZeroMQ endpoint to bind')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='worker threads')
+    args = parser.parse_args()
+
+    server = LookupServer(args.address, args.workers)
+    server.start()
+    print(f'serving crosswalk lookups on {server.address} with {args.workers} workers', flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
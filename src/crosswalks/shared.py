@@ -0,0 +1,163 @@
+'''
+Shared-memory tables for multi-process workers.
+
+The parent process publishes the loaded tables once as uncompressed Arrow IPC files in
+shared memory (/dev/shm where available), sorted by year so that the per-vintage index
+of every child slices them in place. Children attach by memory-mapping the files and
+installing them as the bundled tables, so the lookup functions work unchanged and every
+process reads the same physical pages:
+
+    with publish() as shared:
+        with ProcessPoolExecutor(initializer=attach, initargs=(shared.path,)) as pool:
+            ...
+
+The publisher owns the files: they are removed by `unlink`, on leaving the `with` block,
+or when the publishing process exits.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import atexit
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+import polars as pl
+
+from crosswalks.tables import geos_table, industries_table
+
+# Bump when the layout of the published files changes
+SHARED_VERSION = 1
+
+TABLES = {
+    'geographic_codes': geos_table,
+    'industry_codes': industries_table,
+}
+
+
+def _default_directory() -> Path:
+    # /dev/shm is memory-backed on Linux; elsewhere the temporary directory is used
+    shm = Path('/dev/shm')
+    return shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+
+
+# -------------------------------------------------------------------------------------------------
+# Publish
+# -------------------------------------------------------------------------------------------------
+
+class SharedTables:
+    '''
+    Handle on a set of published tables.
+
+    Attributes:
+        path: Directory holding the published files; pass it to `attach` in the children
+    '''
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._owner = os.getpid()
+        atexit.register(self._cleanup)
+
+    def __repr__(self) -> str:
+        return f'SharedTables({str(self.path)!r})'
+
+    def unlink(self) -> None:
+        '''
+        Remove the published files.
+
+        Processes that already attached keep their mappings until they exit; new
+        processes can no longer attach.
+        '''
+        shutil.rmtree(self.path, ignore_errors=True)
+        atexit.unregister(self._cleanup)
+
+    def _cleanup(self) -> None:
+        # Forked children inherit the atexit hook; only the publisher removes the files
+        if os.getpid() == self._owner:
+            shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self) -> 'SharedTables':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.unlink()
+
+
+def publish(directory: Optional[Union[str, Path]] = None) -> SharedTables:
+    '''
+    Publish the loaded tables to shared memory.
+
+    The tables are loaded first if needed, in whichever representation is active
+    (standard or compact), and written sorted by year.
+
+    Args:
+        directory: Where to create the files (default: /dev/shm, or the temporary
+            directory where /dev/shm is not available)
+
+    Returns:
+        SharedTables handle; the files live until it is unlinked or this process exits
+    '''
+    root = Path(directory) if directory is not None else _default_directory()
+    path = Path(tempfile.mkdtemp(prefix='crosswalks-', dir=root))
+    shared = SharedTables(path)
+
+    try:
+        for name, table in TABLES.items():
+            (
+                table
+                .get()
+                .sort('year', maintain_order=True)
+                .write_ipc(path / f'{name}.arrow', compression='uncompressed')
+            )
+        manifest = {'version': SHARED_VERSION, 'tables': sorted(TABLES)}
+        (path / 'manifest.json').write_text(json.dumps(manifest, indent=2) + '\n')
+    except BaseException:
+        shared.unlink()
+        raise
+
+    return shared
+
+
+# -------------------------------------------------------------------------------------------------
+# Attach
+# -------------------------------------------------------------------------------------------------
+
+def attach(path: Union[str, Path]) -> Dict[str, pl.DataFrame]:
+    '''
+    Attach to published tables and use them as the bundled tables of this process.
+
+    Suitable as the `initializer` of a process pool. The files are memory-mapped, so no
+    table data is copied into the process.
+
+    Args:
+        path: Directory returned by `publish` (SharedTables.path)
+
+    Returns:
+        Dict mapping each table name to the attached DataFrame
+
+    Raises:
+        ValueError: If the directory does not hold tables published by this version
+    '''
+    path = Path(path)
+    try:
+        manifest = json.loads((path / 'manifest.json').read_text())
+    except (OSError, ValueError) as error:
+        raise ValueError(f'no published tables in {path}') from error
+    if manifest.get('version') != SHARED_VERSION:
+        raise ValueError(f'tables in {path} were published by an incompatible version')
+
+    attached = {}
+    for name, table in TABLES.items():
+        df = (
+            pl
+            .read_ipc(path / f'{name}.arrow', memory_map=True, rechunk=False)
+            .with_columns(pl.col('year').set_sorted())
+        )
+        table.install(df)
+        attached[name] = df
+    return attached
@@ -0,0 +1,179 @@
+'''
+Streaming, bounded-memory enrichment of fact tables that do not fit in memory.
+
+The fact table is scanned lazily from Parquet, CSV or Arrow IPC, the requested area
+and industry attributes are attached with the `crosswalk` LazyFrame namespace, and the
+result is written incrementally with the Polars streaming engine. Only the small
+mapping tables and a bounded number of chunks are held in memory at any time.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from pathlib import Path
+from typing import Optional, Sequence, Union
+
+import polars as pl
+
+from crosswalks import namespace  # noqa: F401  (registers the `crosswalk` namespace)
+from crosswalks.geographic_codes import DEFAULT_YEAR as DEFAULT_AREA_YEAR
+from crosswalks.geographic_codes import AreaField
+from crosswalks.industry_codes import DEFAULT_SURVEY, IndustryField, Survey
+from crosswalks.industry_codes import DEFAULT_YEAR as DEFAULT_INDUSTRY_YEAR
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+Source = Union[str, Path, pl.LazyFrame]
+
+
+# -------------------------------------------------------------------------------------------------
+# Scan and sink by file type
+# -------------------------------------------------------------------------------------------------
+
+def scan(source: Source, keys: Sequence[str] = ()) -> pl.LazyFrame:
+    '''
+    Scan a fact table lazily.
+
+    Args:
+        source: Path to a Parquet, CSV or Arrow IPC file (globs allowed), or a LazyFrame
+        keys: Code columns to read as strings from CSV, so leading zeros are kept
+
+    Returns:
+        LazyFrame over the source
+    '''
+    if isinstance(source, pl.LazyFrame):
+        return source
+
+    suffix = Path(source).suffix.lower()
+    if suffix == '.parquet':
+        return pl.scan_parquet(source)
+    if suffix == '.csv':
+        return pl.scan_csv(source, schema_overrides={key: pl.Utf8 for key in keys})
+    if suffix in ('.arrow', '.ipc', '.feather'):
+        return pl.scan_ipc(source)
+    raise ValueError(f'unsupported file type: {source}')
+
+
+def sink(lf: pl.LazyFrame, output: Union[str, Path], chunk_size: int) -> None:
+    '''
+    Write a LazyFrame incrementally with the streaming engine.
+
+    Args:
+        lf: LazyFrame to write
+        output: Path of a Parquet, CSV or Arrow IPC file
+        chunk_size: Rows per streaming chunk (and per Parquet row group)
+    '''
+    suffix = Path(output).suffix.lower()
+    with pl.Config(streaming_chunk_size=chunk_size):
+        if suffix == '.parquet':
+            lf.sink_parquet(output, row_group_size=chunk_size, engine='streaming')
+        elif suffix == '.csv':
+            lf.sink_csv(output, engine='streaming')
+        elif suffix in ('.arrow', '.ipc', '.feather'):
+            lf.sink_ipc(output, engine='streaming')
+        else:
+            raise ValueError(f'unsupported file type: {output}')
+
+
+# -------------------------------------------------------------------------------------------------
+# Enrichment
+# -------------------------------------------------------------------------------------------------
+
+def enrich_lazy(
+    source: Source,
+    area_on: Optional[str] = None,
+    area_fields: Sequence[AreaField] = (),
+    industry_on: Optional[str] = None,
+    industry_fields: Sequence[IndustryField] = (),
+    from_area: Optional[AreaField] = None,
+    from_industry: IndustryField = 'detailed_industry',
+    area_year: int = DEFAULT_AREA_YEAR,
+    industry_year: int = DEFAULT_INDUSTRY_YEAR,
+    survey: Survey = DEFAULT_SURVEY
+) -> pl.LazyFrame:
+
+    '''
+    Build the lazy plan that attaches area and industry attributes to a fact table.
+
+    Args:
+        source: Path to a Parquet, CSV or Arrow IPC file, or a LazyFrame
+        area_on: Column holding the area codes
+        area_fields: Area fields to attach (e.g., ['cbsa_code', 'state_abbr'])
+        industry_on: Column holding the industry codes
+        industry_fields: Industry fields to attach (e.g., ['sector', 'supersector_name'])
+        from_area: Area type of the `area_on` column (default: `area_on`)
+        from_industry: Industry level of the `industry_on` column (default: 'detailed_industry')
+        area_year: Year for geographic definitions (default: 2023)
+        industry_year: Year for industry definitions (default: 2023)
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+
+    Returns:
+        LazyFrame with the requested fields appended
+    '''
+
+    keys = [key for key in (area_on, industry_on) if key is not None]
+    lf = scan(source, keys)
+
+    if area_on is not None and area_fields:
+        lf = lf.crosswalk.join_area(
+            area_on, list(area_fields), from_area=from_area, year=area_year
+        )
+    if industry_on is not None and industry_fields:
+        lf = lf.crosswalk.join_industry(
+            industry_on, list(industry_fields), from_industry=from_industry,
+            survey=survey, year=industry_year
+        )
+
+    return lf
+
+
+def enrich(
+    source: Source,
+    output: Union[str, Path],
+    area_on: Optional[str] = None,
+    area_fields: Sequence[AreaField] = (),
+    industry_on: Optional[str] = None,
+    industry_fields: Sequence[IndustryField] = (),
+    from_area: Optional[AreaField] = None,
+    from_industry: IndustryField = 'detailed_industry',
+    area_year: int = DEFAULT_AREA_YEAR,
+    industry_year: int = DEFAULT_INDUSTRY_YEAR,
+    survey: Survey = DEFAULT_SURVEY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> None:
+
+    '''
+    Attach area and industry attributes to a fact table and write it out, streaming.
+
+    Memory use is bounded by the chunk size rather than the size of the input: the
+    input is read, joined and written chunk by chunk.
+
+    Args:
+        source: Path to a Parquet, CSV or Arrow IPC file, or a LazyFrame
+        output: Path of the Parquet, CSV or Arrow IPC file to write
+        area_on: Column holding the area codes
+        area_fields: Area fields to attach (e.g., ['cbsa_code', 'state_abbr'])
+        industry_on: Column holding the industry codes
+        industry_fields: Industry fields to attach (e.g., ['sector', 'supersector_name'])
+        from_area: Area type of the `area_on` column (default: `area_on`)
+        from_industry: Industry level of the `industry_on` column (default: 'detailed_industry')
+        area_year: Year for geographic definitions (default: 2023)
+        industry_year: Year for industry definitions (default: 2023)
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        chunk_size: Rows per streaming chunk (default: 250,000)
+    '''
+
+    lf = enrich_lazy(
+        source,
+        area_on=area_on,
+        area_fields=area_fields,
+        industry_on=industry_on,
+        industry_fields=industry_fields,
+        from_area=from_area,
+        from_industry=from_industry,
+        area_year=area_year,
+        industry_year=industry_year,
+        survey=survey
+    )
+    sink(lf, output, chunk_size)
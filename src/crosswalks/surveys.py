@@ -0,0 +1,167 @@
+'''
+Survey membership as bitmasks, and set queries over surveys and years.
+
+The industry table marks the surveys a row is valid for with three Boolean columns. For
+one industry level, `survey_membership` folds them into a single bitmask per code and
+year (ces = 1, bed = 2, qcew = 4), built once and cached. Questions that otherwise take
+a pass over the table per survey and year, such as "codes in QCEW but not in CES for
+2022" or "codes valid in every survey from 2017 to 2022", are then bit tests on that
+table:
+
+    survey_codes('detailed_industry', include='qcew', exclude='ces', years=2022)
+    survey_codes('detailed_industry', include=SURVEYS, years=range(2017, 2023))
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import polars as pl
+
+from crosswalks.cache import cached
+from crosswalks.compact import decode
+from crosswalks.industry_codes import DEFAULT_YEAR, IndustryField, Survey
+from crosswalks.index import table_index
+from crosswalks.instrument import instrumented
+from crosswalks.tables import SURVEY_BITS, SURVEYS, load_industries
+
+Surveys = Union[Survey, Iterable[Survey]]
+
+
+def survey_bits(surveys: Surveys) -> int:
+    '''
+    Get the bitmask of a set of surveys.
+
+    Args:
+        surveys: Survey type or types ('ces', 'bed', 'qcew')
+
+    Returns:
+        Bitmask with the bit of every survey set
+    '''
+    if isinstance(surveys, str):
+        surveys = [surveys]
+
+    bits = 0
+    for survey in surveys:
+        if survey not in SURVEY_BITS:
+            raise ValueError(f'survey must be one of {tuple(SURVEY_BITS)}, got {survey!r}')
+        bits |= SURVEY_BITS[survey]
+    return bits
+
+
+def survey_names(bits: int) -> Tuple[str, ...]:
+    '''
+    Get the surveys in a bitmask.
+
+    Args:
+        bits: Survey bitmask (e.g., 5)
+
+    Returns:
+        Tuple of survey types (e.g., ('ces', 'qcew'))
+    '''
+    return tuple(survey for survey in SURVEYS if bits & SURVEY_BITS[survey])
+
+
+# -------------------------------------------------------------------------------------------------
+# Membership table
+# -------------------------------------------------------------------------------------------------
+
+@instrumented
+@cached(industry_df=load_industries)
+def survey_membership(
+    industry: IndustryField,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Get the surveys every code of an industry level is valid for, by year.
+
+    A code is valid for a survey in a year if any of its rows is.
+
+    Args:
+        industry: Column name for industry type (e.g., 'sector', 'detailed_industry')
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        DataFrame with 'year', 'code' and 'surveys' (UInt8 bitmask), sorted by year and code
+    '''
+    # The row bitmasks of each year are kept by the table index and shared with its slices
+    index = table_index(industry_df)
+    return (
+        pl.concat([
+            index
+            .year(year)
+            .select('year', industry)
+            .with_columns(index.surveys(year))
+            for year in index.years
+        ])
+        .drop_nulls(industry)
+        .group_by('year', industry)
+        .agg(pl.col('surveys').bitwise_or())
+        .pipe(decode)
+        .rename({industry: 'code'})
+        .sort('year', 'code')
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Set queries
+# -------------------------------------------------------------------------------------------------
+
+@instrumented
+@cached(industry_df=load_industries)
+def survey_codes(
+    industry: IndustryField,
+    include: Surveys = (),
+    exclude: Surveys = (),
+    years: Union[int, Sequence[int]] = DEFAULT_YEAR,
+    every_year: bool = True,
+    industry_df: Optional[pl.DataFrame] = None
+) -> Sequence[str]:
+
+    '''
+    Get the codes of an industry level that are valid for some surveys and not others.
+
+    Args:
+        industry: Column name for industry type (e.g., 'sector', 'detailed_industry')
+        include: Surveys a code must be valid for (default: none)
+        exclude: Surveys a code must not be valid for (default: none)
+        years: Year or years of the industry definitions (default: 2023); years
+            without definitions in the table are skipped
+        every_year: Whether a code must qualify in every year, rather than in any
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        Sorted tuple of codes
+    '''
+    included = survey_bits(include)
+    excluded = survey_bits(exclude)
+    if included & excluded:
+        raise ValueError(
+            f'include and exclude must not share surveys, got {survey_names(included & excluded)}'
+        )
+    years = [years] if isinstance(years, int) else list(years)
+
+    membership = survey_membership(industry, industry_df).filter(pl.col('year').is_in(years))
+    qualifies = (
+        ((pl.col('surveys') & included) == included) &
+        ((pl.col('surveys') & excluded) == 0)
+    )
+    codes = membership.group_by('code').agg(
+        qualifies=qualifies.all() if every_year else qualifies.any(),
+        present=pl.len()
+    )
+
+    # With `every_year`, a code missing from one of the years does not qualify either
+    if every_year:
+        codes = codes.filter(pl.col('present') == membership.get_column('year').n_unique())
+
+    return list(
+        codes
+        .filter(pl.col('qualifies'))
+        .get_column('code')
+        .sort()
+        .to_list()
+    )
@@ -0,0 +1,338 @@
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import polars as pl
+
+from crosswalks.cache import clear_cache
+from crosswalks.compact import compact
+
+BASE_PATH = Path(__file__).parent.parent.parent
+DATA_PATH = BASE_PATH / 'data'
+
+# Bump when the layout of the binary artifacts changes
+ARTIFACT_VERSION = 1
+
+# Load the tables in the compact representation (see crosswalks.compact)
+COMPACT = os.environ.get('CROSSWALKS_COMPACT', '0') not in ('', '0')
+
+GEOS_SCHEMA = {
+    'year': pl.Int64,
+    'region': pl.Utf8,
+    'division': pl.Utf8,
+    'state_fips': pl.Utf8,
+    'county_fips': pl.Utf8,
+    'region_name': pl.Utf8,
+    'division_name': pl.Utf8,
+    'state_abbr': pl.Utf8,
+    'state_name': pl.Utf8,
+    'county_name': pl.Utf8,
+    'cbsa_code': pl.Utf8,
+    'msa_code': pl.Utf8,
+    'csa_code': pl.Utf8,
+    'cbsa_title': pl.Utf8,
+    'msa_title': pl.Utf8,
+    'csa_title': pl.Utf8,
+    'metro': pl.Int64,
+}
+
+INDUSTRIES_SCHEMA = {
+    'year': pl.Int64,
+    'ces': pl.Boolean,
+    'bed': pl.Boolean,
+    'qcew': pl.Boolean,
+    'domain': pl.Utf8,
+    'supersector': pl.Utf8,
+    'sector': pl.Utf8,
+    'subsector': pl.Utf8,
+    'industry_group': pl.Utf8,
+    'naics_industry': pl.Utf8,
+    'detailed_industry': pl.Utf8,
+    'domain_name': pl.Utf8,
+    'supersector_name': pl.Utf8,
+    'sector_name': pl.Utf8,
+    'subsector_name': pl.Utf8,
+    'industry_group_name': pl.Utf8,
+    'naics_industry_name': pl.Utf8,
+    'detailed_industry_name': pl.Utf8,
+}
+
+SURVEYS = ['ces', 'bed', 'qcew']
+
+# Bit of each survey in a survey bitmask (see crosswalks.surveys)
+SURVEY_BITS = {'ces': 1, 'bed': 2, 'qcew': 4}
+
+
+def survey_mask() -> pl.Expr:
+    '''
+    Fold the Boolean survey columns of an industry table into one bitmask.
+
+    Returns:
+        UInt8 expression with the bit of every survey a row is valid for, named 'surveys'
+    '''
+    bits = [
+        pl.col(survey).fill_null(False).cast(pl.UInt8) * bit
+        for survey, bit in SURVEY_BITS.items()
+    ]
+    return pl.sum_horizontal(bits).cast(pl.UInt8).alias('surveys')
+
+
+# -------------------------------------------------------------------------------------------------
+# Thread-safe lazy table
+# -------------------------------------------------------------------------------------------------
+
+class LazyTable:
+    '''
+    A DataFrame that is loaded on first access.
+
+    The loader runs at most once, even when several threads ask for the table at the
+    same time; every caller receives the same DataFrame object.
+    '''
+
+    def __init__(self, loader: Callable[[], pl.DataFrame]):
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._df: Optional[pl.DataFrame] = None
+
+    @property
+    def loaded(self) -> bool:
+        '''
+        Whether the table has been loaded.
+        '''
+        return self._df is not None
+
+    def get(self) -> pl.DataFrame:
+        '''
+        Get the table, loading it on first use.
+
+        Returns:
+            The loaded DataFrame
+        '''
+        df = self._df
+        if df is None:
+            with self._lock:
+                if self._df is None:
+                    self._df = self._loader()
+                df = self._df
+        return df
+
+    def reset(self) -> None:
+        '''
+        Drop the loaded table so the next access reloads it.
+        '''
+        with self._lock:
+            self._df = None
+
+    def install(self, df: pl.DataFrame) -> None:
+        '''
+        Use an already loaded DataFrame as the table, e.g. one attached from shared memory.
+
+        Args:
+            df: DataFrame to return from `get`
+        '''
+        with self._lock:
+            self._df = df
+
+
+# -------------------------------------------------------------------------------------------------
+# CSV readers
+# -------------------------------------------------------------------------------------------------
+
+def _read_geos_csv(path: Path) -> pl.DataFrame:
+    return (
+        pl
+        .read_csv(
+            path,
+            schema_overrides=GEOS_SCHEMA
+        )
+    )
+
+
+def _read_industries_csv(path: Path) -> pl.DataFrame:
+    # Survey flags are stored as 0/1 and cast to Boolean after parsing
+    return (
+        pl
+        .read_csv(
+            path,
+            schema_overrides={
+                **INDUSTRIES_SCHEMA,
+                **{survey: pl.UInt8 for survey in SURVEYS}
+            }
+        )
+        .with_columns(
+            pl.col(SURVEYS)
+              .cast(pl.Boolean)
+        )
+    )
+
+
+CSV_READERS: Dict[str, Callable[[Path], pl.DataFrame]] = {
+    'geographic_codes': _read_geos_csv,
+    'industry_codes': _read_industries_csv,
+}
+
+
+# -------------------------------------------------------------------------------------------------
+# Binary artifacts (Arrow IPC and Parquet) with a manifest
+# -------------------------------------------------------------------------------------------------
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _manifest_path(name: str, data_path: Path) -> Path:
+    return data_path / f'{name}.manifest.json'
+
+
+def write_artifacts(name: str, data_path: Path = DATA_PATH) -> Dict[str, object]:
+    '''
+    Write typed Arrow IPC and Parquet copies of a generated CSV table.
+
+    The artifacts are produced from the CSV through the same reader the CSV fallback
+    uses, so both load paths return identical DataFrames. A manifest records the
+    artifact version, the checksum of the source CSV and the artifact sizes.
+
+    Args:
+        name: Table name ('geographic_codes' or 'industry_codes')
+        data_path: Directory holding the CSV and the artifacts
+
+    Returns:
+        The manifest that was written
+    '''
+    csv_path = data_path / f'{name}.csv'
+    df = CSV_READERS[name](csv_path)
+
+    # Uncompressed IPC so the file can be memory-mapped without decoding
+    arrow_path = data_path / f'{name}.arrow'
+    parquet_path = data_path / f'{name}.parquet'
+    df.write_ipc(arrow_path, compression='uncompressed')
+    df.write_parquet(parquet_path)
+
+    manifest = {
+        'version': ARTIFACT_VERSION,
+        'source_sha256': _sha256(csv_path),
+        'arrow_bytes': arrow_path.stat().st_size,
+        'parquet_bytes': parquet_path.stat().st_size,
+    }
+    _manifest_path(name, data_path).write_text(json.dumps(manifest, indent=2) + '\n')
+    return manifest
+
+
+def _valid_manifest(name: str, data_path: Path) -> Optional[Dict[str, object]]:
+    # A manifest is only trusted if it matches this version and the current CSV
+    try:
+        manifest = json.loads(_manifest_path(name, data_path).read_text())
+    except (OSError, ValueError):
+        return None
+
+    if manifest.get('version') != ARTIFACT_VERSION:
+        return None
+
+    csv_path = data_path / f'{name}.csv'
+    if csv_path.exists() and manifest.get('source_sha256') != _sha256(csv_path):
+        return None
+
+    return manifest
+
+
+def read_table(name: str, data_path: Path = DATA_PATH) -> pl.DataFrame:
+    '''
+    Read a generated table, preferring the binary artifacts over the CSV.
+
+    The Arrow IPC file is memory-mapped, so processes on one host share the same
+    page-cache pages. Parquet is used when the IPC file is missing, and the CSV when
+    neither artifact is present or the manifest shows they are stale.
+
+    Args:
+        name: Table name ('geographic_codes' or 'industry_codes')
+        data_path: Directory holding the CSV and the artifacts
+
+    Returns:
+        DataFrame with the table
+    '''
+    manifest = _valid_manifest(name, data_path)
+
+    if manifest is not None:
+        for suffix, reader in [
+            ('arrow', lambda path: pl.read_ipc(path, memory_map=True, rechunk=False)),
+            ('parquet', pl.read_parquet)
+        ]:
+            path = data_path / f'{name}.{suffix}'
+            try:
+                if path.stat().st_size == manifest.get(f'{suffix}_bytes'):
+                    return reader(path)
+            except (OSError, pl.exceptions.PolarsError):
+                continue
+
+    return CSV_READERS[name](data_path / f'{name}.csv')
+
+
+# -------------------------------------------------------------------------------------------------
+# Loaders
+# -------------------------------------------------------------------------------------------------
+
+def _read_geos() -> pl.DataFrame:
+    df = read_table('geographic_codes')
+    return compact(df) if COMPACT else df
+
+
+def _read_industries() -> pl.DataFrame:
+    df = read_table('industry_codes')
+    return compact(df) if COMPACT else df
+
+
+geos_table = LazyTable(_read_geos)
+industries_table = LazyTable(_read_industries)
+
+
+def load_geos() -> pl.DataFrame:
+    '''
+    Get the geographic codes table, loading it on first use.
+
+    Returns:
+        DataFrame with geographic data
+    '''
+    return geos_table.get()
+
+
+def load_industries() -> pl.DataFrame:
+    '''
+    Get the industry codes table, loading it on first use.
+
+    Returns:
+        DataFrame with industry data
+    '''
+    return industries_table.get()
+
+
+def set_compact(enabled: bool) -> None:
+    '''
+    Switch the bundled tables between the standard and the compact representation.
+
+    The tables are reloaded on next use and cached lookup results are cleared. Lookup
+    results are the same in either mode.
+
+    Args:
+        enabled: Whether to use the compact representation
+    '''
+    global COMPACT
+    COMPACT = enabled
+    geos_table.reset()
+    industries_table.reset()
+    clear_cache()
+
+
+# -------------------------------------------------------------------------------------------------
+# Regenerate the binary artifacts from the CSVs
+# -------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+    for name in CSV_READERS:
+        write_artifacts(name)
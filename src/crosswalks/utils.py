@@ -0,0 +1,183 @@
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Any, Optional, Sequence, Union
+
+import polars as pl
+
+from crosswalks.compact import decode
+
+# Formats of the lookups besides Python dicts and lists
+COLUMNAR_OUTPUTS = ('polars', 'arrow', 'numpy')
+
+
+# -------------------------------------------------------------------------------------------------
+# Coerce array-like input to a Series
+# -------------------------------------------------------------------------------------------------
+
+def to_series(values: Any, name: str = '', dtype: Optional[pl.DataType] = None) -> pl.Series:
+    '''
+    Convert a Polars Series, NumPy array, list or other iterable to a Series.
+
+    Args:
+        values: Array-like input
+        name: Name of the resulting Series
+        dtype: Cast the Series to this type, turning values that cannot be cast into nulls
+
+    Returns:
+        Series with the input values
+    '''
+    if isinstance(values, pl.Series):
+        series = values.rename(name)
+    else:
+        series = pl.Series(name, values)
+
+    if dtype is not None and series.dtype != dtype:
+        series = series.cast(dtype, strict=False)
+
+    return series
+
+
+# -------------------------------------------------------------------------------------------------
+# Mapping frames and vectorized translation
+# -------------------------------------------------------------------------------------------------
+
+def mapping_frame(
+    df: pl.DataFrame,
+    from_col: str,
+    to_col: Union[str, Sequence[str]]
+) -> pl.DataFrame:
+    '''
+    Build a mapping table with one row per `from_col` value.
+
+    Duplicate keys resolve the same way as the dict-returning lookups: the rows are
+    sorted and the last row per key is kept. Like the dicts, the table keeps a row for
+    a null key (e.g., the counties outside any CBSA).
+
+    Args:
+        df: DataFrame already filtered to the rows to map
+        from_col: Source column
+        to_col: Target column or list of target columns
+
+    Returns:
+        DataFrame with `from_col` followed by the target columns
+    '''
+    to_cols = [to_col] if isinstance(to_col, str) else list(to_col)
+
+    return (
+        df
+        .select(from_col, *to_cols)
+        .pipe(decode)
+        .sort(from_col, *to_cols)
+        .unique(subset=from_col, keep='last', maintain_order=True)
+    )
+
+
+def translate(values: Any, mapping: pl.DataFrame) -> pl.Series:
+    '''
+    Translate values through a two-column mapping table in one vectorized join.
+
+    Args:
+        values: Array-like input
+        mapping: DataFrame with the key column first and the value column second
+
+    Returns:
+        Series named after the value column, aligned with `values`, null where a value
+        is null or not a key of the mapping (a null value never matches the null key)
+    '''
+    key, value = mapping.columns
+    series = to_series(values, key, mapping.schema[key])
+
+    return (
+        series
+        .to_frame()
+        .join(
+            mapping,
+            how='left',
+            on=key,
+            maintain_order='left'
+        )
+        .get_column(value)
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Columnar result formats
+# -------------------------------------------------------------------------------------------------
+
+def numpy_array(series: pl.Series) -> Any:
+    '''
+    Convert a Series to a read-only NumPy array without a Python object per value.
+
+    Numeric columns share their buffer with the Series where Polars can (no nulls);
+    otherwise they are copied, nulls becoming NaN. NumPy has no layout for
+    variable-length strings that could share Arrow buffers, so string columns are
+    packed in bulk into a fixed-width unicode array; nulls become ''.
+
+    Args:
+        series: Series to convert
+
+    Returns:
+        NumPy array with the values of `series`
+    '''
+    import numpy as np  # optional dependency, only needed for output='numpy'
+
+    if series.dtype != pl.Utf8:
+        # A copy (e.g., a column with nulls) is writeable, and the result is cached
+        array = series.to_numpy()
+        array.flags.writeable = False
+        return array
+
+    text = series.fill_null('')
+    lengths = text.str.len_chars().cast(pl.Int64).to_numpy()
+    width = max(int(lengths.max()) if len(lengths) else 0, 1)
+
+    # One string for the whole column, encoded as UTF-32 code points, then scattered
+    # into the leading cells of each row of an (n, width) grid
+    joined = text.str.join('').item()
+    chars = np.frombuffer(joined.encode('utf-32-le'), dtype=np.uint32)
+    grid = np.zeros((len(text), width), dtype=np.uint32)
+    grid[np.arange(width) < lengths[:, None]] = chars
+
+    array = grid.view(f'<U{width}').reshape(len(text))
+    array.flags.writeable = False
+    return array
+
+
+def frame_output(frame: pl.DataFrame, output: str) -> Any:
+    '''
+    Convert a result DataFrame to a columnar output format.
+
+    Args:
+        frame: Result of a lookup
+        output: 'polars' for the DataFrame itself, 'arrow' for a pyarrow Table, 'numpy'
+            for a dict of NumPy arrays keyed on column name
+
+    Returns:
+        The result in the requested format
+    '''
+    if output == 'arrow':
+        return frame.to_arrow()
+    if output == 'numpy':
+        return {series.name: numpy_array(series) for series in frame.get_columns()}
+    return frame
+
+
+def series_output(series: pl.Series, output: str) -> Any:
+    '''
+    Convert a result Series to a columnar output format.
+
+    Args:
+        series: Result of a lookup
+        output: 'polars' for the Series itself, 'arrow' for a pyarrow Array, 'numpy'
+            for a NumPy array
+
+    Returns:
+        The result in the requested format
+    '''
+    if output == 'arrow':
+        return series.to_arrow()
+    if output == 'numpy':
+        return numpy_array(series)
+    return series
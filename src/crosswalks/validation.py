@@ -0,0 +1,167 @@
+'''
+Vectorized validation of columns of area and industry codes.
+
+A column of codes is checked against one vintage with a single hashed membership test.
+The distinct invalid codes are counted, and each is matched against every vintage to
+find the nearest one where it is valid; the vintage where most of the column is valid
+is suggested as a whole.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Any, NamedTuple, Optional
+
+import polars as pl
+
+from crosswalks.cache import cached
+from crosswalks.compact import decode
+from crosswalks.geographic_codes import DEFAULT_YEAR as DEFAULT_AREA_YEAR
+from crosswalks.geographic_codes import AreaField
+from crosswalks.industry_codes import DEFAULT_SURVEY, IndustryField, Survey
+from crosswalks.industry_codes import DEFAULT_YEAR as DEFAULT_INDUSTRY_YEAR
+from crosswalks.instrument import instrumented
+from crosswalks.surveys import survey_bits, survey_membership
+from crosswalks.tables import load_geos, load_industries
+from crosswalks.utils import to_series
+
+
+class ValidationReport(NamedTuple):
+    '''
+    Result of validating a column of codes against one vintage.
+    '''
+    mask: pl.Series
+    invalid: pl.DataFrame
+    suggested_year: Optional[int]
+
+
+# -------------------------------------------------------------------------------------------------
+# Codes of every vintage
+# -------------------------------------------------------------------------------------------------
+
+@cached(geo_df=load_geos)
+def _area_vintages(area: AreaField, geo_df: Optional[pl.DataFrame] = None) -> pl.DataFrame:
+    return (
+        geo_df
+        .select('year', area)
+        .pipe(decode)
+        .rename({area: 'code'})
+        .drop_nulls()
+        .unique()
+        .sort('year', 'code')
+    )
+
+
+@cached(industry_df=load_industries)
+def _industry_vintages(
+    industry: IndustryField,
+    survey: Survey,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    # Read from the survey bitmasks of the level rather than another pass over the table
+    return (
+        survey_membership(industry, industry_df)
+        .filter((pl.col('surveys') & survey_bits(survey)) != 0)
+        .select('year', 'code')
+    )
+
+
+def _validate(values: Any, vintages: pl.DataFrame, year: int) -> ValidationReport:
+    vintages = vintages.with_columns(pl.col('year').cast(pl.Int64))
+    codes = to_series(values, 'code', vintages.schema['code'])
+
+    valid = vintages.filter(pl.col('year') == year).get_column('code')
+    mask = codes.is_in(valid.implode()).fill_null(False).rename('valid')
+
+    def closest(df: pl.DataFrame) -> pl.DataFrame:
+        # Order candidate vintages by distance to `year`, the earlier one first on ties
+        return df.sort((pl.col('year') - year).abs(), 'year')
+
+    # Everything below works on the distinct codes, not on every row
+    counts = codes.value_counts(name='count')
+
+    invalid = counts.filter(~pl.col('code').is_in(valid.implode()).fill_null(False))
+    nearest = (
+        invalid
+        .join(vintages, how='inner', on='code')
+        .pipe(closest)
+        .unique(subset='code', keep='first')
+        .select('code', nearest_year='year')
+    )
+    invalid = (
+        invalid
+        .join(nearest, how='left', on='code')
+        .sort('count', 'code', descending=[True, False], nulls_last=True)
+    )
+
+    coverage = (
+        counts
+        .join(vintages, how='inner', on='code')
+        .group_by('year')
+        .agg(pl.col('count').sum())
+        .pipe(closest)
+        .sort('count', descending=True, maintain_order=True)
+    )
+    suggested_year = coverage.item(0, 'year') if coverage.height else None
+
+    return ValidationReport(mask, invalid, suggested_year)
+
+
+# -------------------------------------------------------------------------------------------------
+# Batch validators
+# -------------------------------------------------------------------------------------------------
+
+@instrumented
+def validate_area(
+    values: Any,
+    area: AreaField,
+    year: int = DEFAULT_AREA_YEAR,
+    geo_df: Optional[pl.DataFrame] = None
+) -> ValidationReport:
+
+    '''
+    Validate a column of area codes against one vintage.
+
+    Args:
+        values: Polars Series, NumPy array or list of area codes
+        area: Area type of the codes (e.g., 'county_fips', 'cbsa_code')
+        year: Year for geographic definitions (default: 2023)
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        ValidationReport with a boolean `mask` aligned with `values`, the distinct
+        `invalid` codes with their 'count' and the 'nearest_year' where each is valid
+        (null if none), and the `suggested_year` where the most values are valid
+    '''
+
+    return _validate(values, _area_vintages(area, geo_df), year)
+
+
+@instrumented
+def validate_industry(
+    values: Any,
+    industry: IndustryField,
+    survey: Survey = DEFAULT_SURVEY,
+    year: int = DEFAULT_INDUSTRY_YEAR,
+    industry_df: Optional[pl.DataFrame] = None
+) -> ValidationReport:
+
+    '''
+    Validate a column of industry codes against one vintage and survey.
+
+    Args:
+        values: Polars Series, NumPy array or list of industry codes
+        industry: Industry level of the codes (e.g., 'detailed_industry', 'sector')
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        year: Year for industry definitions (default: 2023)
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        ValidationReport with a boolean `mask` aligned with `values`, the distinct
+        `invalid` codes with their 'count' and the 'nearest_year' where each is valid
+        (null if none), and the `suggested_year` where the most values are valid
+    '''
+
+    return _validate(values, _industry_vintages(industry, survey, industry_df), year)
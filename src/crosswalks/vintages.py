@@ -0,0 +1,273 @@
+'''
+Cross-vintage crosswalks.
+
+A bridge is a sparse many-to-many table (from_code, to_code, weight) that translates
+codes of one vintage into codes of another, with the weights of each from_code summing
+to one. Area bridges go through counties, e.g. 2003 MSAs to 2023 CBSAs; industry bridges
+go between NAICS vintages, e.g. 2017 to 2022. `apply_bridge` reallocates a fact table
+with one join and one aggregation.
+'''
+
+# -------------------------------------------------------------------------------------------------
+# Imports and parameters
+# -------------------------------------------------------------------------------------------------
+
+from typing import Optional, Sequence, TypeVar, Union
+
+import polars as pl
+
+from crosswalks.cache import cached
+from crosswalks.compact import CODE_WIDTHS, decode
+from crosswalks.geographic_codes import AreaField
+from crosswalks.index import survey_slice, year_slice
+from crosswalks.industry_codes import DEFAULT_SURVEY, Survey
+from crosswalks.naics import LEVELS
+from crosswalks.tables import load_geos, load_industries
+
+Frame = TypeVar('Frame', pl.DataFrame, pl.LazyFrame)
+
+BRIDGE_SCHEMA = {
+    'from_code': pl.Utf8,
+    'to_code': pl.Utf8,
+    'weight': pl.Float64,
+    'match': pl.Utf8,
+}
+
+
+def _normalize(pairs: pl.DataFrame) -> pl.DataFrame:
+    # Scale the weights of each from_code so that they sum to one; a from_code whose
+    # weights sum to zero (e.g., none of its counties has a weight) is split by its
+    # number of pairs instead, as if it had no weights
+    total = pl.col('weight').sum().over('from_code')
+    return (
+        pairs
+        .group_by('from_code', 'to_code', 'match')
+        .agg(pl.col('weight').sum(), count=pl.len())
+        .with_columns(
+            weight=(
+                pl.when(total > 0)
+                  .then(pl.col('weight') / total)
+                  .otherwise(pl.col('count') / pl.col('count').sum().over('from_code'))
+            )
+        )
+        .select(BRIDGE_SCHEMA.keys())
+        .cast(BRIDGE_SCHEMA)
+        .sort('from_code', 'to_code', nulls_last=True)
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Area bridges (through counties)
+# -------------------------------------------------------------------------------------------------
+
+@cached(geo_df=load_geos)
+def area_bridge(
+    from_area: AreaField,
+    to_area: AreaField,
+    from_year: int,
+    to_year: int,
+    weights: Optional[pl.DataFrame] = None,
+    geo_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Build a bridge between two area fields of two vintages through their counties.
+
+    Each county of from_year links its from_area code to the to_area code of the same
+    county in to_year. Without weights every county counts equally; with weights the
+    allocation follows them (e.g., county employment). Counties missing from `weights`
+    count as zero, and a from_area code none of whose counties has a weight falls back
+    to counting every county equally.
+
+    Args:
+        from_area: Source area (e.g., 'msa_code')
+        to_area: Target area (e.g., 'cbsa_code')
+        from_year: Year of the source definitions (e.g., 2003)
+        to_year: Year of the target definitions (e.g., 2023)
+        weights: Optional DataFrame with columns 'county_fips' and 'weight'
+        geo_df: DataFrame with geographic data (default: the bundled table)
+
+    Returns:
+        DataFrame with columns 'from_code', 'to_code' (null where the county has no
+        to_area), 'weight' and 'match' ('county')
+    '''
+
+    source = (
+        year_slice(geo_df, from_year)
+        .select('county_fips', from_code=pl.col(from_area))
+        .pipe(decode)
+    )
+    target = (
+        year_slice(geo_df, to_year)
+        .select('county_fips', to_code=pl.col(to_area))
+        .pipe(decode)
+    )
+
+    pairs = source.join(target, how='left', on='county_fips')
+    if weights is None:
+        pairs = pairs.with_columns(weight=pl.lit(1.0))
+    else:
+        pairs = pairs.join(weights.select('county_fips', 'weight'), how='left', on='county_fips')
+
+    return (
+        pairs
+        .drop_nulls('from_code')
+        .with_columns(
+            weight=pl.col('weight').cast(pl.Float64).fill_null(0.0),
+            match=pl.lit('county')
+        )
+        .pipe(_normalize)
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Industry bridges (between NAICS vintages)
+# -------------------------------------------------------------------------------------------------
+
+@cached(industry_df=load_industries)
+def industry_bridge(
+    from_year: int,
+    to_year: int,
+    level: str = 'detailed_industry',
+    survey: Survey = DEFAULT_SURVEY,
+    concordance: Optional[pl.DataFrame] = None,
+    industry_df: Optional[pl.DataFrame] = None
+) -> pl.DataFrame:
+
+    '''
+    Build a bridge between the codes of one industry level in two NAICS vintages.
+
+    With a concordance (e.g., the Census NAICS 2017 to 2022 concordance) its links are
+    used as given. Without one, codes present in both vintages map to themselves and
+    every other code is split evenly across the target codes sharing its longest prefix
+    of at least two digits.
+
+    Args:
+        from_year: NAICS vintage of the source codes (e.g., 2017)
+        to_year: NAICS vintage of the target codes (e.g., 2022)
+        level: Industry level of the codes (default: 'detailed_industry')
+        survey: Survey type ('ces', 'bed', 'qcew') (default: 'ces')
+        concordance: Optional DataFrame with columns 'from_code', 'to_code' and an
+            optional 'weight'
+        industry_df: DataFrame with industry data (default: the bundled table)
+
+    Returns:
+        DataFrame with columns 'from_code', 'to_code' (null where nothing matches),
+        'weight' and 'match' ('concordance', 'exact' or 'prefix')
+    '''
+
+    if level not in LEVELS:
+        raise ValueError(f'level must be one of {LEVELS}, got {level!r}')
+
+    if concordance is not None:
+        if 'weight' not in concordance.columns:
+            concordance = concordance.with_columns(weight=pl.lit(1.0))
+        return (
+            concordance
+            .select('from_code', 'to_code', 'weight')
+            .with_columns(match=pl.lit('concordance'))
+            .pipe(_normalize)
+        )
+
+    def codes(year: int) -> pl.DataFrame:
+        return (
+            survey_slice(industry_df, year, survey)
+            .select(level)
+            .pipe(decode)
+            .unique()
+            .drop_nulls()
+        )
+
+    source = codes(from_year).rename({level: 'from_code'})
+    target = codes(to_year).rename({level: 'to_code'})
+
+    exact = (
+        source
+        .join(target, how='inner', left_on='from_code', right_on='to_code', coalesce=False)
+        .with_columns(match=pl.lit('exact'))
+    )
+    parts = [exact]
+    pending = source.join(exact, how='anti', on='from_code')
+
+    # Fall back to the target codes that share the longest prefix
+    for length in range(CODE_WIDTHS[level] - 1, 1, -1):
+        if pending.height == 0:
+            break
+        matched = (
+            pending
+            .with_columns(prefix=pl.col('from_code').str.slice(0, length))
+            .join(
+                target.with_columns(prefix=pl.col('to_code').str.slice(0, length)),
+                how='inner',
+                on='prefix'
+            )
+            .select('from_code', 'to_code', match=pl.lit('prefix'))
+        )
+        parts.append(matched)
+        pending = pending.join(matched, how='anti', on='from_code')
+
+    parts.append(pending.with_columns(to_code=pl.lit(None, pl.Utf8), match=pl.lit('prefix')))
+
+    return (
+        pl
+        .concat(parts, how='diagonal')
+        .with_columns(weight=pl.lit(1.0))
+        .pipe(_normalize)
+    )
+
+
+# -------------------------------------------------------------------------------------------------
+# Apply a bridge to a fact table
+# -------------------------------------------------------------------------------------------------
+
+def apply_bridge(
+    data: Frame,
+    bridge: pl.DataFrame,
+    on: str,
+    values: Union[str, Sequence[str]],
+    by: Sequence[str] = ()
+) -> Frame:
+
+    '''
+    Reallocate a fact table from the source codes of a bridge to its target codes.
+
+    Every row is split across the target codes of its source code, the value columns are
+    multiplied by the bridge weights and summed by target code (and `by`). Rows whose
+    source code is not in the bridge are kept whole under a null target code, next to
+    the shares the bridge itself maps to null, so the totals of `values` are conserved.
+    Runs lazily when given a LazyFrame.
+
+    Args:
+        data: DataFrame or LazyFrame with the facts
+        bridge: Bridge from `area_bridge` or `industry_bridge`
+        on: Column of `data` holding the source codes; the output holds the target codes
+            under the same name
+        values: Additive value column or columns to reallocate (e.g., 'employment')
+        by: Other columns to keep in the grouping (e.g., ['year', 'naics'])
+
+    Returns:
+        Frame of the same kind as `data` with columns `by`, `on` (null for the values
+        left without a target code) and `values`
+    '''
+
+    values = [values] if isinstance(values, str) else list(values)
+
+    result = (
+        data
+        .lazy()
+        .join(
+            bridge.lazy().select('from_code', 'to_code', 'weight'),
+            how='left',
+            left_on=on,
+            right_on='from_code'
+        )
+        .with_columns(
+            pl.col(values) * pl.col('weight').fill_null(1.0)
+        )
+        .group_by(*by, 'to_code')
+        .agg(pl.col(values).sum())
+        .rename({'to_code': on})
+        .select(*by, on, *values)
+    )
+
+    return result.collect() if isinstance(data, pl.DataFrame) else result
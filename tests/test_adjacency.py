@@ -0,0 +1,37 @@
+import polars as pl
+
+from crosswalks.adjacency import area_children, industry_children
+
+
+def test_children_degree_and_expand():
+    cbsa = area_children('cbsa_code', 'county_fips')
+    assert cbsa.children('31080') == ('06037', '06059')
+    assert cbsa.children('00000') == ()
+    assert '31080' in cbsa
+
+    assert cbsa.degree(['31080', '00000', None]).to_list() == [2, 0, 0]
+    pairs = cbsa.expand(['31080', '00000', '31080'])
+    assert pairs.columns == ['cbsa_code', 'county_fips']
+    assert pairs.get_column('county_fips').to_list() == ['06037', '06059', '06037', '06059']
+
+    offsets = cbsa.offsets
+    assert offsets.len() == len(cbsa) + 1
+    assert offsets[0] == 0
+    assert offsets[-1] == cbsa.values.len()
+
+
+def test_arrays_cannot_corrupt_the_shared_adjacency():
+    sectors = industry_children('sector', 'detailed_industry', survey='qcew', year=2022)
+    children = sectors.children('54')
+    degree = sectors.degree(['54']).to_list()
+
+    sectors.keys.scatter(0, 'xx')
+    sectors.values.scatter(list(range(10)), '000000')
+    offsets = sectors.offsets
+    offsets += 1
+
+    again = industry_children('sector', 'detailed_industry', survey='qcew', year=2022)
+    assert again.children('54') == children
+    assert again.degree(['54']).to_list() == degree
+    assert again.keys[0] == '11'
+    assert isinstance(again.values, pl.Series)
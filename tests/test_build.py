@@ -0,0 +1,42 @@
+import polars as pl
+import pytest
+
+from crosswalks.industry_codes import get_industry
+from crosswalks.tables import load_industries
+
+NAME_FIELDS = [
+    'domain_name', 'supersector_name', 'sector_name', 'subsector_name',
+    'industry_group_name', 'naics_industry_name', 'detailed_industry_name'
+]
+
+
+@pytest.mark.parametrize('level, code, year, title', [
+    # Titles of the baseline table, each from its own vintage
+    ('subsector', '112', 2007, 'Animal Production'),
+    ('detailed_industry', '111150', 2022, 'Corn Farming'),
+    ('detailed_industry', '721310', 2012, 'Rooming and Boarding Houses'),
+    ('detailed_industry', '311221', 2017, 'Wet Corn Milling'),
+    # Retitled in a later vintage
+    ('subsector', '112', 2022, 'Animal Production and Aquaculture'),
+    ('detailed_industry', '311221', 2022, 'Wet Corn Milling and Starch Manufacturing'),
+    # Not listed in the 2022 sheet, titled from the latest vintage that has it
+    ('sector', '31', 2022, 'Manufacturing'),
+])
+def test_titles_per_vintage(level, code, year, title):
+    assert get_industry(level, survey='qcew', year=year)[code] == title
+
+
+def test_titles_are_stripped():
+    df = load_industries()
+    padded = df.select(
+        (pl.col(field) != pl.col(field).str.strip_chars()).sum() for field in NAME_FIELDS
+    )
+    assert padded.sum_horizontal().item() == 0
+
+
+def test_one_title_per_code_and_year():
+    df = load_industries()
+    for field in NAME_FIELDS:
+        code = field.removesuffix('_name')
+        titles = df.group_by('year', code).agg(pl.col(field).n_unique())
+        assert titles.get_column(field).max() == 1
@@ -0,0 +1,85 @@
+import numpy as np
+import polars as pl
+import pytest
+
+from crosswalks.cache import CacheInfo, MappingCache, cache_info
+from crosswalks.geographic_codes import get_area, translate_area, valid_area
+from crosswalks.tables import load_geos
+
+
+def test_polars_results_are_copies():
+    states = get_area('state', output='polars')
+    names = states.get_column('state_name').to_list()
+    states.drop_in_place('state_name')
+
+    assert get_area('state', output='polars').get_column('state_name').to_list() == names
+    assert translate_area(['01', '06'], 'state_fips', 'state_name').to_list() == [
+        'Alabama', 'California'
+    ]
+
+    codes = valid_area('state_fips', output='polars')
+    expected = codes.to_list()
+    codes.append(codes)
+
+    assert valid_area('state_fips', output='polars').to_list() == expected
+
+
+def test_numpy_results_are_read_only():
+    # With a null, Polars copies the column instead of sharing its buffer
+    geo_df = load_geos().with_columns(
+        metro=pl.when(pl.col('county_fips') == '01001').then(None).otherwise(pl.col('metro'))
+    )
+    metro = valid_area('metro', geo_df=geo_df, output='numpy')
+    expected = metro.copy()
+    with pytest.raises(ValueError):
+        metro[0] = 99
+
+    again = valid_area('metro', geo_df=geo_df, output='numpy')
+    assert np.array_equal(again, expected, equal_nan=True)
+
+    columns = get_area('state', output='numpy')
+    with pytest.raises(ValueError):
+        columns['state_fips'][0] = '99'
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    cache = MappingCache(maxsize=2)
+    frame = pl.DataFrame({'a': [1]})
+    cache.put('a', (frame,), 1)
+    cache.put('b', (frame,), 2)
+    assert cache.get('a', (frame,)) == (True, 1)
+
+    cache.put('c', (frame,), 3)
+    assert cache.get('b', (frame,)) == (False, None)
+    assert cache.get('a', (frame,)) == (True, 1)
+    assert cache.info() == CacheInfo(hits=2, misses=1, evictions=1, maxsize=2, currsize=2)
+
+    cache.resize(0)
+    cache.put('d', (frame,), 4)
+    assert cache.info().currsize == 0
+
+
+def test_entries_are_tied_to_their_frames():
+    cache = MappingCache()
+    frame = pl.DataFrame({'a': [1]})
+    cache.put('key', (frame,), 'value')
+    assert cache.get('key', (frame,)) == (True, 'value')
+
+    # Another frame under the same key (e.g., one that reused the id) is never served
+    assert cache.get('key', (pl.DataFrame({'a': [2]}),)) == (False, None)
+    assert cache.info().currsize == 0
+
+
+def test_lookups_are_keyed_on_the_frame_and_read_only():
+    geos = load_geos()
+    alabama = geos.filter(pl.col('state_fips') == '01')
+    california = geos.filter(pl.col('state_fips') == '06')
+    assert dict(get_area('state', geo_df=alabama)) == {'01': 'Alabama'}
+    assert dict(get_area('state', geo_df=california)) == {'06': 'California'}
+
+    hits = cache_info().hits
+    states = get_area('state', geo_df=alabama)
+    assert cache_info().hits == hits + 1
+    with pytest.raises(TypeError):
+        states['99'] = 'Nowhere'
+    assert isinstance(valid_area('state_fips', geo_df=alabama), tuple)
@@ -0,0 +1,33 @@
+import polars as pl
+
+from crosswalks.compact import compact, decode
+from crosswalks.geographic_codes import area_mapping, valid_area
+from crosswalks.industry_codes import get_industry
+from crosswalks.tables import load_geos, load_industries, set_compact
+
+
+def test_compact_round_trip():
+    for df in (load_geos(), load_industries()):
+        compacted = compact(df)
+        assert compacted.schema['year'] == pl.UInt16
+        assert decode(compacted).equals(df)
+
+    geos = compact(load_geos())
+    assert geos.schema['county_fips'] == pl.UInt32
+    assert isinstance(geos.schema['county_name'], pl.Enum)
+
+
+def test_lookups_agree_in_compact_mode():
+    def lookups():
+        return (
+            dict(area_mapping('county_fips', ['state_fips', 'cbsa_code'])),
+            valid_area('csa_code'),
+            dict(get_industry('detailed_industry', survey='qcew', year=2022)),
+        )
+
+    expected = lookups()
+    set_compact(True)
+    try:
+        assert lookups() == expected
+    finally:
+        set_compact(False)
@@ -0,0 +1,52 @@
+import polars as pl
+
+from crosswalks.diff import affected, area_diff, industry_diff
+
+
+def _rows(changes: pl.DataFrame, change: str) -> set:
+    return set(
+        changes
+        .filter(pl.col('change') == change)
+        .select('key', 'field', 'before', 'after')
+        .iter_rows()
+    )
+
+
+def test_industry_retitles_on_bundled_table():
+    changes = industry_diff('detailed_industry', 2012, 2017, survey='qcew')
+    assert (
+        '721310',
+        'detailed_industry_name',
+        'Rooming and Boarding Houses',
+        "Rooming and Boarding Houses, Dormitories, and Workers' Camps",
+    ) in _rows(changes, 'retitled')
+
+    changes = industry_diff('detailed_industry', 2017, 2022, survey='qcew')
+    assert (
+        '311221',
+        'detailed_industry_name',
+        'Wet Corn Milling',
+        'Wet Corn Milling and Starch Manufacturing',
+    ) in _rows(changes, 'retitled')
+
+
+def test_industry_retitles_higher_levels():
+    changes = industry_diff('subsector', 2017, 2022, survey='qcew')
+    assert (
+        '445', 'subsector_name', 'Food and Beverage Stores', 'Food and Beverage Retailers'
+    ) in _rows(changes, 'retitled')
+
+
+def test_removed_industry_lists_parents():
+    changes = industry_diff('detailed_industry', 2017, 2022, survey='qcew')
+    removed = changes.filter(pl.col('key') == '212111')
+    assert set(removed.get_column('change')) == {'removed'}
+    assert '21' in affected(changes, 'sector')
+
+
+def test_area_diff_on_bundled_table():
+    changes = area_diff('cbsa_code', 2013, 2023)
+    assert (
+        '10380', 'cbsa_title', 'Aguadilla-Isabela, PR', 'Aguadilla, PR'
+    ) in _rows(changes, 'retitled')
+    assert changes.schema['change'] == pl.Enum(['added', 'removed', 'reparented', 'retitled'])
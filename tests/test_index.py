@@ -0,0 +1,33 @@
+import polars as pl
+import pytest
+
+from crosswalks.index import survey_slice, table_index, year_slice
+from crosswalks.tables import load_industries
+
+
+def test_slices_match_filters():
+    # Shuffled, so the index has to sort the table first
+    industries = load_industries().sample(fraction=1.0, shuffle=True, seed=0)
+    index = table_index(industries)
+    assert index is table_index(industries)
+    assert index.years == sorted(industries.get_column('year').unique())
+
+    for year in index.years:
+        expected = industries.filter(pl.col('year') == year)
+        assert year_slice(industries, year).sort(pl.all()).equals(expected.sort(pl.all()))
+        for survey in ('ces', 'bed', 'qcew'):
+            expected_survey = expected.filter(pl.col(survey))
+            assert survey_slice(industries, year, survey).sort(pl.all()).equals(
+                expected_survey.sort(pl.all())
+            )
+
+
+def test_missing_year_and_unknown_survey():
+    industries = load_industries()
+    empty = year_slice(industries, 1900)
+    assert empty.height == 0
+    assert empty.schema == industries.schema
+    assert survey_slice(industries, 1900, 'qcew').height == 0
+
+    with pytest.raises(ValueError, match='survey must be one of'):
+        survey_slice(industries, 2022, 'cps')
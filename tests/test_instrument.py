@@ -0,0 +1,49 @@
+import pytest
+
+from crosswalks import clear_cache, instrument
+from crosswalks.geographic_codes import area_mapping, get_area, valid_area_set
+
+
+@pytest.fixture
+def records():
+    records = []
+    clear_cache()
+    instrument.reset()
+    instrument.enable()
+    instrument.set_callback(records.append)
+    yield records
+    instrument.set_callback(None)
+    instrument.disable()
+    instrument.reset()
+
+
+def test_calls_rows_and_cache_hits_are_recorded(records):
+    states = get_area('state')
+    get_area('state')
+
+    stats = instrument.snapshot()['geographic_codes.get_area']
+    assert stats.calls == 2
+    assert (stats.cache_hits, stats.cache_misses, stats.hit_rate) == (1, 1, 0.5)
+    assert stats.result_size == 2 * len(states)
+    assert stats.rows_scanned > 0
+    assert 0 < stats.p50_seconds <= stats.max_seconds <= stats.total_seconds
+
+    assert [record.function for record in records] == ['geographic_codes.get_area'] * 2
+    assert records[1].rows_scanned == 0
+
+
+def test_nested_calls_count_towards_their_caller(records):
+    valid_area_set('state_fips')
+    stats = instrument.snapshot()
+    outer = stats['geographic_codes.valid_area_set']
+    inner = stats['geographic_codes.valid_area']
+    assert inner.calls == 1
+    assert outer.rows_scanned == inner.rows_scanned > 0
+    assert outer.cache_misses == inner.cache_misses + 1
+
+
+def test_disabled_calls_are_not_recorded():
+    instrument.reset()
+    assert not instrument.is_enabled()
+    area_mapping('state_fips', 'region')
+    assert instrument.snapshot() == {}
@@ -0,0 +1,41 @@
+import polars as pl
+
+from crosswalks.geographic_codes import area_mapping, get_area, translate_area
+from crosswalks.industry_codes import industry_mapping
+
+
+def test_dict_and_polars_outputs_agree():
+    local = area_mapping('cbsa_code', 'csa_code')
+    frame = area_mapping('cbsa_code', 'csa_code', output='polars')
+    assert None in local
+    assert dict(frame.iter_rows()) == dict(local)
+
+    local = area_mapping('county_fips', ['cbsa_code', 'csa_code'])
+    frame = area_mapping('county_fips', ['cbsa_code', 'csa_code'], output='polars')
+    assert {row[0]: row[1:] for row in frame.iter_rows()} == dict(local)
+
+    frame = area_mapping('cbsa_code', ['state_abbr', 'csa_code'], output='polars')
+    assert frame.get_column('cbsa_code').null_count() == 1
+    assert set(area_mapping('cbsa_code', ['state_abbr', 'csa_code'])) == set(
+        frame.get_column('cbsa_code')
+    )
+
+    assert dict(get_area('cbsa', output='polars').iter_rows()) == dict(get_area('cbsa'))
+
+    local = industry_mapping('detailed_industry', 'sector', survey='qcew', year=2022)
+    frame = industry_mapping('detailed_industry', 'sector', survey='qcew', year=2022, output='polars')
+    assert dict(frame.iter_rows()) == dict(local)
+
+
+def test_translate_is_aligned_with_its_input():
+    counties = pl.Series(['01003', None, '99999', '01001', '01003'])
+    cbsas = translate_area(counties, 'county_fips', 'cbsa_code')
+    assert cbsas.name == 'cbsa_code'
+    assert cbsas.to_list() == ['19300', None, None, '33860', '19300']
+
+    # A null value stays null rather than taking the value of the null key
+    assert translate_area([None, '10380'], 'cbsa_code', 'state_abbr').to_list() == [None, 'PR']
+    expr = pl.DataFrame({'cbsa_code': [None, '10380']}).select(
+        pl.col('cbsa_code').crosswalk.area('state_abbr')
+    )
+    assert expr.get_column('state_abbr').to_list() == [None, 'PR']
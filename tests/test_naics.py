@@ -0,0 +1,34 @@
+import polars as pl
+
+from crosswalks.naics import LINEAGE_FIELDS, naics_lineage, naics_lineage_batch
+
+
+def test_lineage_of_codes_of_any_length():
+    group = naics_lineage('5415', survey='qcew', year=2022)
+    assert group['level'] == 'industry_group'
+    assert (group['sector'], group['subsector'], group['industry_group']) == ('54', '541', '5415')
+    assert group['supersector'] == '60'
+    assert 'naics_industry' not in group
+
+    detailed = naics_lineage('541511', survey='qcew', year=2022)
+    assert detailed['level'] == 'detailed_industry'
+    assert detailed['detailed_industry_name'] == 'Custom Computer Programming Services'
+
+    assert naics_lineage('31-33', survey='qcew', year=2022)['sector_name'] == 'Manufacturing'
+    assert naics_lineage('5', survey='qcew', year=2022) is None
+    assert naics_lineage('000000', survey='qcew', year=2022) is None
+
+
+def test_batch_agrees_with_the_trie():
+    codes = ['54', '5415', '31-33', '541511', '000000', '5415']
+    batch = naics_lineage_batch(codes, survey='qcew', year=2022)
+    assert batch.get_column('code').to_list() == codes
+    assert batch.columns == ['code', 'level', *LINEAGE_FIELDS]
+
+    for code, row in zip(codes, batch.iter_rows(named=True)):
+        lineage = naics_lineage(code, survey='qcew', year=2022)
+        if lineage is None:
+            assert row['level'] is None
+        else:
+            assert {k: v for k, v in row.items() if k != 'code' and v is not None} == dict(lineage)
+    assert batch.filter(pl.col('level').is_null()).height == 1
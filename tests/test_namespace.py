@@ -0,0 +1,29 @@
+import polars as pl
+
+import crosswalks  # noqa: F401  (registers the namespaces)
+
+
+def test_frame_and_expression_agree_on_numeric_codes():
+    df = pl.DataFrame({'cbsa_code': [10380, 99999, None]})
+
+    joined = df.crosswalk.join_area('cbsa_code', ['cbsa_title'])
+    translated = df.select(pl.col('cbsa_code').crosswalk.area('cbsa_title'))
+    assert joined.get_column('cbsa_code').to_list() == ['10380', '99999', None]
+    assert joined.get_column('cbsa_title').to_list() == ['Aguadilla, PR', None, None]
+    assert translated.get_column('cbsa_title').equals(joined.get_column('cbsa_title'))
+
+
+def test_lazy_join_keeps_rows_and_order():
+    lf = pl.LazyFrame({
+        'naics': ['541511', '000000', '111110', '541511'],
+        'employment': [10, 20, 30, 40],
+    })
+    result = lf.crosswalk.join_industry(
+        'naics', ['sector', 'sector_name'], survey='qcew', year=2022
+    )
+    assert isinstance(result, pl.LazyFrame)
+
+    df = result.collect()
+    assert df.columns == ['naics', 'employment', 'sector', 'sector_name']
+    assert df.get_column('employment').to_list() == [10, 20, 30, 40]
+    assert df.get_column('sector').to_list() == ['54', None, '11', '54']
@@ -0,0 +1,43 @@
+import polars as pl
+
+from crosswalks.normalize import (
+    area_code, county_fips, industry_code, normalize_area, normalize_industry
+)
+
+
+def test_normalize_area_codes():
+    result = normalize_area([1001, '6037', ' 01003 ', None, 1001], 'county_fips')
+    assert result.values.name == 'county_fips'
+    assert result.values.to_list() == ['01001', '06037', '01003', None, '01001']
+    assert result.changes.rows() == [('1001', '01001', 2), (' 01003 ', '01003', 1), ('6037', '06037', 1)]
+
+    # MSA codes follow the form of the target vintage
+    msas = ['C3386', '33860', '3386']
+    assert normalize_area(msas, 'msa_code', year=2003).values.to_list() == ['C3386'] * 3
+    assert normalize_area(msas, 'msa_code', year=2023).values.to_list() == ['33860'] * 3
+
+
+def test_normalize_industry_codes():
+    result = normalize_industry(['541511.0', '541511', 541511.0], 'detailed_industry')
+    assert result.values.to_list() == ['541511'] * 3
+
+    sectors = normalize_industry(['31-33', '32', '54', '44-45', ''], 'sector').values
+    assert sectors.to_list() == ['31', '31', '54', '44', None]
+    assert normalize_industry([7, '60'], 'supersector').values.to_list() == ['07', '60']
+
+
+def test_expressions_run_in_lazy_queries():
+    lf = pl.LazyFrame({
+        'state': [1, 6],
+        'county': ['1', '37'],
+        'msa': ['C3386', '3386'],
+        'naics_sector': ['31-33', '52'],
+    })
+    result = lf.with_columns(
+        county_fips('state', 'county'),
+        area_code('msa', 'msa_code', year=2023),
+        industry_code('naics_sector', 'sector'),
+    ).collect()
+    assert result.get_column('county_fips').to_list() == ['01001', '06037']
+    assert result.get_column('msa_code').to_list() == ['33860', '33860']
+    assert result.get_column('sector').to_list() == ['31', '52']
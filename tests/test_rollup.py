@@ -0,0 +1,57 @@
+import polars as pl
+import pytest
+
+from crosswalks.rollup import rollup
+
+
+def test_rollup_matches_direct_aggregation():
+    facts = pl.DataFrame({
+        'year': [2022] * 6 + [2023] * 2,
+        'county_fips': ['01001', '01003', '06037', '06059', '01001', '12086', '01001', '06037'],
+        'detailed_industry': ['541511', '541511', '541512', '111110', '111110', '541511', '541511', '111110'],
+        'employment': [1, 2, 3, 4, 5, 6, 7, 8],
+    })
+    area_levels = ['county_fips', 'state_fips', 'region', 'cbsa_code']
+    industry_levels = ['detailed_industry', 'sector', 'domain']
+
+    result = rollup(
+        facts, 'employment', area_levels=area_levels, industry_levels=industry_levels,
+        by=['year'], survey='qcew', industry_year=2022
+    )
+
+    enriched = (
+        facts
+        .crosswalk.join_area('county_fips', ['state_fips', 'region', 'cbsa_code'])
+        .crosswalk.join_industry('detailed_industry', ['sector', 'domain'], survey='qcew', year=2022)
+    )
+    expected = pl.concat([
+        enriched
+        .drop_nulls([area, industry])
+        .group_by('year', area, industry)
+        .agg(pl.col('employment').sum())
+        .select(
+            'year',
+            area_level=pl.lit(area),
+            area_code=pl.col(area),
+            industry_level=pl.lit(industry),
+            industry_code=pl.col(industry),
+            employment='employment'
+        )
+        for industry in industry_levels
+        for area in area_levels
+    ])
+    order = ['year', 'area_level', 'area_code', 'industry_level', 'industry_code']
+    assert result.sort(order).equals(expected.sort(order))
+
+    # Every level pair adds up to the same total
+    totals = result.group_by('year', 'area_level', 'industry_level').agg(pl.col('employment').sum())
+    assert set(totals.filter(pl.col('area_level') == 'region').get_column('employment')) == {21, 15}
+
+
+def test_rollup_rejects_levels_it_cannot_derive():
+    facts = pl.DataFrame({'state_fips': ['01'], 'sector': ['54'], 'employment': [1]})
+    with pytest.raises(ValueError, match='cannot be derived'):
+        rollup(
+            facts, 'employment', area_on='state_fips', industry_on='sector',
+            area_levels=['county_fips'], industry_levels=['sector']
+        )
@@ -0,0 +1,57 @@
+import polars as pl
+import pytest
+
+from crosswalks.search import (
+    normalize_text,
+    search_area,
+    search_area_batch,
+    search_industry,
+)
+
+
+def test_normalize_text_expands_and_drops_words():
+    assert normalize_text('Fairfield Cnty, CT') == 'fairfield ct'
+    assert normalize_text('St. Mary Parish, LA') == 'st mary la'
+
+
+def test_search_area_ranks_the_exact_name_first():
+    matches = search_area('Fairfield Cnty CT', k=3)
+
+    assert matches[0].field == 'county_name'
+    assert matches[0].code == '09001'
+    assert matches[0].score == 1.0
+    assert [m.score for m in matches] == sorted((m.score for m in matches), reverse=True)
+
+    # Restricting the fields only searches those names
+    states = search_area('Connecticut', k=1, fields='state_name')
+    assert [(m.field, m.code) for m in states] == [('state_name', '09')]
+
+
+def test_search_industry_matches_every_level():
+    matches = search_industry('software publishers', k=3, year=2022)
+    assert {m.code for m in matches} == {'5132', '51321', '513210'}
+    assert all(m.score == 1.0 for m in matches)
+
+    # Abbreviations are expanded before matching
+    sectors = search_industry('Mfg', k=1, fields='sector_name', year=2022)
+    assert [(m.code, m.name) for m in sectors] == [('31', 'Manufacturing')]
+
+
+def test_search_batch_keeps_query_order():
+    queries = ['Daphne-Fairhope', 'Fairfield Cnty CT', 'Daphne-Fairhope']
+    result = search_area_batch(queries, k=2)
+
+    assert result.columns == ['query', 'rank', 'field', 'code', 'name', 'score']
+    assert result.get_column('query').to_list() == [q for q in queries for _ in range(2)]
+    assert result.get_column('rank').to_list() == [1, 2] * 3
+
+    # Each batch row is the same as the single search of its query
+    for query in dict.fromkeys(queries):
+        single = search_area(query, k=2)
+        rows = result.filter(pl.col('query') == query).select('field', 'code', 'name', 'score')
+        assert rows.rows()[:2] == [tuple(m) for m in single]
+
+
+def test_search_rejects_unknown_fields():
+    with pytest.raises(ValueError, match='fields must be among'):
+        search_area('Fairfield', fields=['county_title'])
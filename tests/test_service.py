@@ -0,0 +1,55 @@
+import pytest
+import zmq
+
+from crosswalks.geographic_codes import area_mapping, get_area, valid_area
+from crosswalks.industry_codes import industry_mapping
+from crosswalks.service import LookupClient, LookupServer, ServiceError
+
+
+@pytest.fixture(scope='module')
+def server():
+    with LookupServer('tcp://127.0.0.1:*', workers=2) as server:
+        yield server
+
+
+def test_start_raises_when_address_in_use(server):
+    with pytest.raises(zmq.ZMQError):
+        LookupServer(server.address, workers=1).start()
+
+
+@pytest.fixture(scope='module')
+def client(server):
+    with LookupClient(server.address, timeout=10.0) as client:
+        yield client
+
+
+def test_mapping_round_trip_keeps_null_keys(client):
+    local = area_mapping('cbsa_code', 'csa_code')
+    assert None in local
+    assert client.area_mapping('cbsa_code', 'csa_code') == dict(local)
+
+    local = get_area('cbsa')
+    assert None in local
+    assert client.get_area('cbsa') == dict(local)
+
+
+def test_mapping_round_trip_several_targets(client):
+    local = area_mapping('county_fips', ['state_abbr', 'cbsa_code'])
+    assert client.area_mapping('county_fips', ['state_abbr', 'cbsa_code']) == dict(local)
+
+    local = industry_mapping('detailed_industry', ['sector', 'sector_name'], survey='qcew', year=2022)
+    remote = client.industry_mapping(
+        'detailed_industry', ['sector', 'sector_name'], survey='qcew', year=2022
+    )
+    assert remote == dict(local)
+    assert client.area_mapping('cbsa_code', 'csa_code', output='polars').equals(
+        area_mapping('cbsa_code', 'csa_code', output='polars')
+    )
+
+
+def test_unsupported_output_is_refused(client):
+    for output in ('arrow', 'numpy'):
+        with pytest.raises(ServiceError, match='output must be one of'):
+            client.call('get_area', area='state', output=output)
+
+    assert client.call('valid_area', area='state_fips', output='list') == valid_area('state_fips')
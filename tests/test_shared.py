@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from crosswalks import clear_cache
+from crosswalks.geographic_codes import get_area
+from crosswalks.shared import attach, publish
+from crosswalks.tables import BASE_PATH, geos_table, industries_table, load_geos
+
+
+def test_children_attach_to_published_tables(tmp_path):
+    expected = dict(get_area('county'))
+    with publish(tmp_path) as shared:
+        probe = '\n'.join([
+            'import sys',
+            'from crosswalks.geographic_codes import get_area',
+            'from crosswalks.shared import attach',
+            'tables = attach(sys.argv[1])',
+            "print(tables['geographic_codes'].get_column('year').flags['SORTED_ASC'])",
+            "print(get_area('county')['06037'])",
+        ])
+        result = subprocess.run(
+            [sys.executable, '-c', probe, str(shared.path)],
+            capture_output=True,
+            check=True,
+            env={**os.environ, 'PYTHONPATH': str(BASE_PATH / 'src')},
+            text=True
+        )
+        assert result.stdout.split('\n')[:2] == ['True', expected['06037']]
+
+    assert not shared.path.exists()
+    with pytest.raises(ValueError, match='no published tables'):
+        attach(shared.path)
+
+
+def test_attach_installs_the_tables_in_this_process(tmp_path):
+    expected = dict(get_area('county'))
+    geos = load_geos()
+    try:
+        with publish(tmp_path) as shared:
+            attached = attach(shared.path)
+            clear_cache()
+            assert load_geos() is attached['geographic_codes']
+            assert attached['geographic_codes'].sort('year', maintain_order=True).equals(
+                geos.sort('year', maintain_order=True)
+            )
+            assert dict(get_area('county')) == expected
+    finally:
+        geos_table.reset()
+        industries_table.reset()
+        clear_cache()
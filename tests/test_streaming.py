@@ -0,0 +1,49 @@
+import polars as pl
+import pytest
+
+from crosswalks.streaming import enrich
+
+
+@pytest.fixture
+def facts() -> pl.DataFrame:
+    return pl.DataFrame({
+        'county_fips': ['01001', '06037', '99999', '01003'] * 50,
+        'naics': ['541511', '111110', '000000', '541511'] * 50,
+        'employment': list(range(200)),
+    })
+
+
+@pytest.mark.parametrize('suffix', ['csv', 'parquet', 'arrow'])
+def test_enrich_streams_to_every_format(tmp_path, facts, suffix):
+    # CSV input keeps the leading zeros of the code columns
+    source = tmp_path / 'facts.csv'
+    facts.write_csv(source)
+    output = tmp_path / f'enriched.{suffix}'
+
+    enrich(
+        source, output,
+        area_on='county_fips', area_fields=['state_abbr', 'cbsa_code'],
+        industry_on='naics', industry_fields=['sector'],
+        survey='qcew', industry_year=2022, chunk_size=16
+    )
+
+    expected = (
+        facts
+        .crosswalk.join_area('county_fips', ['state_abbr', 'cbsa_code'])
+        .crosswalk.join_industry('naics', ['sector'], survey='qcew', year=2022)
+    )
+    if suffix == 'csv':
+        result = pl.read_csv(output, schema=expected.schema)
+    elif suffix == 'parquet':
+        result = pl.read_parquet(output)
+    else:
+        result = pl.read_ipc(output)
+    assert result.sort('employment').equals(expected.sort('employment'))
+    assert result.sort('employment').get_column('state_abbr').head(4).to_list() == ['AL', 'CA', None, 'AL']
+
+
+def test_unsupported_file_types(tmp_path, facts):
+    with pytest.raises(ValueError, match='unsupported file type'):
+        enrich(tmp_path / 'facts.json', tmp_path / 'out.parquet')
+    with pytest.raises(ValueError, match='unsupported file type'):
+        enrich(facts.lazy(), tmp_path / 'out.json', area_on='county_fips', area_fields=['state_abbr'])
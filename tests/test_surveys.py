@@ -0,0 +1,56 @@
+import polars as pl
+import pytest
+
+from crosswalks.index import survey_slice
+from crosswalks.surveys import survey_bits, survey_codes, survey_membership, survey_names
+from crosswalks.tables import load_industries
+
+
+def _codes(industry, year, survey):
+    return set(
+        survey_slice(load_industries(), year, survey)
+        .get_column(industry)
+        .drop_nulls()
+        .to_list()
+    )
+
+
+def test_survey_bits_round_trip():
+    assert survey_bits('ces') == 1
+    assert survey_bits(['ces', 'qcew']) == 5
+    assert survey_names(5) == ('ces', 'qcew')
+    assert survey_names(survey_bits(['qcew', 'bed', 'ces'])) == ('ces', 'bed', 'qcew')
+
+    with pytest.raises(ValueError, match='survey must be one of'):
+        survey_bits('cps')
+
+
+def test_survey_codes_match_the_survey_slices():
+    industry = 'detailed_industry'
+
+    qcew_not_ces = survey_codes(industry, include='qcew', exclude='ces', years=2022)
+    assert set(qcew_not_ces) == _codes(industry, 2022, 'qcew') - _codes(industry, 2022, 'ces')
+    assert list(qcew_not_ces) == sorted(qcew_not_ces)
+
+    every = survey_codes(industry, include=['ces', 'bed', 'qcew'], years=[2017, 2022])
+    expected = set.intersection(*(
+        _codes(industry, year, survey)
+        for year in (2017, 2022)
+        for survey in ('ces', 'bed', 'qcew')
+    ))
+    assert set(every) == expected
+
+    # Any of the years rather than every year
+    either = survey_codes(industry, include='ces', years=[2017, 2022], every_year=False)
+    assert set(either) == _codes(industry, 2017, 'ces') | _codes(industry, 2022, 'ces')
+
+
+def test_survey_membership_is_one_row_per_code_and_year():
+    membership = survey_membership('sector')
+    assert membership.columns == ['year', 'code', 'surveys']
+    assert membership.select(pl.struct('year', 'code').is_unique().all()).item()
+
+
+def test_survey_codes_rejects_overlapping_surveys():
+    with pytest.raises(ValueError, match='include and exclude must not share surveys'):
+        survey_codes('sector', include=['ces', 'bed'], exclude='bed', years=2022)
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+
+import polars as pl
+
+from crosswalks.tables import (
+    BASE_PATH, CSV_READERS, DATA_PATH, LazyTable, read_table, write_artifacts
+)
+
+
+def test_importing_the_lookups_reads_no_table():
+    probe = '\n'.join([
+        'import crosswalks.geographic_codes as geo, crosswalks.industry_codes',
+        'from crosswalks import tables',
+        'print(tables.geos_table.loaded, tables.industries_table.loaded)',
+        'geo.geos_df',
+        'print(tables.geos_table.loaded, tables.industries_table.loaded)',
+    ])
+    result = subprocess.run(
+        [sys.executable, '-c', probe],
+        capture_output=True,
+        check=True,
+        env={**os.environ, 'PYTHONPATH': str(BASE_PATH / 'src')},
+        text=True
+    )
+    assert result.stdout.split('\n')[:2] == ['False False', 'True False']
+
+
+def test_lazy_table_loads_once_across_threads():
+    calls = []
+    start = threading.Barrier(8)
+
+    def loader() -> pl.DataFrame:
+        calls.append(1)
+        return pl.DataFrame({'a': [1]})
+
+    table = LazyTable(loader)
+    frames = []
+
+    def get() -> None:
+        start.wait()
+        frames.append(table.get())
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert all(frame is frames[0] for frame in frames)
+
+    table.reset()
+    assert not table.loaded
+    table.get()
+    assert len(calls) == 2
+
+
+def test_artifacts_match_the_csv_and_stale_ones_are_ignored(tmp_path):
+    name = 'industry_codes'
+    shutil.copy(DATA_PATH / f'{name}.csv', tmp_path)
+    write_artifacts(name, tmp_path)
+
+    expected = CSV_READERS[name](tmp_path / f'{name}.csv')
+    assert read_table(name, tmp_path).equals(expected)
+
+    # A damaged IPC file falls back to Parquet
+    arrow_path = tmp_path / f'{name}.arrow'
+    arrow_path.write_bytes(arrow_path.read_bytes()[:100])
+    assert read_table(name, tmp_path).equals(expected)
+
+    # A changed CSV makes both artifacts stale
+    csv_path = tmp_path / f'{name}.csv'
+    lines = csv_path.read_text().splitlines(keepends=True)
+    csv_path.write_text(''.join(lines[:-1]))
+    assert read_table(name, tmp_path).height == expected.height - 1
+
+
+def test_bundled_artifacts_are_current():
+    for name in CSV_READERS:
+        manifest = json.loads((DATA_PATH / f'{name}.manifest.json').read_text())
+        assert manifest['source_sha256'] == hashlib.sha256(
+            (DATA_PATH / f'{name}.csv').read_bytes()
+        ).hexdigest()
+        assert read_table(name).equals(CSV_READERS[name](DATA_PATH / f'{name}.csv'))
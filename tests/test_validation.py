@@ -0,0 +1,38 @@
+import polars as pl
+
+from crosswalks.diff import area_diff
+from crosswalks.geographic_codes import valid_area, valid_area_set
+from crosswalks.validation import validate_area, validate_industry
+
+
+def test_validate_industry_reports_nearest_vintages():
+    codes = ['541511', '212111', '212111', '000000', None, '000000']
+    report = validate_industry(codes, 'detailed_industry', survey='qcew', year=2022)
+
+    assert report.mask.to_list() == [True, False, False, False, False, False]
+    assert report.invalid.rows() == [('000000', 2, None), ('212111', 2, 2017), (None, 1, None)]
+    # Most of the column is valid in 2017
+    assert report.suggested_year == 2017
+
+
+def test_validate_area_against_an_older_vintage():
+    removed = (
+        area_diff('cbsa_code', 2013, 2023)
+        .filter(pl.col('change') == 'removed')
+        .get_column('key')
+        .unique()
+        .sort()
+    )
+    codes = [*removed.head(3), '10380']
+    report = validate_area(codes, 'cbsa_code', year=2023)
+
+    assert report.mask.to_list() == [False, False, False, True]
+    assert set(report.invalid.get_column('nearest_year')) <= set(range(2013, 2023))
+    assert report.suggested_year < 2023
+
+
+def test_membership_sets_match_the_code_lists():
+    codes = valid_area_set('county_fips')
+    assert isinstance(codes, frozenset)
+    assert codes == frozenset(valid_area('county_fips'))
+    assert '01001' in codes and '99999' not in codes
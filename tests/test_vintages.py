@@ -0,0 +1,75 @@
+import polars as pl
+
+import pytest
+
+from crosswalks.vintages import apply_bridge, area_bridge, industry_bridge
+
+
+def test_area_bridge_with_partial_weights():
+    # Weights for the Alabama counties only: every other CBSA sums to zero and falls
+    # back to counting its counties equally
+    counties = pl.DataFrame({'county_fips': ['01001', '01003'], 'weight': [3.0, 1.0]})
+    bridge = area_bridge('cbsa_code', 'state_fips', 2023, 2023, weights=counties)
+
+    assert bridge.get_column('weight').is_nan().sum() == 0
+    totals = bridge.group_by('from_code').agg(pl.col('weight').sum()).get_column('weight')
+    assert ((totals - 1.0).abs() < 1e-9).all()
+
+    unweighted = area_bridge('cbsa_code', 'state_fips', 2023, 2023)
+    dc = bridge.filter(pl.col('from_code') == '47900')
+    assert dc.equals(unweighted.filter(pl.col('from_code') == '47900'))
+
+
+def test_apply_bridge_conserves_totals():
+    bridge = area_bridge('cbsa_code', 'state_fips', 2023, 2023)
+    facts = pl.DataFrame({
+        'year': [2023, 2023, 2023, 2024],
+        'cbsa': ['47900', '10180', '99999', None],
+        'employment': [100.0, 50.0, 7.0, 3.0],
+    })
+
+    result = apply_bridge(facts, bridge, on='cbsa', values='employment', by=['year'])
+    assert abs(result.get_column('employment').sum() - 160.0) < 1e-9
+
+    unmatched = result.filter(pl.col('cbsa').is_null()).sort('year')
+    assert unmatched.get_column('employment').to_list() == [7.0, 3.0]
+
+    lazy = apply_bridge(facts.lazy(), bridge, on='cbsa', values='employment', by=['year'])
+    assert lazy.collect().sort('year', 'cbsa').equals(result.sort('year', 'cbsa'))
+
+
+def test_industry_bridge_exact_and_prefix_matches():
+    bridge = industry_bridge(2017, 2022)
+
+    totals = bridge.group_by('from_code').agg(pl.col('weight').sum()).get_column('weight')
+    assert ((totals - 1.0).abs() < 1e-9).all()
+
+    exact = bridge.filter(pl.col('match') == 'exact')
+    assert (exact.get_column('from_code') == exact.get_column('to_code')).all()
+    assert exact.get_column('weight').eq(1.0).all()
+
+    # The 2017 coal mining codes were regrouped into 212114 and 212115 in 2022
+    split = bridge.filter(pl.col('from_code') == '212111')
+    assert split.select('to_code', 'weight', 'match').rows() == [
+        ('212114', 0.5, 'prefix'),
+        ('212115', 0.5, 'prefix'),
+    ]
+
+
+def test_industry_bridge_uses_a_concordance_as_given():
+    concordance = pl.DataFrame({
+        'from_code': ['212111', '212111', '511210'],
+        'to_code': ['212114', '212115', '513210'],
+        'weight': [3.0, 1.0, 0.0],
+    })
+    bridge = industry_bridge(2017, 2022, concordance=concordance)
+
+    assert bridge.get_column('match').unique().to_list() == ['concordance']
+    assert bridge.select('from_code', 'to_code', 'weight').rows() == [
+        ('212111', '212114', 0.75),
+        ('212111', '212115', 0.25),
+        ('511210', '513210', 1.0),
+    ]
+
+    with pytest.raises(ValueError, match='level must be one of'):
+        industry_bridge(2017, 2022, level='naics')